@@ -1,9 +1,36 @@
+import json
 import time
 
 from DrissionPage import ChromiumPage
 from utils.page_actions import PageActions
 from config.locators import DRAMA_HOME_PAGE
 from utils.logger_utils import LoggerUtils
+from utils.web_vitals import capture_web_vitals
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 一次性读取剧集网格：每个格子的位置、集数、状态（locked / unlocked / free）和页面坐标
+_EPISODE_GRID_JS = """
+const cells = document.querySelectorAll(%s);
+return Array.from(cells, (cell, i) => {
+    let status = 'unknown';
+    if (cell.querySelector(%s)) status = 'locked';
+    else if (cell.querySelector(%s)) status = 'unlocked';
+    else if (!cell.querySelector('svg')) status = 'free';
+    const rect = cell.getBoundingClientRect();
+    const number = parseInt(cell.textContent, 10);
+    return {
+        index: i,
+        episode: isNaN(number) ? i + 1 : number,
+        status: status,
+        rect: [Math.round(rect.left + scrollX), Math.round(rect.top + scrollY),
+               Math.round(rect.width), Math.round(rect.height)],
+        in_view: rect.bottom > 0 && rect.top < innerHeight && rect.width > 0
+    };
+});
+""" % (json.dumps(DRAMA_HOME_PAGE["episode_cells"]), json.dumps(DRAMA_HOME_PAGE["episode_locked_icon"]),
+       json.dumps(DRAMA_HOME_PAGE["episode_unlocked_icon"]))
 
 
 class DramaHomeComponent:
@@ -16,7 +43,7 @@ class DramaHomeComponent:
         """
         self.page = page  # 保存传入的页面对象
         self.actions = PageActions(page)  # 初始化基础操作类
-        self.logger = LoggerUtils.get_default_logger()  # 获取日志记录器
+        self.logger = logger  # 获取日志记录器
 
     def click_back_button(self):
         """点击剧首页-返回按钮"""
@@ -42,25 +69,50 @@ class DramaHomeComponent:
         """点击剧首页-取消收藏按钮（页面文案：In my List）"""
         return self.actions.click_element(DRAMA_HOME_PAGE["remove_from_list_button"], selector_type="css")
 
-    def click_free_episode(self):
-        """点击剧首页-任意一个免费剧集"""
+    def get_episode_grid(self):
+        """
+        获取剧集网格快照（一次 JS 调用读取所有格子）
+        :return: 列表，每项为 {index, episode, status, rect, in_view}；
+                 status 为 locked / unlocked / free / unknown，rect 为页面坐标 [x, y, 宽, 高]
+        """
         try:
-            # 查找所有免费剧集
-            free_episodes = self.actions.find_elements(DRAMA_HOME_PAGE["free_episodes"], selector_type="css")
-            if not free_episodes:
-                self.logger.error("未找到任何免费剧集！")
-                return False
+            return self.page.run_js(_EPISODE_GRID_JS) or []
+        except Exception as e:
+            self.logger.error(f"读取剧集网格失败: {e}")
+            return []
 
-            # 点击第一个免费剧集
-            for free_episode in range(0, len(free_episodes)):
-                print(free_episode, len(free_episodes))
-                free_episodes[free_episode].click()
-                self.logger.info("成功点击免费剧集")
-                return True
+    def click_episode(self, index):
+        """
+        点击剧集网格中指定位置的格子
+        :param index: 格子位置（get_episode_grid 返回的 index）
+        :return: 是否点击成功
+        """
+        try:
+            # 与 get_episode_grid 使用同一个全局文档顺序（querySelectorAll），多个网格或分段面板时位置也一致
+            cells = self.page.eles(f"css:{DRAMA_HOME_PAGE['episode_cells']}", timeout=2)
+            if index >= len(cells):
+                self.logger.error(f"未找到第 {index + 1} 个剧集格子")
+                return False
+            cells[index].click()
+            self.logger.info(f"成功点击第 {index + 1} 个剧集格子")
+            return True
         except Exception as e:
-            self.logger.error(f"点击免费剧集失败: {e}")
+            self.logger.error(f"点击第 {index + 1} 个剧集格子失败: {e}")
             return False
 
+    def click_free_episode(self):
+        """点击剧首页-任意一个免费剧集"""
+        # 从剧集网格快照中选择第一个免费剧集
+        free_episodes = [cell for cell in self.get_episode_grid() if cell['status'] == 'free']
+        if not free_episodes:
+            self.logger.error("未找到任何免费剧集！")
+            return False
+
+        if self.click_episode(free_episodes[0]['index']):
+            self.logger.info(f"成功点击免费剧集: 第 {free_episodes[0]['episode']} 集")
+            return True
+        return False
+
     def toggle_description(self):
         """展开或收起短剧简介"""
         try:
@@ -116,6 +168,7 @@ class DramaHomeComponent:
             # 方法3：直接访问剧首页URL
             drama_home_url = "https://video.reelswave.net"
             self.page.get(drama_home_url)
+            capture_web_vitals(self.page)
             if self.is_drama_home_page():
                 self.logger.info("通过直接访问URL成功回到剧首页")
                 return True
@@ -177,6 +230,8 @@ class DramaHomeComponent:
             else:
                 self.logger.warning("部分关键元素未加载，但继续执行")
 
+            # 记录剧首页的加载性能
+            capture_web_vitals(self.page)
             return True
         except Exception as e:
             self.logger.error(f"等待元素加载时出错: {str(e)}")
@@ -1,97 +1,234 @@
+import json
+from config.locators import HOME_PAGE
 from utils.logger_utils import LoggerUtils
 from utils.page_actions import PageActions
+from utils.web_vitals import capture_web_vitals
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 获取 banner 的 Swiper 实例和状态，后续脚本直接使用 el、s、state()
+_SWIPER_PRELUDE = """
+const el = document.querySelector(%s);
+const s = el && el.swiper;
+if (!s) return null;
+const state = () => {
+    const active = s.slides[s.activeIndex];
+    const title = active && active.querySelector(%s);
+    return {
+        real_index: s.realIndex,
+        active_index: s.activeIndex,
+        slides: el.querySelectorAll(%s + ':not(.swiper-slide-duplicate)').length,
+        loop: !!s.params.loop,
+        autoplay_running: !!(s.autoplay && s.autoplay.running && !s.autoplay.paused),
+        autoplay_delay: s.params.autoplay ? s.params.autoplay.delay || null : null,
+        animating: !!s.animating,
+        active_title: title ? title.textContent.trim() : null
+    };
+};
+""" % (json.dumps(HOME_PAGE['banner_swiper']), json.dumps(HOME_PAGE['banner_slide_title']),
+       json.dumps(HOME_PAGE['banner_slide']))
+
+# 切换轮播图：等待 slideChangeTransitionEnd 事件（已在目标位置或超时直接返回）
+# arguments[0] 为切换方式（to / next / prev），arguments[1] 为目标索引，arguments[2] 为动画时长，arguments[3] 为超时毫秒
+_SWIPER_SLIDE_JS = _SWIPER_PRELUDE + """
+const [action, index, speed, timeout] = arguments;
+return new Promise(resolve => {
+    let finished = false;
+    const done = () => { if (!finished) { finished = true; s.off('slideChangeTransitionEnd', done); resolve(state()); } };
+    if (action === 'to' && s.realIndex === index) return done();
+    s.on('slideChangeTransitionEnd', done);
+    setTimeout(done, timeout);
+    if (action === 'next') s.slideNext(speed);
+    else if (action === 'prev') s.slidePrev(speed);
+    else if (s.params.loop) s.slideToLoop(index, speed);
+    else s.slideTo(index, speed);
+});
+"""
+
+# 一次性提取所有轮播图的索引、标题、激活状态和图片地址，按真实索引（data-swiper-slide-index）排序
+_SLIDES_JS = """
+const container = document.querySelector(%s) || document;
+const slides = Array.from(container.querySelectorAll(%s + ':not(.swiper-slide-duplicate)'));
+return slides.map((slide, i) => {
+    const title = slide.querySelector(%s);
+    const images = Array.from(slide.querySelectorAll('img')).map(img => img.currentSrc || img.src).filter(Boolean);
+    slide.querySelectorAll('[style*="background-image"]').forEach(node => {
+        const match = /url\\(["']?([^"')]+)/.exec(node.style.backgroundImage);
+        if (match) images.push(match[1]);
+    });
+    const realIndex = parseInt(slide.getAttribute('data-swiper-slide-index'), 10);
+    return {
+        index: i,
+        real_index: isNaN(realIndex) ? i : realIndex,
+        title: title ? title.textContent.trim() : null,
+        active: slide.classList.contains('swiper-slide-active'),
+        images: images
+    };
+}).sort((a, b) => a.real_index - b.real_index);
+""" % (json.dumps(HOME_PAGE['banner_swiper']), json.dumps(HOME_PAGE['banner_slide']),
+       json.dumps(HOME_PAGE['banner_slide_title']))
+
+# 等待 Swiper 初始化且轮播图数量足够，arguments[0] 为最少数量，arguments[1] 为超时毫秒
+_SWIPER_WAIT_JS = """
+const [minSlides, timeout] = arguments;
+const ready = () => {
+    const el = document.querySelector(%s);
+    if (!el || !el.swiper || el.querySelectorAll(%s).length < minSlides) return false;
+    el.scrollIntoView({block: 'nearest'});
+    return true;
+};
+if (ready()) return true;
+return new Promise(resolve => {
+    const observer = new MutationObserver(() => { if (ready()) { observer.disconnect(); resolve(true); } });
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['class']});
+    setTimeout(() => { observer.disconnect(); resolve(ready()); }, timeout);
+});
+""" % (json.dumps(HOME_PAGE['banner_swiper']), json.dumps(HOME_PAGE['banner_slide']))
 
 class HomeComponent:
     def __init__(self, page):
         """初始化，传入页面对象"""
         self.page = page
         self.page_actions = PageActions(page)
-        self.logger = LoggerUtils.get_default_logger()
+        self.logger = logger
 
     def get_swiper_slides(self):
-        """获取所有轮播图（标题和元素）"""
-        slides = self.page_actions.find_elements('.swiper-slide', selector_type='css')
-        result = []
-        for slide in slides:
-            # 在当前轮播图元素内查找标题
-            title_ele = slide.ele('css:.text-lg', timeout=0.1)
-            title = title_ele.text if title_ele else None
-            result.append({'title': title, 'element': slide})
-        return result
+        """
+        获取所有轮播图信息（一次 JS 调用完成，不逐个读取元素）
+        :return: 列表，按真实索引排序，每项为 {index, real_index, title, active, images}；
+                 index 为 DOM 中的位置，real_index 为 Swiper 的真实索引（可直接传给 slide_to）
+        """
+        try:
+            return self.page.run_js(_SLIDES_JS) or []
+        except Exception as e:
+            self.logger.error(f"获取轮播图信息失败: {e}")
+            return []
+
+    def get_carousel_state(self):
+        """
+        读取 banner 轮播图的 Swiper 状态
+        :return: 状态字典（real_index、slides、loop、autoplay_running、active_title 等），未找到 Swiper 时返回 None
+        """
+        try:
+            return self.page.run_js(_SWIPER_PRELUDE + "return state();")
+        except Exception as e:
+            self.logger.error(f"读取轮播图状态失败: {e}")
+            return None
+
+    def pause_autoplay(self):
+        """
+        暂停轮播图自动播放，避免切换和点击过程中被自动轮播打断
+        :return: 暂停后的状态，未找到 Swiper 时返回 None
+        """
+        try:
+            return self.page.run_js(_SWIPER_PRELUDE + "if (s.autoplay) s.autoplay.stop(); return state();")
+        except Exception as e:
+            self.logger.error(f"暂停轮播图自动播放失败: {e}")
+            return None
+
+    def resume_autoplay(self):
+        """
+        恢复轮播图自动播放
+        :return: 恢复后的状态，未找到 Swiper 时返回 None
+        """
+        try:
+            return self.page.run_js(_SWIPER_PRELUDE + "if (s.autoplay) s.autoplay.start(); return state();")
+        except Exception as e:
+            self.logger.error(f"恢复轮播图自动播放失败: {e}")
+            return None
+
+    def _slide(self, action, index=0, speed=0, timeout=3):
+        """
+        通过 Swiper 实例切换轮播图，并等待切换动画结束事件
+        :param action: to / next / prev
+        :param index: 目标索引（action 为 to 时有效，循环模式下为 data-swiper-slide-index）
+        :param speed: 动画时长（毫秒），0 表示立即切换
+        :param timeout: 等待动画结束的超时时间（秒）
+        :return: 切换后的状态，未找到 Swiper 时返回 None
+        """
+        try:
+            return self.page.run_js(_SWIPER_SLIDE_JS, action, index, speed, int(timeout * 1000), timeout=timeout + 5)
+        except Exception as e:
+            self.logger.error(f"切换轮播图失败: {e}")
+            return None
+
+    def slide_to(self, index, speed=0, timeout=3):
+        """
+        切换到指定索引的轮播图
+        :param index: 轮播图索引（循环模式下为真实索引 realIndex）
+        :param speed: 动画时长（毫秒），0 表示立即切换
+        :param timeout: 等待动画结束的超时时间（秒）
+        :return: 切换后的状态，未找到 Swiper 时返回 None
+        """
+        return self._slide('to', index, speed, timeout)
+
+    def slide_next(self, speed=0, timeout=3):
+        """
+        切换到下一张轮播图
+        :param speed: 动画时长（毫秒），0 表示立即切换
+        :param timeout: 等待动画结束的超时时间（秒）
+        :return: 切换后的状态，未找到 Swiper 时返回 None
+        """
+        return self._slide('next', speed=speed, timeout=timeout)
 
     def open_slide_by_title(self, title):
         """根据标题打开轮播图"""
-        # 获取所有轮播图
+        # 一次性获取所有轮播图
         slides = self.get_swiper_slides()
         self.logger.info(f"当前页面共有 {len(slides)} 个轮播图")
 
-        # 遍历轮播图，查找目标标题
-        for index, slide in enumerate(slides):
-            self.logger.debug(f"检查第 {index} 个轮播图，标题: {slide['title']}")
-            if slide['title'] == title:
-                self.logger.info(f"找到目标轮播图，索引: {index}，标题: {title}")
-
-                # 使用 JavaScript 滚动到目标轮播图，避免触发轮播图动画
-                self.page.run_js(f'arguments[0].scrollIntoView({{behavior: "instant", block: "center"}})', slide['element'])
-                # 等待轮播图滚动到可见位置
-                self.page.wait(1)
-
-                # 再次确认轮播图标题是否正确（在目标轮播图元素内查找）
-                title_ele = slide['element'].ele('css:.text-lg', timeout=0.1)
-                current_title = title_ele.text if title_ele else None
-                self.logger.info(f"滚动后轮播图标题: {current_title}")
-
-                if current_title != title:
-                    self.logger.warning(f"轮播图标题不匹配，期望: {title}，实际: {current_title}")
-                    # 尝试重新获取轮播图
-                    slides = self.get_swiper_slides()
-                    for new_slide in slides:
-                        if new_slide['title'] == title:
-                            slide = new_slide
-                            break
-
-                # 等待轮播图完全停下
-                self.page.wait(2)
-
-                # 尝试点击轮播图内部的标题元素（在目标轮播图元素内查找）
-                title_ele = slide['element'].ele('css:.text-lg', timeout=0.1)
-                if title_ele:
-                    title_ele.click()
-                    self.logger.info(f"成功点击轮播图标题: {title}")
-                    return True
-                else:
-                    # 如果没有找到标题元素，则点击整个轮播图
-                    slide['element'].click()
-                    self.logger.info(f"成功点击轮播图元素: {title}")
-                    return True
-        self.logger.warning(f"没有找到标题为 {title} 的轮播图")
-        return False
+        slide = next((item for item in slides if item['title'] == title), None)
+        if slide is None:
+            self.logger.warning(f"没有找到标题为 {title} 的轮播图")
+            return False
+        self.logger.info(f"找到目标轮播图，索引: {slide['real_index']}，标题: {title}")
+
+        # 暂停自动播放并直接切换到目标轮播图，切换动画结束后再点击，无需等待自动轮播
+        self.pause_autoplay()
+        state = self.slide_to(slide['real_index'])
+        if state and state['active_title'] != title:
+            self.logger.warning(f"轮播图标题不匹配，期望: {title}，实际: {state['active_title']}")
+
+        # 循环模式下切换后轮播图元素可能被重排，从当前激活的轮播图内查找标题
+        active_slide = self.page_actions.find_element(HOME_PAGE['banner_active_slide'], selector_type='css')
+        if not active_slide:
+            self.logger.error(f"未找到当前激活的轮播图: {title}")
+            return False
+        title_ele = active_slide.ele(f"css:{HOME_PAGE['banner_slide_title']}", timeout=0.1)
+        if title_ele:
+            title_ele.click()
+            self.logger.info(f"成功点击轮播图标题: {title}")
+        else:
+            # 如果没有找到标题元素，则点击整个轮播图
+            active_slide.click()
+            self.logger.info(f"成功点击轮播图元素: {title}")
+        return True
 
     def list_titles(self):
         """列出所有轮播图的标题"""
         slides = self.get_swiper_slides()
         return [slide['title'] for slide in slides]
 
-    def wait_for_slide_to_load(self, index=0):
-        """等待指定索引的轮播图加载（防止异步问题）"""
+    def wait_for_slide_to_load(self, index=0, timeout=10):
+        """
+        等待指定索引的轮播图加载（防止异步问题）
+        在页面内用 MutationObserver 等待 Swiper 初始化，就绪后立即返回，不再按秒轮询
+        :param index: 目标索引
+        :param timeout: 超时时间（秒）
+        """
         self.logger.debug(f"等待轮播图加载，目标索引: {index}")
 
-        # 等待轮播图容器出现
-        max_retries = 10
-        retry_count = 0
+        try:
+            loaded = self.page.run_js(_SWIPER_WAIT_JS, index + 1, int(timeout * 1000), timeout=timeout + 5)
+        except Exception as e:
+            self.logger.warning(f"等待轮播图加载出错: {e}")
+            loaded = False
 
-        while retry_count < max_retries:
-            # 使用 CSS 选择器查找轮播图元素
-            slides = self.page_actions.find_elements('.swiper-slide', selector_type='css')
+        if loaded:
+            self.logger.debug("轮播图加载完成")
+            # 记录首页的加载性能
+            capture_web_vitals(self.page)
+            return
 
-            if slides and len(slides) > index:
-                self.logger.debug(f"找到 {len(slides)} 个轮播图，滚动到第 {index} 个")
-                self.page.scroll.to_see(slides[index])
-                self.page.wait(1)
-                return
-
-            self.logger.debug(f"第 {retry_count + 1} 次尝试：未找到足够的轮播图，当前找到 {len(slides) if slides else 0} 个")
-            self.page.wait(1)
-            retry_count += 1
-
-        self.logger.warning(f"等待轮播图加载超时，当前找到 {len(slides) if slides else 0} 个")
+        self.logger.warning(f"等待轮播图加载超时（{timeout}秒）")
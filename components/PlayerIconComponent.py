@@ -6,6 +6,9 @@ from utils.logger_utils import LoggerUtils
 from utils.page_actions import PageActions
 from config.locators import VIDEO_PLAYER_PAGE
 
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
 
 class IconComponent:
     def __init__(self, page):
@@ -14,7 +17,7 @@ class IconComponent:
         :param page: 页面对象，用于操作页面元素
         """
         self.page = page
-        self.logger = LoggerUtils.get_default_logger()
+        self.logger = logger
         self.locators = VIDEO_PLAYER_PAGE
         self.page_actions = PageActions(page)
 
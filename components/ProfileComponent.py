@@ -3,6 +3,9 @@ from utils.logger_utils import LoggerUtils
 from config.locators import PROFILE_PAGE
 from utils.decorators import element_wait_decorator
 
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
 
 class ProfileComponent:
     """个人中心页面组件类"""
@@ -14,7 +17,7 @@ class ProfileComponent:
         """
         self.page = page
         self.page_actions = PageActions(page)
-        self.logger = LoggerUtils.get_default_logger()
+        self.logger = logger
         self.locators = PROFILE_PAGE
         self.logger.info("初始化个人中心页面组件")
 
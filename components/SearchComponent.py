@@ -1,6 +1,32 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from components.DramaHomeComponent import DramaHomeComponent
+from utils.locator_compiler import compile_locator
 from utils.logger_utils import LoggerUtils
 from utils.page_actions import PageActions
-from config.locators import SEARCH_PAGE, HOME_MORE_PAGE, VIDEO_PLAYER_PAGE
+from utils.video_metrics import VideoMetricsCollector
+from config.locators import SEARCH_PAGE, HOME_MORE_PAGE, VIDEO_PLAYER_PAGE, DRAMA_HOME_PAGE
+from config.settings import HOT_SEARCH_CHECK_CONFIG
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 一次读取热门搜索列表中所有剧集封面的埋点数据，按 book_id 去重，保持页面顺序
+_HOT_SEARCH_TARGETS_JS = """
+const seen = new Set();
+const targets = [];
+const covers = document.evaluate(%s, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+Array.from({length: covers.snapshotLength}, (_, i) => covers.snapshotItem(i)).forEach(img => {
+    let data = {};
+    try { data = JSON.parse(img.getAttribute('data-report-list-imp') || '{}'); } catch (e) {}
+    const bookId = data.book_id ? String(data.book_id) : null;
+    if (!bookId || seen.has(bookId)) return;
+    seen.add(bookId);
+    targets.push({index: targets.length, book_id: bookId, title: data.book_name || img.alt || null});
+});
+return targets;
+""" % json.dumps(compile_locator(SEARCH_PAGE['hot_search_cover']).selector)
 
 class SearchComponent:
     """搜索页面组件类"""
@@ -8,7 +34,7 @@ class SearchComponent:
     def __init__(self, page):
         """初始化，传入页面对象"""
         self.page = page
-        self.logger = LoggerUtils.get_default_logger()
+        self.logger = logger
         self.page_actions = PageActions(self.page)
 
     def open_search_page(self):
@@ -84,8 +110,99 @@ class SearchComponent:
             self.logger.warning("点击清空按钮失败，可能没有内容需要清空")
             return False
 
-    def test_hot_search_elements(self, player_control):
-        """测试热门搜索视频元素"""
+    def collect_hot_search_targets(self):
+        """
+        一次收集热门搜索列表中所有剧集的落地页
+        :return: 列表，每项为 {index, book_id, title, url}
+        """
+        try:
+            targets = self.page.run_js(_HOT_SEARCH_TARGETS_JS) or []
+        except Exception as e:
+            self.logger.error(f"收集热门搜索剧集失败: {e}")
+            return []
+        url_template = HOT_SEARCH_CHECK_CONFIG['url_template']
+        for target in targets:
+            target['url'] = url_template.format(content_id=target['book_id'], episode=1)
+        self.logger.info(f"收集到 {len(targets)} 个热门搜索剧集")
+        return targets
+
+    def _validate_target(self, target):
+        """
+        在新标签页中打开剧集落地页，点击"去看剧"并等待视频开始播放
+        :param target: collect_hot_search_targets 返回的剧集
+        :return: 校验结果字典 {index, book_id, title, url, ok, landing_url, time_to_first_frame_ms, error, duration}
+        """
+        start_time = time.time()
+        result = dict(target, ok=False, landing_url=None, time_to_first_frame_ms=None, error=None)
+        tab = None
+        try:
+            tab = self.page.browser.new_tab(target['url'])
+            watch_button = compile_locator(DRAMA_HOME_PAGE['watch_button'], 'css').drission
+            if not tab.wait.eles_loaded(watch_button, timeout=HOT_SEARCH_CHECK_CONFIG.get('page_timeout', 15)):
+                result['error'] = "剧首页未加载出去看剧按钮"
+                result['landing_url'] = tab.url
+                return result
+
+            # 计时起点为点击"去看剧"之前
+            collector = VideoMetricsCollector(tab)
+            collector.install()
+            if not DramaHomeComponent(tab).click_watch_button():
+                result['error'] = "点击去看剧按钮失败"
+                return result
+
+            timeout = HOT_SEARCH_CHECK_CONFIG.get('play_timeout', 20)
+            result['time_to_first_frame_ms'] = collector.wait_for_first_frame(timeout=timeout)
+            result['ok'] = collector.wait_until_playing(timeout=timeout)
+            result['landing_url'] = tab.url
+            if not result['ok']:
+                result['error'] = "视频未开始播放"
+            return result
+        except Exception as e:
+            self.logger.error(f"校验热门搜索剧集 {target.get('title')} 失败: {e}")
+            result['error'] = str(e)
+            return result
+        finally:
+            result['duration'] = round(time.time() - start_time, 2)
+            if tab is not None:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+
+    def validate_hot_search_targets(self, targets=None):
+        """
+        并行校验热门搜索剧集能否正常播放，搜索页面保持不动
+        :param targets: 需要校验的剧集（可选），默认收集当前页面的全部剧集
+        :return: 校验结果列表，按页面顺序排列
+        """
+        if targets is None:
+            targets = self.collect_hot_search_targets()
+        if not targets:
+            return []
+
+        start_time = time.time()
+        max_tabs = HOT_SEARCH_CHECK_CONFIG.get('max_tabs', 4)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_tabs, len(targets)))) as executor:
+            results = list(executor.map(self._validate_target, targets))
+
+        for result in results:
+            error = f"（{result['error']}）" if result['error'] else ''
+            self.logger.info(f"热门搜索剧集 {result['index'] + 1} {result['title']}: "
+                             f"{'通过' if result['ok'] else '失败'}，首帧 {result['time_to_first_frame_ms']}ms，"
+                             f"耗时 {result['duration']:.2f}秒{error}")
+        self.logger.info(f"热门搜索剧集并行校验完成，{len(results)} 个剧集，总耗时 {time.time() - start_time:.2f}秒")
+        return results
+
+    def test_hot_search_elements(self, player_control, parallel=False):
+        """
+        测试热门搜索视频元素
+        :param player_control: IconComponent 对象（逐个点击模式使用）
+        :param parallel: 是否使用并行模式，一次收集全部剧集并在独立标签页中校验播放
+        :return: 并行模式下返回校验结果列表，逐个点击模式返回 None
+        """
+        if parallel:
+            return self.validate_hot_search_targets()
+
         self.logger.info("开始测试热门搜索视频元素")
 
         # 使用 page_actions.find_elements 查找视频元素
@@ -14,7 +14,11 @@ DRAMA_HOME_PAGE = {
     "episodes_list": ".gap-md.grid.grid-cols-6",
     "locked_episodes_list": ".gap-md.grid.grid-cols-6 > div >svg > path[d^=m307]",
     "unlocked_episodes_list": ".gap-md.grid.grid-cols-6 > div >svg > path[d^=M870]",
-    "free_episodes": ".gap-md.grid.grid-cols-6 > div:not(:has(svg)) > div"
+    "free_episodes": ".gap-md.grid.grid-cols-6 > div:not(:has(svg)) > div",
+    # 剧集格子，以及格子内的锁定 / 已解锁图标（在格子元素内查找，没有图标的为免费剧集）
+    "episode_cells": ".gap-md.grid.grid-cols-6 > div",
+    "episode_locked_icon": "svg > path[d^=m307]",
+    "episode_unlocked_icon": "svg > path[d^=M870]"
 }
 
 # 视频播放页面元素定位器
@@ -66,6 +70,13 @@ PROFILE_PAGE = {
 
 # 首页元素定位器
 HOME_PAGE = {
+    # Banner 轮播图（Swiper 实例挂在容器元素的 swiper 属性上）
+    "banner_swiper": ".swiper",
+    "banner_slide": ".swiper-slide",
+    "banner_active_slide": ".swiper-slide-active",
+    # 轮播图标题（在轮播图元素内查找）
+    "banner_slide_title": ".text-lg",
+
     # Continue Watching
     "continue_watching_first_drama": "div:nth-of-type(4) .gap-md > div:first-child img",
     "continue_watching_more": "div:nth-of-type(4) span",
@@ -109,9 +120,75 @@ SEARCH_PAGE = {
     # 取消按钮（关闭搜索页面）
     "cancel_button": "#app > div > div > div > div.justify-between > div.text-lg",
     # Hot Search 标题
-    "hot_search_title": "text=Hot Search",
+    "hot_search_title": "text=Hot search",
     # 搜索结果-无结果提示
     "no_results": "span.text-placeholder.text-lg",
     # 清空搜索历史
-    "clear_search_history": "#app > div > div > div > div.flex-col > div:nth-of-type(1) svg"
+    "clear_search_history": "#app > div > div > div > div.flex-col > div:nth-of-type(1) svg",
+    # 热门搜索列表中的剧集封面（按 Hot search 标题限定在热门搜索列表内，埋点属性中带 book_id）
+    "hot_search_cover": 'xpath://div[contains(@class,"pb-xl")][normalize-space(.)="Hot search"]/following-sibling::div[1]//img[@data-report-list-imp]'
+}
+
+
+# 定位器候选策略（自愈定位使用）
+# 键为 "表名.定位器名"，这里按文本、属性的顺序配置语义候选，优先于表中的原始（位置）定位器：
+# 栏目顺序调整后位置定位器仍会命中错误的栏目，只在语义候选均未命中时兜底
+# 运行时由 utils/locator_healer.py 一次性批量探测，命中的语义候选会被提升并持久化排名
+LOCATOR_FALLBACKS = {
+    "HOME_PAGE.continue_watching_first_drama": [
+        # 文本：按栏目标题定位栏目，取第一个剧集封面
+        'xpath://div[contains(@class,"px-xl")][.//div[contains(@class,"justify-between")][contains(normalize-space(.),"Continue Watching")]]//div[contains(@class,"gap-md")]/div[1]//img',
+        # 属性：封面埋点数据中的栏目名
+        'css:.gap-md img[data-report-list-imp*=\'"module_name":"继续观看"\']',
+    ],
+    "HOME_PAGE.continue_watching_more": [
+        # 文本：栏目标题所在行的 More 入口
+        'xpath://div[contains(@class,"justify-between")][contains(normalize-space(.),"Continue Watching")]//div[contains(@class,"more")]/span',
+    ],
+    "HOME_PAGE.best_first_drama": [
+        # 文本：按栏目标题定位栏目，取第一个剧集封面
+        'xpath://div[contains(@class,"px-xl")][.//div[contains(@class,"justify-between")][contains(normalize-space(.),"Best")]]//div[contains(@class,"gap-md")]/div[1]//img',
+        # 属性：封面埋点数据中的栏目名
+        'css:.gap-md img[data-report-list-imp*=\'"module_name":"最好的"\']',
+    ],
+    "HOME_PAGE.eastern_legends_first_drama": [
+        # 文本：按栏目标题定位栏目，取第一个剧集封面
+        'xpath://div[contains(@class,"px-xl")][.//div[contains(@class,"justify-between")][contains(normalize-space(.),"Eastern Legends")]]//div[contains(@class,"gap-md")]/div[1]//img',
+        # 属性：封面埋点数据中的栏目名
+        'css:.gap-md img[data-report-list-imp*=\'"module_name":"东方传奇"\']',
+    ],
+    "HOME_PAGE.eastern_legends_more": [
+        # 文本：栏目标题所在行的 More 入口
+        'xpath://div[contains(@class,"justify-between")][contains(normalize-space(.),"Eastern Legends")]//div[contains(@class,"more")]/span',
+    ],
+    "HOME_PAGE.queens_revenge_first_drama": [
+        # 文本：按栏目标题定位栏目，取第一个剧集封面
+        'xpath://div[contains(@class,"px-xl")][.//div[contains(@class,"justify-between")][contains(normalize-space(.),"Queen\'s Revenge")]]//div[contains(@class,"gap-md")]/div[1]//img',
+        # 属性：封面埋点数据中的栏目名
+        'css:.gap-md img[data-report-list-imp*=\'"module_name":"复仇女王"\']',
+    ],
+    "HOME_PAGE.queens_revenge_more": [
+        # 文本：栏目标题所在行的 More 入口
+        'xpath://div[contains(@class,"justify-between")][contains(normalize-space(.),"Queen\'s Revenge")]//div[contains(@class,"more")]/span',
+    ],
+    "HOME_PAGE.bossy_ceo_first_drama": [
+        # 文本：按栏目标题定位栏目，取第一个剧集封面
+        'xpath://div[contains(@class,"px-xl")][.//div[contains(@class,"justify-between")][contains(normalize-space(.),"Bossy CEO")]]//div[contains(@class,"gap-md")]/div[1]//img',
+        # 属性：封面埋点数据中的栏目名
+        'css:.gap-md img[data-report-list-imp*=\'"module_name":"霸道总裁"\']',
+    ],
+    "HOME_PAGE.bossy_ceo_more": [
+        # 文本：栏目标题所在行的 More 入口
+        'xpath://div[contains(@class,"justify-between")][contains(normalize-space(.),"Bossy CEO")]//div[contains(@class,"more")]/span',
+    ],
+    "HOME_PAGE.return_of_god_of_war_first_drama": [
+        # 文本：按栏目标题定位栏目，取第一个剧集封面
+        'xpath://div[contains(@class,"px-xl")][.//div[contains(@class,"justify-between")][contains(normalize-space(.),"The Return of God of War")]]//div[contains(@class,"gap-md")]/div[1]//img',
+        # 属性：封面埋点数据中的栏目名
+        'css:.gap-md img[data-report-list-imp*=\'"module_name":"战神归来"\']',
+    ],
+    "HOME_PAGE.return_of_god_of_war_more": [
+        # 文本：栏目标题所在行的 More 入口
+        'xpath://div[contains(@class,"justify-between")][contains(normalize-space(.),"The Return of God of War")]//div[contains(@class,"more")]/span',
+    ],
 }
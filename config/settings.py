@@ -3,6 +3,9 @@
 # 基础地址
 BASE_URL = "https://video.reelswave.net/"
 
+# 剧集播放页地址模板，content_id 为剧 ID，episode 为集数
+CONTENT_URL_TEMPLATE = BASE_URL + "content/{content_id}?chapterIndex={episode}"
+
 # 测试首页地址
 TEST_HOME_URL = "https://video.reelswave.net/content/286606456962772992?chapterIndex=1"
 
@@ -30,5 +33,171 @@ SCHEDULE_CONFIG = {
 REPORT_CONFIG = {
     "base_dir": "reports",
     "screenshot_dir": "reports/screenshots",
-    "enable_screenshots": True
+    "enable_screenshots": True,
+    # 报告保留策略：满足任一条件即保留（最近 N 次、失败的运行、最近 N 天），其余在会话结束后后台清理
+    "retention": {
+        "enabled": True,
+        "keep_last": 20,
+        "keep_failed": True,
+        "max_age_days": 30
+    }
+}
+
+# 日志配置
+LOG_CONFIG = {
+    "level": "INFO",
+    "log_dir": "logs",
+    "filename": "application_{date}.log",
+    "console": True,
+    "format": "%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s",
+    # 用例级日志捕获：每个用例在内存中最多保留的记录数和捕获级别，用例失败时写入报告目录 logs/
+    "case_capture_max_records": 2000,
+    "case_capture_level": "INFO"
+}
+
+# 离线定位器校验配置：启动浏览器前用 html_files/ 中的页面快照校验定位器
+# mode: off 关闭 / warn 只打印摘要 / strict 有定位器未匹配时终止测试
+LOCATOR_VERIFY_CONFIG = {
+    "mode": "warn",
+    "snapshot_dir": "html_files",
+    # 定位器表 -> 快照文件（多个快照时需在每个快照中都能匹配）；没有快照的表跳过
+    "snapshots": {
+        "DRAMA_HOME_PAGE": ["drama_home.html"],
+        "VIDEO_PLAYER_PAGE": ["player.html"],
+        "HOME_PAGE": ["home.html"],
+        "PROFILE_PAGE": ["profile.html"],
+        "SEARCH_PAGE": ["search.html"],
+        "HOME_MORE_PAGE": [
+            "bossy_ceo.html",
+            "continue_watching.html",
+            "eastern_legends.html",
+            "queens_revenge.html",
+            "return_of_god_of_war.html"
+        ]
+    },
+    # 单个定位器使用其他快照（如搜索入口位于首页）
+    "entry_snapshots": {
+        "SEARCH_PAGE.search_icon": ["home.html"]
+    },
+    # 只在交互后出现、快照中不存在的元素，跳过校验
+    "skip_entries": [
+        "SEARCH_PAGE.clear_button",
+        "SEARCH_PAGE.no_results"
+    ]
+}
+
+# 页面快照采集配置：pytest --capture-snapshots 或 python run_test.py snapshot
+# 每个页面在独立标签页中打开（最多 max_tabs 个并行），可选先点击一个定位器（"表名.键"）再序列化 DOM
+SNAPSHOT_CAPTURE_CONFIG = {
+    "output_dir": "html_files",
+    "max_tabs": 4,
+    "wait_seconds": 3,
+    "pages": {
+        "home": {"url": BASE_URL},
+        "drama_home": {"url": TEST_HOME_URL},
+        "player": {"url": TEST_HOME_URL, "click": "DRAMA_HOME_PAGE.watch_button", "wait": 5},
+        "profile": {"url": PROFILE_URL},
+        "search": {"url": BASE_URL, "click": "SEARCH_PAGE.search_icon"}
+    }
+}
+
+# 网络策略配置：通过 CDP Network.setBlockedURLs 屏蔽与用例无关的资源
+# 用例通过 @pytest.mark.network("策略名") 选择策略，命令行 --network-policy 覆盖所有用例（off 关闭屏蔽）
+NETWORK_POLICY_CONFIG = {
+    "enabled": True,
+    # 未标记的用例使用的策略，None 表示只统计不屏蔽
+    "default_policy": None,
+    # URL 模式分组（支持 * 通配符）
+    "block_groups": {
+        "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.webp*", "*.gif*"],
+        "font": ["*.woff*", "*.ttf*", "*.otf*"],
+        "media": ["*.m3u8*", "*.ts", "*.ts?*", "*.mp4*"],
+        "analytics": [
+            "*clarity.ms*",
+            "*googlesyndication.com*",
+            "*doubleclick.net*",
+            "*google-analytics.com*",
+            "*googletagmanager.com*",
+            "*rum.aliyuncs.com*",
+            "*google.com/recaptcha*"
+        ]
+    },
+    # 策略名 -> 屏蔽的分组
+    "policies": {
+        "lite": ["image", "font", "media", "analytics"],
+        "no_analytics": ["analytics"]
+    }
+}
+
+# HTTP 录制/回放配置：pytest --http-mode=record 录制，--http-mode=replay 回放
+# 每个测试类（页面流程）一个 HAR 格式的归档：<archive_dir>/<模块>.<类>.har.json
+HTTP_REPLAY_CONFIG = {
+    "archive_dir": "http_archives",
+    # 匹配请求时忽略的查询参数（时间戳、随机数等）
+    "ignore_params": ["_", "t", "ts", "timestamp", "nonce", "_t"],
+    # 超过该大小的响应不录制（如完整视频文件）
+    "max_body_bytes": 5 * 1024 * 1024,
+    # 回放时未录制的请求是否访问网络；False 时请求直接失败，保证回放不依赖网络
+    "passthrough": False
+}
+
+# HTTP 响应缓存配置：pytest --http-cache 启用，所有 worker 的浏览器共享同一个磁盘缓存
+HTTP_CACHE_CONFIG = {
+    "enabled": False,
+    "cache_dir": ".cache/http",
+    "max_bytes": 500 * 1024 * 1024,
+    "max_age_seconds": 86400,
+    # 单个响应超过该大小不缓存
+    "max_body_bytes": 10 * 1024 * 1024,
+    # 缓存的 CDP 资源类型；页面文档和接口数据（Document、XHR、Fetch）随账号状态变化，默认不缓存
+    "resource_types": ["Script", "Stylesheet", "Image", "Font"]
+}
+
+# 播放启动性能基准配置：pytest --benchmark 执行，结果的分位数追加到历史记录
+BENCHMARK_CONFIG = {
+    "url_template": CONTENT_URL_TEMPLATE,
+    # 参与基准的剧和剧集
+    "targets": [
+        {"content_id": "286606456962772992", "episodes": [1, 2, 3]}
+    ],
+    # 每个剧集重复测量的次数
+    "iterations": 3,
+    # 等待首帧的超时时间（秒）
+    "first_frame_timeout": 20,
+    # 历史记录文件（JSON Lines，每次运行一行），超过 max_records 时丢弃最旧的记录
+    "history_file": "reports/perf_history.jsonl",
+    "max_records": 1000
+}
+
+# 页面加载性能采集配置：每次导航后采集 Navigation Timing、LCP、CLS、长任务和 JS 堆大小，按 URL 汇总到测试报告
+WEB_VITALS_CONFIG = {
+    "enabled": True,
+    # 性能预算：报告中超出预算的 p90 标红（时间单位毫秒）
+    "budgets": {
+        "ttfb_ms": 800,
+        "fcp_ms": 1800,
+        "lcp_ms": 2500,
+        "cls": 0.1,
+        "blocking_ms": 300
+    }
+}
+
+# MORE 栏目并行巡检配置：每个栏目在独立标签页中打开（最多 max_tabs 个并行）
+MORE_CRAWL_CONFIG = {
+    "max_tabs": 4,
+    # 等待 MORE 页面出现剧集条目的超时时间（秒）
+    "item_timeout": 15,
+    # 等待封面图加载结束的超时时间（秒），超时仍未加载的封面图记为 pending，不算失败
+    "image_timeout": 10
+}
+
+# 热门搜索并行校验配置：一次收集所有剧集的落地页，每个剧集在独立标签页中校验能否开始播放（最多 max_tabs 个并行）
+HOT_SEARCH_CHECK_CONFIG = {
+    # 剧集落地页地址，content_id 取自封面埋点属性中的 book_id，打开第 1 集
+    "url_template": CONTENT_URL_TEMPLATE,
+    "max_tabs": 4,
+    # 等待剧首页"去看剧"按钮出现的超时时间（秒）
+    "page_timeout": 15,
+    # 点击"去看剧"后等待视频开始播放的超时时间（秒）
+    "play_timeout": 20
 }
@@ -4,26 +4,123 @@ pytest 配置文件，提供测试夹具（fixtures）
 import pytest
 import os
 from datetime import datetime
+from pathlib import Path
 from DrissionPage._pages.chromium_page import ChromiumPage
 from DrissionPage._configs.chromium_options import ChromiumOptions
 from page.base import kill_processes_using_port
 from utils.screenshot_utils import get_screenshot_utils
+from utils.case_log_capture import get_case_log_capture
+from utils.network_policy import NetworkPolicy, get_network_accounting, aggregate_network_stats
+from utils.http_replay import HttpReplaySession
+from utils.http_cache import HttpCacheHandler, get_http_cache
+from utils.cdp_fetch import get_fetch_interceptor
+from utils.web_vitals import get_web_vitals_monitor
+from config.settings import WEB_VITALS_CONFIG
 from utils.pytest_html_plugin import ChineseHTMLReportPlugin
 
 
+def pytest_addoption(parser):
+    """注册自定义命令行选项"""
+    parser.addoption(
+        "--results-json",
+        action="store",
+        default=None,
+        help="额外写出一份结构化结果文件（results.json）到指定路径，供运行器直接读取"
+    )
+    parser.addoption(
+        "--locator-check",
+        action="store",
+        default=None,
+        choices=("off", "warn", "strict"),
+        help="启动浏览器前用 html_files/ 快照离线校验定位器：off 关闭 / warn 打印摘要 / strict 有未匹配时终止，"
+             "默认取 LOCATOR_VERIFY_CONFIG['mode']"
+    )
+    parser.addoption(
+        "--capture-snapshots",
+        action="store_true",
+        default=False,
+        help="执行页面快照采集用例（snapshot 标记），把主要页面的 DOM 压缩写入 html_files/"
+    )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="执行播放启动性能基准用例（benchmark 标记），结果追加到 BENCHMARK_CONFIG['history_file']"
+    )
+    parser.addoption(
+        "--network-policy",
+        action="store",
+        default=None,
+        help="所有用例使用的网络策略（NETWORK_POLICY_CONFIG['policies'] 中的名称），off 关闭屏蔽；"
+             "默认按用例的 network 标记选择"
+    )
+    parser.addoption(
+        "--http-mode",
+        action="store",
+        default="off",
+        choices=("off", "record", "replay"),
+        help="HTTP 录制/回放：record 把每个测试类的响应录制到 http_archives/，replay 用录制的响应代替远程站点"
+    )
+    parser.addoption(
+        "--http-cache",
+        action="store_true",
+        default=None,
+        help="启用所有 worker 共享的 HTTP 磁盘缓存（默认取 HTTP_CACHE_CONFIG['enabled']），录制/回放时不生效"
+    )
+
+
 # 注册中文报告插件
 def pytest_configure(config):
     """pytest 配置钩子，注册自定义插件"""
+    from utils.report_dir_manager import get_report_dir_manager
+    from config.settings import REPORT_CONFIG
+
+    # 基础目录按项目根目录解析，报告目录、latest 链接和结果文件中的产物路径不随运行时的工作目录变化
+    report_base_dir = Path(__file__).parent / REPORT_CONFIG.get('base_dir', 'reports')
+
     # 只在主进程中注册插件，避免并发时生成多个报告
     if hasattr(config, 'workerinput') is False:
-        config.pluginmanager.register(ChineseHTMLReportPlugin(config), "chinese_html_report")
-        
-        # 初始化报告目录管理器
-        from utils.report_dir_manager import get_report_dir_manager
-        from config.settings import REPORT_CONFIG
-        
-        report_base_dir = REPORT_CONFIG.get('base_dir', 'reports')
+        # 启动前校验定位器语法，避免错误的选择器在长时间运行后才暴露
+        from utils.locator_compiler import LOCATOR_ERRORS
+        if LOCATOR_ERRORS:
+            raise pytest.UsageError("定位器校验失败:\n" + "\n".join(LOCATOR_ERRORS))
+
+        # 用页面快照离线校验定位器的匹配数和唯一性（不启动浏览器，耗时在一秒以内）
+        from utils.offline_locator_verifier import run_offline_verification
+        passed, summary = run_offline_verification(config.getoption("--locator-check"))
+        if not passed:
+            raise pytest.UsageError(summary)
+        if summary:
+            print(f"\n{summary}")
+
+        # 先创建本次运行的报告目录，插件和截图工具共用同一个运行目录
         get_report_dir_manager(report_dir=report_base_dir)
+        config.pluginmanager.register(ChineseHTMLReportPlugin(config), "chinese_html_report")
+    else:
+        # worker 进程加入主进程创建的运行目录，截图写入同一目录
+        run_id = config.workerinput.get('report_run_id')
+        get_report_dir_manager(report_dir=report_base_dir, run_id=run_id)
+
+
+def pytest_collection_modifyitems(config, items):
+    """未指定 --capture-snapshots / --benchmark 时跳过快照采集和性能基准用例"""
+    skips = {}
+    if not config.getoption("--capture-snapshots"):
+        skips["snapshot"] = pytest.mark.skip(reason="需要 --capture-snapshots 才会采集页面快照")
+    if not config.getoption("--benchmark"):
+        skips["benchmark"] = pytest.mark.skip(reason="需要 --benchmark 才会执行性能基准")
+    for item in items:
+        for marker, skip in skips.items():
+            # 按标记判断，避免名称中包含 snapshot/benchmark 的普通用例被跳过
+            if item.get_closest_marker(marker):
+                item.add_marker(skip)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """pytest-xdist 钩子：把主进程的运行 ID 传给 worker"""
+    from utils.report_dir_manager import get_report_dir_manager
+    node.workerinput['report_run_id'] = get_report_dir_manager().get_run_id()
 
 
 # 全局变量存储浏览器实例（用于非并发模式）
@@ -39,9 +136,17 @@ def pytest_runtest_setup(item):
     """
     # 不在这里清空截图，因为会在fixture执行之前调用
     # 改为在pytest_runtest_call中清空
+    # 开始捕获当前用例的日志（包含 fixture 初始化阶段）
+    worker_id = getattr(item.config, 'workerinput', {}).get('workerid', 'master')
+    get_case_log_capture().start(item.nodeid, worker_id)
     yield
 
 
+def pytest_runtest_logfinish(nodeid, location):
+    """用例全部阶段结束后丢弃日志缓冲区"""
+    get_case_log_capture().finish()
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_call(item):
     """
@@ -61,6 +166,13 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
 
+    # 任一阶段失败（包括浏览器、fixture 初始化和清理）都把内存中的日志写入报告目录，并关联到测试报告
+    if report.failed:
+        from utils.report_dir_manager import get_report_dir_manager
+        log_file = get_case_log_capture().dump(get_report_dir_manager().get_report_dir())
+        if log_file:
+            report.user_properties.append(("log_file", log_file))
+
     if report.when == "call":
         # 获取截图
         screenshot_utils = get_screenshot_utils()
@@ -95,6 +207,17 @@ def pytest_runtest_makereport(item, call):
             else:
                 print(f"[DEBUG] 无法获取page对象，无法捕获失败截图")
 
+        # 读取当前页面的加载性能，连同本用例期间所有导航的数据关联到测试报告
+        browser_fixture = next(
+            (name for name in ('page', 'player_page', 'drama_home_page') if name in getattr(item, 'funcargs', {})), None
+        )
+        if browser_fixture and WEB_VITALS_CONFIG.get('enabled', True):
+            monitor = get_web_vitals_monitor(item.funcargs[browser_fixture])
+            monitor.capture()
+            web_vitals = monitor.drain()
+            if web_vitals:
+                report.user_properties.append(("web_vitals", web_vitals))
+
         if screenshots:
             # 将截图路径添加到测试报告中
             print(f"[DEBUG] 将{len(screenshots)}个截图添加到测试报告")
@@ -103,6 +226,141 @@ def pytest_runtest_makereport(item, call):
             print(f"[DEBUG] 没有截图需要添加到测试报告")
 
 
+def pytest_sessionfinish(session):
+    """每个进程把网络统计写入报告目录，由主进程汇总"""
+    cache_stats = get_http_cache().stats() if _http_cache_enabled(session.config) else None
+    if cache_stats and (cache_stats['hits'] or cache_stats['misses']):
+        from utils.logger_utils import LoggerUtils
+        LoggerUtils.get_default_logger().info(
+            "HTTP 缓存: 命中 %s，未命中 %s，本地应答 %.2f MB",
+            cache_stats['hits'], cache_stats['misses'], cache_stats['bytes_served'] / 1024 / 1024
+        )
+
+    accounting = get_network_accounting()
+    stats = accounting.to_dict()
+    if stats['requests'] or stats['blocked_total']:
+        from utils.report_dir_manager import get_report_dir_manager
+        worker_id = getattr(session.config, 'workerinput', {}).get('workerid', 'master')
+        accounting.save(get_report_dir_manager().get_report_dir(), worker_id)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """主进程输出本次运行的网络统计"""
+    if hasattr(config, 'workerinput'):
+        return
+    from utils.report_dir_manager import get_report_dir_manager
+    totals = aggregate_network_stats(get_report_dir_manager().get_report_dir())
+    if not totals:
+        return
+    blocked = ', '.join(f"{resource_type} {count}" for resource_type, count in sorted(totals['blocked'].items()))
+    terminalreporter.write_line(
+        f"网络统计: 请求 {totals['requests']} 个，加载 {totals['bytes_loaded'] / 1024 / 1024:.2f} MB；"
+        f"屏蔽 {totals['blocked_total']} 个（{blocked or '无'}），估算节省 {totals['bytes_saved'] / 1024 / 1024:.2f} MB"
+    )
+
+
+def _browser_fixture_name(request):
+    """
+    获取用例使用的浏览器夹具名
+    :param request: pytest request 对象
+    :return: 夹具名，用例不使用浏览器时返回 None
+    """
+    return next((name for name in ('page', 'player_page', 'drama_home_page') if name in request.fixturenames), None)
+
+
+@pytest.fixture(autouse=True)
+def http_replay(request):
+    """
+    用例级 HTTP 录制/回放（--http-mode），归档按测试类（页面流程）保存
+    只对使用浏览器夹具的用例生效
+    """
+    mode = request.config.getoption("--http-mode")
+    browser_fixture = _browser_fixture_name(request)
+    if mode == 'off' or browser_fixture is None:
+        yield None
+        return
+
+    flow = f"{request.module.__name__.rsplit('.', 1)[-1]}.{request.cls.__name__ if request.cls else 'functions'}"
+    session = HttpReplaySession(request.getfixturevalue(browser_fixture), flow, mode)
+    if not session.start():
+        pytest.fail(f"无法启动 HTTP {mode}: 流程 {flow} 没有可用的归档，请先使用 --http-mode=record 录制")
+    yield session
+    session.stop()
+
+
+def _http_cache_enabled(config):
+    """
+    判断是否启用 HTTP 缓存：命令行优先，其次配置；录制/回放时不启用，避免缓存应答绕过录制
+    :param config: pytest config 对象
+    :return: 是否启用
+    """
+    from config.settings import HTTP_CACHE_CONFIG
+    if config.getoption("--http-mode") != 'off':
+        return False
+    enabled = config.getoption("--http-cache")
+    return HTTP_CACHE_CONFIG.get('enabled', False) if enabled is None else enabled
+
+
+@pytest.fixture(autouse=True)
+def http_cache(request):
+    """用例级 HTTP 缓存：把共享缓存处理器注册到用例浏览器的 Fetch 拦截器上"""
+    browser_fixture = _browser_fixture_name(request)
+    if browser_fixture is None or not _http_cache_enabled(request.config):
+        yield None
+        return
+
+    interceptor = get_fetch_interceptor(request.getfixturevalue(browser_fixture))
+    handler = HttpCacheHandler()
+    interceptor.add_handler(handler)
+    yield handler
+    interceptor.remove_handler(handler)
+
+
+@pytest.fixture(autouse=True)
+def web_vitals(request):
+    """
+    用例级页面加载性能采集：在导航前注入观察脚本，每次导航的数据在用例结束时关联到测试报告
+    只对使用浏览器夹具的用例生效
+    """
+    browser_fixture = _browser_fixture_name(request)
+    if not WEB_VITALS_CONFIG.get('enabled', True) or browser_fixture is None:
+        yield None
+        return
+
+    monitor = get_web_vitals_monitor(request.getfixturevalue(browser_fixture))
+    monitor.start()
+    try:
+        yield monitor
+    finally:
+        # 移除观察脚本和上报绑定，会话级页面上的后续用例不受影响
+        monitor.stop()
+        monitor.drain()
+
+
+@pytest.fixture(autouse=True)
+def network_policy(request):
+    """
+    用例级网络策略：按 --network-policy、network 标记或默认策略屏蔽无关资源，用例结束后恢复
+    只对使用浏览器夹具的用例生效
+    """
+    from config.settings import NETWORK_POLICY_CONFIG
+
+    browser_fixture = _browser_fixture_name(request)
+    if not NETWORK_POLICY_CONFIG.get('enabled', True) or browser_fixture is None:
+        yield None
+        return
+
+    policy_name = request.config.getoption("--network-policy")
+    if policy_name is None:
+        marker = request.node.get_closest_marker("network")
+        policy_name = marker.args[0] if marker and marker.args else NETWORK_POLICY_CONFIG.get('default_policy')
+
+    policy = NetworkPolicy(request.getfixturevalue(browser_fixture))
+    policy.apply(policy_name)
+    yield policy
+    policy.clear()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_session():
     """会话级别的夹具，在整个测试会话开始前执行"""
@@ -128,6 +386,10 @@ def get_or_create_browser():
         )
         co.set_argument("--window-size=430,932")
         co.set_argument("--disable-blink-features=AutomationControlled")
+        # 并行校验在后台标签页中播放视频，关闭后台标签页的媒体挂起、渲染降级和定时器节流
+        co.set_argument("--disable-background-media-suspend")
+        co.set_argument("--disable-renderer-backgrounding")
+        co.set_argument("--disable-background-timer-throttling")
 
         _browser_instance = ChromiumPage(co)
 
@@ -156,6 +418,10 @@ def create_browser_for_worker(worker_id):
     )
     co.set_argument("--window-size=430,932")
     co.set_argument("--disable-blink-features=AutomationControlled")
+    # 并行校验在后台标签页中播放视频，关闭后台标签页的媒体挂起、渲染降级和定时器节流
+    co.set_argument("--disable-background-media-suspend")
+    co.set_argument("--disable-renderer-backgrounding")
+    co.set_argument("--disable-background-timer-throttling")
 
     return ChromiumPage(co)
 
@@ -5,14 +5,17 @@ from DrissionPage._configs.chromium_options import ChromiumOptions
 from DrissionPage._pages.chromium_page import ChromiumPage
 from utils.logger_utils import LoggerUtils
 from config.settings import BASE_URL
+from utils.web_vitals import capture_web_vitals
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
 
 def kill_processes_using_port(port):
     """
     杀死占用指定端口的进程
     :param port: 端口号
     """
-    logger = LoggerUtils.get_default_logger()
-    logger.info(f"检查并清理端口 {port}...")
+    logger.info("检查并清理端口 %s...", port)
 
     try:
         # 使用netstat命令查找占用该端口的进程
@@ -26,12 +29,12 @@ def kill_processes_using_port(port):
                 if len(parts) >= 2:
                     pid = parts[1]
                     process_name = parts[0]
-                    logger.info(f"发现占用端口 {port} 的进程: PID {pid}, 名称: {process_name}")
+                    logger.info("发现占用端口 %s 的进程: PID %s, 名称: %s", port, pid, process_name)
 
                     try:
                         # 尝试优雅地终止进程
                         os.kill(int(pid), signal.SIGTERM)
-                        logger.info(f"已发送SIGTERM信号给进程 PID {pid}")
+                        logger.info("已发送SIGTERM信号给进程 PID %s", pid)
 
                         # 等待一段时间让进程优雅退出
                         import time
@@ -39,20 +42,19 @@ def kill_processes_using_port(port):
 
                         # 检查进程是否仍在运行
                         if psutil.pid_exists(int(pid)):
-                            logger.info(f"进程 PID {pid} 仍在运行，强制终止")
+                            logger.info("进程 PID %s 仍在运行，强制终止", pid)
                             os.kill(int(pid), signal.SIGKILL)
-                            logger.info(f"已发送SIGKILL信号给进程 PID {pid}")
+                            logger.info("已发送SIGKILL信号给进程 PID %s", pid)
                     except ProcessLookupError:
-                        logger.info(f"进程 PID {pid} 已不存在")
+                        logger.info("进程 PID %s 已不存在", pid)
                     except Exception as e:
-                        logger.error(f"终止进程 PID {pid} 时出错: {e}")
+                        logger.error("终止进程 PID %s 时出错: %s", pid, e)
         else:
-            logger.info(f"端口 {port} 未被占用")
+            logger.info("端口 %s 未被占用", port)
     except Exception as e:
-        logger.error(f"清理端口 {port} 时出错: {e}")
+        logger.error("清理端口 %s 时出错: %s", port, e)
 
 def open_mobile_browser():
-    logger = LoggerUtils.get_default_logger()
 
     # 清理可能占用的端口
     kill_processes_using_port(9223)
@@ -74,7 +76,7 @@ def open_mobile_browser():
     page = ChromiumPage(co)
     page.get(BASE_URL)
     logger.info("启动为移动端模拟模式")
-    logger.info(f"User-Agent: {page.user_agent}")
+    logger.info("User-Agent: %s", page.user_agent)
     return page
 
 
@@ -84,13 +86,12 @@ def get_current_url(page):
     :param page: 页面对象
     :return: 当前页面的URL字符串
     """
-    logger = LoggerUtils.get_default_logger()
     try:
         current_url = page.url
-        logger.info(f"当前页面URL: {current_url}")
+        logger.info("当前页面URL: %s", current_url)
         return current_url
     except Exception as e:
-        logger.error(f"获取当前页面URL时出错: {e}")
+        logger.error("获取当前页面URL时出错: %s", e)
         return None
 
 
@@ -101,14 +102,15 @@ def navigate_to_url(page, url):
     :param url: 目标URL
     :return: 是否成功导航到指定URL
     """
-    logger = LoggerUtils.get_default_logger()
     try:
-        logger.info(f"正在导航到URL: {url}")
+        logger.info("正在导航到URL: %s", url)
         page.get(url)
-        logger.info(f"成功导航到URL: {url}")
+        logger.info("成功导航到URL: %s", url)
+        # 记录本次导航的加载性能（用例未启用采集时不做任何事）
+        capture_web_vitals(page)
         return True
     except Exception as e:
-        logger.error(f"导航到URL {url} 时出错: {e}")
+        logger.error("导航到URL %s 时出错: %s", url, e)
         return False
 
 
@@ -120,7 +122,7 @@ class BaseTest:
         初始化基础测试类
         :param page: 可选，传入已打开的页面对象
         """
-        self.logger = LoggerUtils.get_default_logger()
+        self.logger = logger
         self.page = self._init_page(page)
 
     def _init_page(self, page=None):
@@ -6,6 +6,7 @@ from components.DramaHomeComponent import DramaHomeComponent
 from utils.logger_utils import LoggerUtils
 from utils.screenshot_mixin import ScreenshotMixin
 from config.settings import TEST_HOME_URL
+from config.locators import DRAMA_HOME_PAGE
 
 
 @pytest.mark.drama_home
@@ -108,6 +109,28 @@ class TestDramaHome(ScreenshotMixin):
         self.take_screenshot(name="description_toggled_back")
         self.logger.info("成功验证短剧简介收起功能")
 
+    @pytest.mark.regression
+    def test_episode_grid(self):
+        """测试剧集网格快照：每个格子都有状态，且与各状态定位器的匹配数一致"""
+        self.logger.info("测试剧集网格快照")
+        grid = self.drama_home.get_episode_grid()
+        assert grid, "未找到任何剧集格子"
+
+        counts = {}
+        for cell in grid:
+            counts[cell['status']] = counts.get(cell['status'], 0) + 1
+        self.logger.info(f"剧集网格共 {len(grid)} 集，状态统计: {counts}")
+
+        assert [cell['index'] for cell in grid] == list(range(len(grid))), "剧集格子位置不连续"
+        assert 'unknown' not in counts, f"存在无法识别状态的剧集格子: {[c for c in grid if c['status'] == 'unknown']}"
+        assert all(cell['rect'][2] > 0 and cell['rect'][3] > 0 for cell in grid), "存在尺寸为 0 的剧集格子"
+
+        # 与原有定位器的匹配数交叉校验（网格已加载，直接在页面内计数，没有锁定剧集时不等待）
+        locked_count = self.page.run_js("return document.querySelectorAll(arguments[0]).length;",
+                                        DRAMA_HOME_PAGE["locked_episodes_list"])
+        assert counts.get('locked', 0) == locked_count, \
+            f"锁定剧集数量不一致: 网格 {counts.get('locked', 0)}，定位器 {locked_count}"
+
     @pytest.mark.regression
     def test_free_episode(self):
         """测试点击随机一集免费剧集"""
@@ -10,6 +10,8 @@ from config.settings import BASE_URL
 from config.locators import VIDEO_PLAYER_PAGE, DRAMA_HOME_PAGE, HOME_PAGE, HOME_MORE_PAGE
 from utils.page_actions import PageActions
 from utils.screenshot_utils import get_screenshot_utils
+from utils.more_crawler import MoreSectionCrawler
+from utils.video_metrics import VideoMetricsCollector
 from pathlib import Path
 import sys
 
@@ -128,7 +130,7 @@ class TestHome:
 
     @pytest.mark.smoke
     def test_banner_carousel(self):
-        """测试首页 banner 轮播图"""
+        """测试首页 banner 轮播图：依次打开每张轮播图，等待播放器开始播放后返回首页"""
         self.logger.info("测试首页 banner 轮播图")
 
         titles = self.home_component.list_titles()
@@ -138,24 +140,28 @@ class TestHome:
         for index, title in enumerate(titles):
             self.logger.info(f"当前轮播图标题: {title}")
 
+            # 点击前安装播放指标采集，播放器页面的视频开始播放即继续，不再固定等待
+            video_metrics = VideoMetricsCollector(self.page)
+            video_metrics.install()
             assert self.home_component.open_slide_by_title(title), f"点击标题为 {title} 的轮播图失败"
             self.logger.info(f"成功点击轮播图: {title}")
 
-            self.page.wait(5)
-            
+            if video_metrics.wait_until_playing(timeout=15):
+                report = video_metrics.report()
+                self.logger.info(f"成功进入播放器页面，首帧 {report['time_to_first_frame_ms']}ms，"
+                                 f"首次播放 {report['first_playing_ms']}ms")
+            else:
+                self.logger.warning(f"点击轮播图 {title} 后视频未开始播放")
+
             # 捕获截图
             screenshot_utils = get_screenshot_utils()
             screenshot_utils.take_screenshot(self.page, name=f"banner_carousel_{index}")
 
-            video_player = self.player_control.play_pause()
-            if video_player:
-                self.logger.info("成功进入播放器页面")
-                self.page.wait(3)
-            else:
-                self.logger.warning(f"点击轮播图 {title} 后未进入播放器页面")
-
             if index < len(titles) - 1:
-                video_player = self.player_control.play_pause()
+                try:
+                    video_player = self.player_control.play_pause()
+                except Exception:
+                    video_player = None
 
                 if video_player:
                     video_player.click()
@@ -176,6 +182,61 @@ class TestHome:
         self.logger.info("首页 banner 轮播图测试完成")
 
     @pytest.mark.smoke
+    def test_banner_carousel_rotation(self):
+        """测试首页 banner 轮播图切换（直接驱动 Swiper 并等待切换事件，不等待自动轮播间隔）"""
+        self.logger.info("测试首页 banner 轮播图切换")
+
+        state = self.home_component.get_carousel_state()
+        assert state is not None, "未找到轮播图 Swiper 实例"
+        assert state['slides'] > 0, "未找到任何轮播图"
+        self.logger.info(f"轮播图状态: {state}")
+
+        # 暂停自动播放，避免自动轮播干扰切换结果
+        paused = self.home_component.pause_autoplay()
+        assert paused is not None and not paused['autoplay_running'], "暂停轮播图自动播放失败"
+
+        # 一次性提取所有轮播图信息
+        slides = self.home_component.get_swiper_slides()
+        assert len(slides) == state['slides'], f"轮播图数量不一致: Swiper {state['slides']}，提取 {len(slides)}"
+        self.logger.info(f"轮播图: {[(slide['real_index'], slide['title']) for slide in slides]}")
+
+        # 依次切换到每一张轮播图，切换动画结束后校验当前索引和标题
+        for slide in slides:
+            current = self.home_component.slide_to(slide['real_index'])
+            assert current is not None and current['real_index'] == slide['real_index'], \
+                f"切换到第 {slide['real_index']} 张轮播图失败: {current}"
+            assert current['active_title'] == slide['title'], \
+                f"第 {slide['real_index']} 张轮播图标题不一致，期望 {slide['title']}，实际 {current['active_title']}"
+
+        # 最后一张再向后切换：循环模式回到第一张，否则停留在最后一张
+        current = self.home_component.slide_next()
+        expected_index = 0 if state['loop'] else state['slides'] - 1
+        assert current is not None and current['real_index'] == expected_index, \
+            f"最后一张轮播图向后切换后索引错误，期望 {expected_index}，实际: {current}"
+
+        # 页面原本开启自动播放时，恢复后应继续自动轮播
+        if state['autoplay_delay']:
+            resumed = self.home_component.resume_autoplay()
+            assert resumed is not None and resumed['autoplay_running'], "恢复轮播图自动播放失败"
+
+        self.logger.info("首页 banner 轮播图切换测试完成")
+
+    @pytest.mark.regression
+    def test_more_sections_parallel(self):
+        """并行巡检所有 MORE 栏目：每个栏目一个标签页，批量校验剧集条目和封面图"""
+        self.logger.info("开始并行巡检 MORE 栏目")
+
+        results = MoreSectionCrawler(self.page).crawl()
+        assert results, "HOME_PAGE 中没有 MORE 入口"
+
+        for section, result in results.items():
+            self.logger.info(f"栏目 {section}: {len(result['items'])} 个条目，地址 {result['url']}")
+
+        failed = {section: result['error'] for section, result in results.items() if not result['ok']}
+        assert not failed, f"以下 MORE 栏目巡检失败: {failed}"
+
+    @pytest.mark.smoke
+    @pytest.mark.network("no_analytics")
     def test_home_page_locators(self):
         """测试首页所有定位器"""
         self.logger.info("开始测试首页所有定位器")
@@ -196,8 +257,8 @@ class TestHome:
                 self.logger.info(f"定位器 {locator_name} 不是 more 入口，跳过")
                 continue
 
-            # 点击定位器
-            if self.page_actions.click_element(locator_value, selector_type='css'):
+            # 点击定位器（自愈定位：位置定位器失效时使用栏目标题等候选策略）
+            if self.page_actions.click_element_by_key(f"HOME_PAGE.{locator_name}"):
                 self.logger.info(f"成功点击定位器: {locator_name}")
 
                 # 等待页面加载
@@ -0,0 +1,109 @@
+"""
+播放启动性能基准模块
+依次打开 BENCHMARK_CONFIG 中的剧集，测量页面导航耗时、点击"去看剧"到首帧和首次 timeupdate 的时间，
+按剧集和整体计算分位数并追加到性能历史记录
+运行方式: pytest page/playback_benchmark_test.py --benchmark
+"""
+import pytest
+from components.DramaHomeComponent import DramaHomeComponent
+from config.settings import BENCHMARK_CONFIG
+from utils.logger_utils import LoggerUtils
+from utils.perf_history import get_perf_history, summarize
+from utils.video_metrics import VideoMetricsCollector
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 页面导航耗时（毫秒，相对导航开始）
+NAVIGATION_TIMING_JS = """
+const n = performance.getEntriesByType('navigation')[0];
+if (!n) return null;
+return {ttfb: n.responseStart - n.startTime, dom_content_loaded: n.domContentLoadedEventEnd - n.startTime,
+        load: n.loadEventEnd > 0 ? n.loadEventEnd - n.startTime : null};
+"""
+
+# 参与分位数统计的指标
+METRICS = ('ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'click_to_first_frame_ms', 'click_to_first_timeupdate_ms')
+
+
+@pytest.mark.benchmark
+class TestPlaybackBenchmark:
+    """播放启动性能基准类"""
+
+    def _measure(self, page, url):
+        """
+        测量一次剧集的启动耗时
+        :param page: 页面对象
+        :param url: 剧首页 URL
+        :return: 测量结果字典，打开播放器失败时首帧相关指标为 None
+        """
+        page.get(url)
+        drama_home = DramaHomeComponent(page)
+        drama_home.wait_for_elements_loaded()
+        # 等待 load 事件结束后再读取导航耗时
+        page.wait.doc_loaded()
+        navigation = page.run_js(NAVIGATION_TIMING_JS) or {}
+
+        # 页面跳转会清除监听，每次测量重新安装，计时起点为点击"去看剧"之前
+        collector = VideoMetricsCollector(page)
+        collector.install()
+        result = {
+            'ttfb_ms': navigation.get('ttfb'),
+            'dom_content_loaded_ms': navigation.get('dom_content_loaded'),
+            'load_ms': navigation.get('load'),
+            'click_to_first_frame_ms': None,
+            'click_to_first_timeupdate_ms': None,
+            'stalls': None
+        }
+        if not drama_home.click_watch_button():
+            return result
+
+        timeout = BENCHMARK_CONFIG.get('first_frame_timeout', 20)
+        collector.wait_for_first_frame(timeout=timeout)
+        collector.wait_until_playing(timeout=timeout)
+        report = collector.report()
+        result.update({
+            'click_to_first_frame_ms': report['time_to_first_frame_ms'],
+            'click_to_first_timeupdate_ms': report['first_timeupdate_ms'],
+            'stalls': report['stalls']
+        })
+        return result
+
+    def test_playback_startup_benchmark(self, page):
+        """测量所有配置剧集的播放启动耗时并写入历史记录"""
+        url_template = BENCHMARK_CONFIG['url_template']
+        iterations = BENCHMARK_CONFIG.get('iterations', 3)
+
+        measurements = []
+        per_episode = {}
+        for target in BENCHMARK_CONFIG.get('targets', []):
+            for episode in target.get('episodes', [1]):
+                url = url_template.format(content_id=target['content_id'], episode=episode)
+                key = f"{target['content_id']}#{episode}"
+                for iteration in range(iterations):
+                    result = self._measure(page, url)
+                    logger.info("基准 %s 第 %s 次: %s", key, iteration + 1, result)
+                    measurements.append(result)
+                    per_episode.setdefault(key, []).append(result)
+
+        overall = {metric: summarize([m[metric] for m in measurements]) for metric in METRICS}
+        episodes = {
+            key: {metric: summarize([m[metric] for m in results]) for metric in METRICS}
+            for key, results in per_episode.items()
+        }
+        failures = sum(1 for m in measurements if m['click_to_first_frame_ms'] is None)
+
+        history = get_perf_history()
+        history.append('playback_startup', overall, meta={
+            'episodes': episodes,
+            'iterations': iterations,
+            'samples': len(measurements),
+            'failures': failures
+        })
+        previous, current = history.compare_with_previous('playback_startup', 'click_to_first_frame_ms')
+        logger.info("首帧耗时 p50: 本次 %sms，上次 %sms", current, previous)
+        for metric, stats in overall.items():
+            logger.info("%s: %s", metric, stats)
+
+        assert measurements, "BENCHMARK_CONFIG 中没有配置剧集"
+        assert failures < len(measurements), "所有剧集都未能测量到首帧"
@@ -8,6 +8,7 @@ from page.base import get_current_url
 from config.locators import VIDEO_PLAYER_PAGE
 from utils.page_actions import PageActions
 from utils.screenshot_utils import get_screenshot_utils
+from utils.video_metrics import VideoMetricsCollector
 
 
 class TestPlayer:
@@ -37,13 +38,24 @@ class TestPlayer:
         drama_home.wait_for_elements_loaded()
         self.logger.info("剧首页元素加载完成")
 
+        # 在点击前安装视频指标监听，首帧时间从点击"去看剧"开始计算
+        self.video_metrics = VideoMetricsCollector(self.page)
+        self.video_metrics.install()
+
         # 点击"去看剧"按钮打开播放器
         assert drama_home.click_watch_button(), "点击'去看剧'按钮失败"
         self.logger.info("成功点击'去看剧'按钮，打开播放器")
 
-        # 等待播放器加载
-        self.page.wait(5)
-        self.logger.info("播放器加载完成")
+        # 等待视频开始播放（currentTime 前进），替代固定等待
+        if self.video_metrics.wait_until_playing(timeout=15):
+            self.logger.info("播放器加载完成")
+        else:
+            self.logger.warning("播放器加载后视频未开始播放")
+        report = self.video_metrics.report()
+        self.logger.info(
+            f"播放启动指标: 首帧 {report['time_to_first_frame_ms']}ms，"
+            f"首次 timeupdate {report['first_timeupdate_ms']}ms，卡顿 {report['stalls']} 次"
+        )
 
         # 捕获截图
         screenshot_utils = get_screenshot_utils()
@@ -55,6 +67,23 @@ class TestPlayer:
 
 
 
+    def _playback_summary(self, samples):
+        """
+        汇总一段采样的播放指标
+        :param samples: VideoMetricsCollector.timeline 返回的采样列表
+        :return: 指标字典
+        """
+        if not samples:
+            return {}
+        first, last = samples[0], samples[-1]
+        return {
+            'advanced': round(last['currentTime'] - first['currentTime'], 2),
+            'playback_rate': last['playbackRate'],
+            'ready_state': last['readyState'],
+            'dropped_frames': last['droppedFrames'],
+            'stalls': self.video_metrics.report()['stalls']
+        }
+
     def _wait_for_condition(self, condition_func, timeout=10, interval=0.5, error_msg="等待条件超时"):
         """
         等待条件满足
@@ -177,8 +206,9 @@ class TestPlayer:
 
         # 执行暂停操作
         video_player = self._click_video_player(video_player, "执行暂停操作")
-        # 使用条件等待，最多等待5秒，等待菜单关闭
-        self.page.wait(5)
+        # 等待视频暂停（currentTime 停止前进），最多等待5秒
+        if not self.video_metrics.wait_until_paused(timeout=5):
+            self.logger.warning("暂停操作后视频仍在播放")
         
         # 捕获截图
         screenshot_utils = get_screenshot_utils()
@@ -190,8 +220,8 @@ class TestPlayer:
         assert video_player is not None, "未找到播放器元素"
 
         video_player = self._click_video_player(video_player, "继续播放操作")
-        # 等待视频播放一段时间（10秒）
-        self.page.wait(10)
+        # currentTime 前进即认为恢复播放，最多等待10秒
+        assert self.video_metrics.wait_until_playing(timeout=10), "继续播放后视频未恢复播放"
         
         # 捕获截图
         screenshot_utils = get_screenshot_utils()
@@ -206,8 +236,9 @@ class TestPlayer:
         assert video_player is not None, "未找到播放器元素"
 
         video_player = self._click_video_player(video_player, "再次执行暂停操作")
-        # 使用条件等待，最多等待5秒，等待菜单关闭
-        self.page.wait(5)
+        # 等待视频暂停（currentTime 停止前进），最多等待5秒
+        if not self.video_metrics.wait_until_paused(timeout=5):
+            self.logger.warning("再次暂停操作后视频仍在播放")
         
         # 捕获截图
         screenshot_utils = get_screenshot_utils()
@@ -630,11 +661,10 @@ class TestPlayer:
             assert switch_quality is not None, f"未找到{quality}质量选项"
             switch_quality.click()
             self.logger.info(f"切换{quality}成功")
-            # 添加3秒固定等待时间，以便观察切换质量后的状态
-            self.page.wait(3)
-            self.logger.info(f"切换{quality}成功等待20秒")
-            # 等待视频播放一段时间（20秒）
-            self.page.wait(20)
+            # 切换清晰度后重新加载视频源，currentTime 继续前进即认为播放正常
+            assert self.video_metrics.wait_until_playing(timeout=20), f"切换{quality}后视频未继续播放"
+            samples = self.video_metrics.timeline(duration=3)
+            self.logger.info(f"切换{quality}后采样 {len(samples)} 次，指标: {self._playback_summary(samples)}")
 
         for speed in speed_list:
             # 定位播放器--->唤起播放器菜单
@@ -667,11 +697,10 @@ class TestPlayer:
             assert switch_speed is not None, f"未找到{speed}速度选项"
             switch_speed.click()
             self.logger.info(f"切换{speed}成功")
-            # 添加3秒固定等待时间，以便观察切换速度后的状态
-            self.page.wait(3)
-            self.logger.info(f"切换{speed}成功等待20秒")
-            # 等待视频播放一段时间（20秒）
-            self.page.wait(20)
+            # currentTime 继续前进即认为播放正常
+            assert self.video_metrics.wait_until_playing(timeout=20), f"切换{speed}后视频未继续播放"
+            samples = self.video_metrics.timeline(duration=3)
+            self.logger.info(f"切换{speed}后采样 {len(samples)} 次，指标: {self._playback_summary(samples)}")
 
     @pytest.mark.regression
     def test_exit_player(self):
@@ -10,6 +10,7 @@ from config.settings import PROFILE_URL
 
 
 @pytest.mark.profile
+@pytest.mark.network("lite")
 class TestProfile:
     """个人中心测试类"""
 
@@ -4,6 +4,7 @@
 import pytest
 from components.HomeComponent import HomeComponent
 from components.PlayerIconComponent import IconComponent
+from components.SearchComponent import SearchComponent
 from scripts.css_locator_optimizer_playwright import CSSLocatorOptimizerPlaywright
 from utils.logger_utils import LoggerUtils
 from config.settings import BASE_URL
@@ -310,3 +311,26 @@ class TestSearch:
         self._close_search_page()
 
         self.logger.info("搜索有结果场景测试完成")
+
+    @pytest.mark.smoke
+    def test_hot_search_parallel(self):
+        """并行校验全部热门搜索剧集：一次收集落地页，在独立标签页中等待视频开始播放"""
+        self.logger.info("测试热门搜索剧集并行校验")
+
+        # 打开搜索页面
+        assert self._open_search_page(), "打开搜索页面失败"
+
+        search_component = SearchComponent(self.page)
+        targets = search_component.collect_hot_search_targets()
+        assert targets, "未收集到热门搜索剧集"
+
+        results = search_component.validate_hot_search_targets(targets)
+        assert len(results) == len(targets), "热门搜索剧集校验结果数量不一致"
+
+        failed = [f"{result['title']}: {result['error']}" for result in results if not result['ok']]
+        assert not failed, f"以下热门搜索剧集未能开始播放: {failed}"
+
+        # 校验期间搜索页面保持不动，直接关闭
+        self._close_search_page()
+
+        self.logger.info("热门搜索剧集并行校验完成")
@@ -0,0 +1,24 @@
+"""
+页面快照采集模块
+在多个标签页中并行打开主要页面，把带可见性和位置信息的 DOM 压缩写入 html_files/
+运行方式: pytest page/snapshot_capture_test.py --capture-snapshots
+"""
+import pytest
+from utils.dom_snapshot import SnapshotCapturer
+from utils.logger_utils import LoggerUtils
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+
+@pytest.mark.snapshot
+class TestSnapshotCapture:
+    """页面快照采集类"""
+
+    def test_capture_snapshots(self, page):
+        """采集所有配置的页面快照"""
+        status = SnapshotCapturer(page).capture()
+        logger.info("页面快照采集结果: %s", status)
+
+        failed = [name for name, result in status.items() if result == 'failed']
+        assert not failed, f"以下页面快照采集失败: {failed}"
@@ -1,78 +1,64 @@
 
 """
 统一的测试运行脚本
-支持单文件测试、并发测试和定时测试模式
+支持单文件测试、并发测试、定时测试、页面快照采集和性能基准模式
 """
+import os
 import sys
 import time
+import tempfile
 import subprocess
-from datetime import datetime
 from pathlib import Path
 from utils.logger_utils import LoggerUtils
 from utils.scheduler import TaskScheduler
-from utils.screenshot_utils import get_screenshot_utils
-from config.settings import REPORT_CONFIG
+from utils.report_engine import read_results
 
 
-def parse_pytest_output(stdout, stderr, duration):
+def run_pytest_with_results(cmd):
     """
-    解析 pytest 输出
-    :param stdout: 标准输出
-    :param stderr: 标准错误
-    :param duration: 执行耗时
-    :return: 测试结果列表
+    执行 pytest 并读取报告插件输出的结构化结果文件
+    :param cmd: pytest 命令列表
+    :return: (返回码, 结果字典)，结果文件缺失时结果字典为 None
     """
-    test_results = []
-    lines = stdout.split('\n')
-
-    for line in lines:
-        # 解析通过的测试
-        if '::test_' in line and 'PASSED' in line:
-            test_name = line.split('::')[-1].split()[0]
-            # 尝试从行中提取执行时间
-            test_duration = 0.1  # 默认值
-            if 'in ' in line and 's' in line:
-                try:
-                    # 格式通常是 "in X.XXs"
-                    duration_str = line.split('in ')[-1].split('s')[0]
-                    test_duration = float(duration_str)
-                except (IndexError, ValueError):
-                    pass
-
-            test_results.append({
-                'name': test_name,
-                'status': 'passed',
-                'duration': test_duration,
-                'screenshots': [],  # 通过的测试用例不显示截图
-                'error': None
-            })
-
-        # 解析失败的测试
-        elif '::test_' in line and 'FAILED' in line:
-            test_name = line.split('::')[-1].split()[0]
-            # 尝试从行中提取执行时间
-            test_duration = 0.1  # 默认值
-            if 'in ' in line and 's' in line:
-                try:
-                    # 格式通常是 "in X.XXs"
-                    duration_str = line.split('in ')[-1].split('s')[0]
-                    test_duration = float(duration_str)
-                except (IndexError, ValueError):
-                    pass
-
-            # 获取截图
-            screenshot_utils = get_screenshot_utils()
-            screenshots = screenshot_utils.get_screenshots()
-
-            test_results.append({
-                'name': test_name,
-                'status': 'failed',
-                'duration': test_duration,
-                'screenshots': screenshots,  # 失败的测试用例显示所有截图
-                'error': stderr
-            })
-
-    return test_results
+    logger = LoggerUtils.get_default_logger()
+
+    # 由报告插件把 results.json 额外写到临时路径，运行器无需解析输出或扫描报告目录
+    fd, results_path = tempfile.mkstemp(prefix='results_', suffix='.json')
+    os.close(fd)
+
+    try:
+        cmd = cmd + ['--results-json', results_path]
+        logger.info(f"执行命令: {' '.join(cmd)}")
+        result = subprocess.run(cmd)
+        return result.returncode, read_results(results_path)
+    finally:
+        try:
+            os.remove(results_path)
+        except OSError:
+            pass
+
+
+def log_results_summary(results):
+    """
+    输出测试结果统计和报告路径
+    :param results: 结构化结果字典
+    :return: HTML 报告路径，结果缺失时返回 None
+    """
+    logger = LoggerUtils.get_default_logger()
+
+    if not results:
+        logger.error("未找到测试结果文件")
+        return None
+
+    logger.info(
+        f"测试执行完成: 总数 {results['total_cases']}, 通过 {results['passed']}, "
+        f"失败 {results['failed']}, 跳过 {results['skipped']}"
+    )
+
+    report_path = results.get('artifacts', {}).get('html_report')
+    if report_path:
+        logger.info(f"请查看测试报告: {report_path}")
+    return report_path
 
 
 def run_single_test(test_file):
@@ -95,38 +81,17 @@ def run_single_test(test_file):
             '--tb=short'
         ]
 
-        logger.info(f"执行命令: {' '.join(cmd)}")
-
         # 执行测试
-        result = subprocess.run(cmd)
+        returncode, results = run_pytest_with_results(cmd)
 
         duration = time.time() - start_time
+        logger.info(f"测试耗时: {duration:.2f}秒")
 
-        # 解析测试结果（不解析输出，使用自定义插件生成的报告）
-        test_results = []
-
-        # 生成中文报告
-        report_generator = ReportGenerator(report_type='chinese')
-        # 添加时间戳到报告文件名
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        original_report_path = report_generator.generate_report(test_results)
-        if original_report_path:
-            # 重命名报告文件，添加时间戳
-            original_path = Path(original_report_path)
-            new_report_name = f"{timestamp}_{original_path.name}"
-            new_report_path = original_path.parent / new_report_name
-            original_path.rename(new_report_path)
-            report_path = str(new_report_path)
-        else:
-            report_path = None
-
+        report_path = log_results_summary(results)
         if report_path:
-            logger.info(f"中文报告已生成: {report_path}")
             print(f"\n请查看测试报告: {report_path}")
-        else:
-            logger.error("生成报告失败")
 
-        return test_results
+        return results['test_cases'] if results else None
 
     except Exception as e:
         logger.error(f"执行测试失败: {str(e)}")
@@ -169,45 +134,26 @@ def run_concurrent_test(test_file=None, workers=4):
     if test_file:
         cmd.append(test_file)
 
-    logger.info(f"执行命令: {' '.join(cmd)}")
     print("")
     print("=" * 60)
     print("")
 
     # 运行测试
-    result = subprocess.run(cmd)
-    
-    # 解析测试结果
-    test_results = []  # 并发模式下不解析输出，使用自定义插件生成的报告
-    
-    # 查找最新的报告文件
-    report_base_dir = Path(REPORT_CONFIG.get('base_dir', 'reports'))
-    report_files = list(report_base_dir.glob('report_*.html'))
-    if report_files:
-        # 按修改时间排序，获取最新的报告
-        latest_report = max(report_files, key=lambda f: f.stat().st_mtime)
-        report_path = str(latest_report)
-    else:
-        report_path = None
-    if report_path:
-        logger.info(f"请查看测试报告: {report_path}")
-    else:
-        logger.warning("未找到测试报告")
+    returncode, results = run_pytest_with_results(cmd)
+    log_results_summary(results)
 
     print("")
     print("=" * 60)
 
-    if result.returncode == 0:
+    if returncode == 0:
         logger.info("测试执行完成！")
-        if report_path:
-            logger.info(f"请查看测试报告: {report_path}")
     else:
-        logger.error(f"测试执行失败，返回码: {result.returncode}")
+        logger.error(f"测试执行失败，返回码: {returncode}")
 
     print("=" * 60)
     print("")
 
-    return result.returncode == 0
+    return returncode == 0
 
 
 def run_all_tests():
@@ -224,33 +170,56 @@ def run_all_tests():
             '--capture=no'
         ]
 
-        logger.info(f"执行命令: {' '.join(cmd)}")
-
         # 执行测试
-        result = subprocess.run(cmd)
-
-        # 解析测试结果（不解析输出，使用自定义插件生成的报告）
-        test_results = []
-
-        # 生成报告
-        report_generator = ReportGenerator(report_type='chinese')
-        report_path = report_generator.generate_report(test_results)
+        returncode, results = run_pytest_with_results(cmd)
 
-        if test_results:
-            total = len(test_results)
-            passed = sum(1 for r in test_results if r['status'] == 'passed')
-            failed = sum(1 for r in test_results if r['status'] == 'failed')
-            logger.info(f"测试执行完成: 总数 {total}, 通过 {passed}, 失败 {failed}")
-        else:
-            logger.error("测试执行失败")
-
-        return test_results
+        log_results_summary(results)
+        return results['test_cases'] if results else None
 
     except Exception as e:
         logger.error(f"执行测试时发生异常: {str(e)}")
         return None
 
 
+def run_snapshot_capture():
+    """采集页面快照到 html_files/，并用新快照执行一次离线定位器校验"""
+    logger = LoggerUtils.get_default_logger()
+    logger.info("开始采集页面快照...")
+
+    cmd = [
+        'pytest',
+        'page/snapshot_capture_test.py',
+        '--capture-snapshots',
+        '--locator-check=off',
+        '-v',
+        '--tb=short'
+    ]
+    returncode, results = run_pytest_with_results(cmd)
+    log_results_summary(results)
+
+    from utils.offline_locator_verifier import run_offline_verification
+    _, summary = run_offline_verification('warn')
+    print(f"\n{summary}")
+    return returncode == 0
+
+
+def run_benchmark():
+    """执行播放启动性能基准，分位数结果追加到性能历史记录"""
+    logger = LoggerUtils.get_default_logger()
+    logger.info("开始执行播放启动性能基准...")
+
+    cmd = [
+        'pytest',
+        'page/playback_benchmark_test.py',
+        '--benchmark',
+        '-v',
+        '--tb=short'
+    ]
+    returncode, results = run_pytest_with_results(cmd)
+    log_results_summary(results)
+    return returncode == 0
+
+
 def run_scheduled_tests():
     """运行定时测试"""
     logger = LoggerUtils.get_default_logger()
@@ -291,6 +260,8 @@ def main():
         print("  single      - 运行单个测试文件")
         print("  concurrent  - 运行并发测试")
         print("  schedule    - 运行定时测试")
+        print("  snapshot    - 采集页面快照到 html_files/ 并离线校验定位器")
+        print("  benchmark   - 测量剧集播放启动耗时并写入性能历史")
         print("")
         print("选项:")
         print("  -n <进程数>    指定并发进程数（默认: 4）")
@@ -314,6 +285,12 @@ def main():
         print("")
         print("  # 启动定时任务")
         print("  python run_test.py schedule --schedule")
+        print("")
+        print("  # 采集页面快照")
+        print("  python run_test.py snapshot")
+        print("")
+        print("  # 执行播放启动性能基准")
+        print("  python run_test.py benchmark")
         sys.exit(1)
 
     mode = sys.argv[1]
@@ -358,9 +335,17 @@ def main():
         # 运行定时测试
         run_scheduled_tests()
 
+    elif mode == 'snapshot':
+        # 采集页面快照
+        sys.exit(0 if run_snapshot_capture() else 1)
+
+    elif mode == 'benchmark':
+        # 播放启动性能基准
+        sys.exit(0 if run_benchmark() else 1)
+
     else:
         logger.error(f"未知的模式: {mode}")
-        print("可用的模式: single, concurrent, schedule")
+        print("可用的模式: single, concurrent, schedule, snapshot, benchmark")
         sys.exit(1)
 
 
@@ -6,10 +6,13 @@ Extracts click selectors from Chrome recorder JSON, validates against HTML,
 optimizes with text-first strategy, outputs {page_name: {element_name: locator}}.
 """
 
+import gzip
 import json
+import os
 import re
 import sys
 import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
@@ -20,6 +23,65 @@ except ImportError:
     print("Error: BeautifulSoup4 is required. Install with: pip install beautifulsoup4")
     sys.exit(1)
 
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:  # lxml is much faster; fall back to the stdlib parser when it is missing
+    HTML_PARSER = 'html.parser'
+
+
+# Annotation attributes added by utils/dom_snapshot.py (visibility / bounding box); never used in locators
+SNAPSHOT_ATTR_PREFIX = 'data-snap-'
+
+# Class names / attribute names that can be written into a CSS selector without escaping
+CSS_IDENT = re.compile(r'^-?[_a-zA-Z][\w-]*$')
+
+
+class DomIndex:
+    """
+    One-pass indexes over a parsed document, so uniqueness checks are set
+    intersections instead of full-document scans:
+    text -> strings, id/class/tag/(attr, value) -> element ids.
+    """
+
+    def __init__(self, soup):
+        self.text: Dict[str, List[NavigableString]] = {}
+        self.ids: Dict[str, set] = {}
+        self.classes: Dict[str, set] = {}
+        self.tags: Dict[str, set] = {}
+        self.attributes: Dict[Tuple[str, str], set] = {}
+
+        for node in soup.descendants:
+            if isinstance(node, NavigableString):
+                self.text.setdefault(str(node), []).append(node)
+                continue
+            key = id(node)
+            self.tags.setdefault(node.name, set()).add(key)
+            for attr, value in node.attrs.items():
+                if attr == 'class':
+                    for class_name in value:
+                        self.classes.setdefault(class_name, set()).add(key)
+                elif isinstance(value, str):
+                    if attr == 'id':
+                        self.ids.setdefault(value, set()).add(key)
+                    self.attributes.setdefault((attr, value), set()).add(key)
+
+    def count_text(self, text: str) -> int:
+        """Number of text nodes whose content is exactly `text` (same as soup.find_all(string=text))."""
+        return len(self.text.get(text, ()))
+
+    def count(self, tag: str = None, classes: List[str] = (), attributes: List[Tuple[str, str]] = ()) -> int:
+        """Number of elements matching tag AND all classes AND all (attr, value) pairs."""
+        sets = []
+        if tag:
+            sets.append(self.tags.get(tag, set()))
+        sets.extend(self.classes.get(class_name, set()) for class_name in classes)
+        sets.extend(self.attributes.get(pair, set()) for pair in attributes)
+        if not sets:
+            return 0
+        sets.sort(key=len)
+        return len(sets[0].intersection(*sets[1:]))
+
 
 @dataclass
 class ElementInfo:
@@ -51,17 +113,45 @@ class CSSLocatorOptimizerPlaywright:
         'data-clickable', 'data-testid', 'data-cy', 'data-automation'
     }
 
-    def __init__(self, html_file, json_file, page_name: str = None):
+    def __init__(self, html_file, json_file, page_name: str = None, verbose: bool = True):
         self.html_file = Path(html_file) if isinstance(html_file, str) else html_file
         self.json_file = Path(json_file) if json_file and isinstance(json_file, str) else json_file
-        self.page_name = page_name or self.html_file.stem
+        self.page_name = page_name or page_stem(self.html_file)
+        self.verbose = verbose
         self.soup = None
         self.elements: List[ElementInfo] = []
         self.text_locator_cache: Dict[str, int] = {}
+        # Memoized query results; the document is parsed once and never mutated
+        self.select_cache: Dict[str, list] = {}
+        self.text_count_cache: Dict[str, int] = {}
+        self.index: Optional[DomIndex] = None
+
+    def log(self, message: str):
+        if self.verbose:
+            print(message)
 
     def parse_html(self):
-        with open(self.html_file, 'r', encoding='utf-8') as f:
-            self.soup = BeautifulSoup(f.read(), 'html.parser')
+        if self.soup is not None:
+            return
+        opener = gzip.open if self.html_file.suffix == '.gz' else open
+        with opener(self.html_file, 'rt', encoding='utf-8') as f:
+            self.soup = BeautifulSoup(f.read(), HTML_PARSER)
+        # Captured snapshots carry per-element annotations; drop them so they never become locators
+        for element in self.soup.find_all(True):
+            for attr in [a for a in element.attrs if a.startswith(SNAPSHOT_ATTR_PREFIX)]:
+                del element.attrs[attr]
+        self.index = DomIndex(self.soup)
+
+    def select(self, selector: str) -> list:
+        """soup.select with memoization. Invalid selectors return an empty list."""
+        elements = self.select_cache.get(selector)
+        if elements is None:
+            try:
+                elements = self.soup.select(selector)
+            except Exception:
+                elements = []
+            self.select_cache[selector] = elements
+        return elements
 
     def extract_selectors_from_json(self) -> List[Dict]:
         """Extract click selectors from Chrome recorder JSON (supports both steps and events)."""
@@ -166,19 +256,28 @@ class CSSLocatorOptimizerPlaywright:
         return any(re.match(p, class_name, re.IGNORECASE) for p in patterns)
 
     def validate_selector(self, selector: str) -> Tuple[int, bool]:
-        try:
-            elements = self.soup.select(selector)
-            return len(elements), len(elements) == 1
-        except Exception:
-            return 0, False
+        count = len(self.select(selector))
+        return count, count == 1
 
     def validate_text_locator(self, text: str) -> Tuple[int, bool]:
-        try:
-            matches = self.soup.find_all(string=text)
-            actual = [m for m in matches if isinstance(m, NavigableString) and text in m.strip()]
-            return len(actual), len(actual) == 1
-        except Exception:
-            return 0, False
+        count = self.text_count_cache.get(text)
+        if count is None:
+            count = self.index.count_text(text)
+            self.text_count_cache[text] = count
+        return count, count == 1
+
+    def count_matches(self, selector: str, tag: str = None, classes: List[str] = (),
+                      attributes: List[Tuple[str, str]] = ()) -> int:
+        """
+        Count elements for a simple tag/class/attribute selector via the DOM index.
+        Falls back to the CSS engine when a token would need escaping in `selector`,
+        so the count always reflects what the generated selector really matches.
+        """
+        plain = (all(CSS_IDENT.match(c) for c in classes)
+                 and all(CSS_IDENT.match(a) and "'" not in v and '\\' not in v for a, v in attributes))
+        if plain:
+            return self.index.count(tag, classes, attributes)
+        return len(self.select(selector))
 
     def is_element_clickable(self, element) -> bool:
         if element.name in self.CLICKABLE_TAGS:
@@ -266,7 +365,7 @@ class CSSLocatorOptimizerPlaywright:
             stable_classes = [c for c in features['classes'] if not self.is_dynamic_class(c)]
             if len(stable_classes) >= 2:
                 cs = f".{'.'.join(stable_classes)}"
-                if len(self.soup.select(cs)) == 1 and cs != selector:
+                if cs != selector and self.count_matches(cs, classes=stable_classes) == 1:
                     notes.append("Optimized: Using multiple stable classes")
                     return cs, 'css', notes
 
@@ -276,7 +375,7 @@ class CSSLocatorOptimizerPlaywright:
                            and not self.is_dynamic_attribute(k, v)]
             if custom_attrs:
                 attr_sel = f"[{custom_attrs[0][0]}='{custom_attrs[0][1]}']"
-                if len(self.soup.select(attr_sel)) == 1 and attr_sel != selector:
+                if attr_sel != selector and self.count_matches(attr_sel, attributes=custom_attrs[:1]) == 1:
                     notes.append("Optimized: Using custom data attribute")
                     return attr_sel, 'css', notes
 
@@ -285,7 +384,8 @@ class CSSLocatorOptimizerPlaywright:
                 for attr_name, attr_value in features['attributes'].items():
                     if isinstance(attr_value, str) and not self.is_dynamic_attribute(attr_name, attr_value):
                         combo = f"{features['tag']}.{stable_classes[0]}[{attr_name}='{attr_value}']"
-                        if len(self.soup.select(combo)) == 1 and combo != selector:
+                        if combo != selector and self.count_matches(
+                                combo, features['tag'], stable_classes[:1], [(attr_name, attr_value)]) == 1:
                             notes.append("Optimized: Using class + attribute combination")
                             return combo, 'css', notes
 
@@ -294,7 +394,7 @@ class CSSLocatorOptimizerPlaywright:
                 parts = selector.split('>')
                 if len(parts) > 2:
                     simplified = '>'.join(parts[-2:])
-                    if len(self.soup.select(simplified)) == 1 and simplified != selector:
+                    if len(self.select(simplified)) == 1 and simplified != selector:
                         notes.append("Optimized: Simplified selector hierarchy")
                         return simplified, 'css', notes
 
@@ -336,12 +436,12 @@ class CSSLocatorOptimizerPlaywright:
         # 如果 JSON 文件不存在或为 None，则从 HTML 中提取所有可点击元素
         if self.json_file and self.json_file.exists():
             selectors_data = self.extract_selectors_from_json()
-            print(f"\nFound {len(selectors_data)} click selectors from JSON")
+            self.log(f"\nFound {len(selectors_data)} click selectors from JSON")
         else:
             selectors_data = self.extract_clickable_elements_from_html()
-            print(f"\nFound {len(selectors_data)} clickable elements from HTML")
+            self.log(f"\nFound {len(selectors_data)} clickable elements from HTML")
 
-        print("=" * 60)
+        self.log("=" * 60)
 
         result_dict = {self.page_name: {}}
 
@@ -350,10 +450,10 @@ class CSSLocatorOptimizerPlaywright:
             match_count, is_unique = self.validate_selector(selector)
 
             if not is_unique:
-                print(f"  ⚠️  Skip: {selector} (matches {match_count})")
+                self.log(f"  ⚠️  Skip: {selector} (matches {match_count})")
                 continue
 
-            elements = self.soup.select(selector)
+            elements = self.select(selector)
             if not elements:
                 continue
 
@@ -386,7 +486,7 @@ class CSSLocatorOptimizerPlaywright:
 
             emoji = '📝' if locator_type == 'text' else '🔧'
             status = '✅' if is_clickable else '⚠️'
-            print(f"  {status} {emoji} {element_name} → {final_locator}")
+            self.log(f"  {status} {emoji} {element_name} → {final_locator}")
 
         return result_dict
 
@@ -419,13 +519,22 @@ class CSSLocatorOptimizerPlaywright:
         return '\n'.join(lines)
 
 
+def page_stem(path) -> str:
+    """Page name of a snapshot path: home.html, home.html.gz and home all give 'home'."""
+    name = Path(path).name
+    for ext in ('.gz', '.html', '.htm'):
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+    return name
+
+
 def find_matching_files(base_path) -> Tuple[Path, Path]:
-    """Find matching HTML and JSON files with same prefix."""
+    """Find matching HTML (compressed capture preferred) and JSON files with same prefix."""
     base = Path(base_path) if isinstance(base_path, str) else base_path
-    base_name = base.stem
+    base_name = page_stem(base)
 
     html_file = None
-    for ext in ['.html', '.htm']:
+    for ext in ['.html.gz', '.html', '.htm']:
         p = base.parent / f"{base_name}{ext}"
         if p.exists():
             html_file = p
@@ -447,11 +556,223 @@ def find_matching_files(base_path) -> Tuple[Path, Path]:
     return html_file, json_file
 
 
+def find_all_pairs(directory) -> List[Tuple[Path, Path]]:
+    """Find every HTML snapshot in a directory that has a matching recorder JSON."""
+    pairs = []
+    stems = sorted(set(page_stem(p) for p in Path(directory).glob('*.htm*')))
+    for stem in stems:
+        try:
+            pairs.append(find_matching_files(Path(directory) / stem))
+        except FileNotFoundError:
+            continue
+    return pairs
+
+
+def write_outputs(base_path: Path, result: Dict, report: str) -> Tuple[Path, Path]:
+    """Write <stem>_locators.json and <stem>_optimizer_report.txt next to the inputs."""
+    out_json = base_path.parent / f"{page_stem(base_path)}_locators.json"
+    with open(out_json, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    out_report = base_path.parent / f"{page_stem(base_path)}_optimizer_report.txt"
+    with open(out_report, 'w', encoding='utf-8') as f:
+        f.write(report)
+    return out_json, out_report
+
+
+def process_pair(html_file: Path, json_file: Path) -> Tuple[Path, Dict, str]:
+    """Optimize one HTML/JSON pair. Runs in a worker process, so it only returns plain data."""
+    optimizer = CSSLocatorOptimizerPlaywright(html_file, json_file, verbose=False)
+    result = optimizer.process()
+    return html_file, result, optimizer.generate_report()
+
+
+MANIFEST_FILENAME = '.optimizer_manifest.json'
+DIFF_FILENAME = 'locators_diff.json'
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def file_digest(path: Optional[Path]) -> str:
+    """sha256 of a file's content ('' for a missing file)."""
+    if not path or not Path(path).exists():
+        return ''
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def optimizer_digest() -> str:
+    """Hash of this script, so changes to the optimization rules invalidate cached pages."""
+    return file_digest(Path(__file__))[:16]
+
+
+def pair_digest(html_file: Path, json_file: Optional[Path]) -> str:
+    """Content hash of an HTML/JSON pair plus the optimizer version."""
+    return hashlib.sha256(
+        f"{optimizer_digest()}:{file_digest(html_file)}:{file_digest(json_file)}".encode()
+    ).hexdigest()
+
+
+def load_manifest(directory: Path) -> Dict:
+    """Load {stem: {'hash': ..., 'locators': {...}}}; a missing or corrupt manifest is empty."""
+    try:
+        with open(Path(directory) / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json_atomic(path: Path, data) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def diff_locators(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, Dict]:
+    """Element-level diff between two {element_name: locator} maps."""
+    return {
+        'added': {k: new[k] for k in new.keys() - old.keys()},
+        'removed': {k: old[k] for k in old.keys() - new.keys()},
+        'changed': {k: {'old': old[k], 'new': new[k]}
+                    for k in old.keys() & new.keys() if old[k] != new[k]},
+    }
+
+
+def load_locator_tables() -> Tuple[Dict[str, Dict[str, str]], Dict[str, List[str]]]:
+    """
+    Load config/locators.py tables and the table -> snapshot mapping from
+    LOCATOR_VERIFY_CONFIG. Returns ({}, {}) when the project config is unavailable.
+    """
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    try:
+        import config.locators as locators_module
+        from config.settings import LOCATOR_VERIFY_CONFIG
+    except ImportError:
+        return {}, {}
+    tables = {name: value for name, value in vars(locators_module).items()
+              if name.isupper() and isinstance(value, dict)}
+    return tables, LOCATOR_VERIFY_CONFIG.get('snapshots', {})
+
+
+def diff_against_config(page_name: str, page_diff: Dict[str, Dict], tables: Dict, snapshots: Dict) -> List[str]:
+    """
+    Map a page diff onto config/locators.py: config entries that still use a
+    locator the optimizer changed or dropped, and new locators not in the table yet.
+    """
+    lines = []
+    for table_name, files in snapshots.items():
+        if f"{page_name}.html" not in files or table_name not in tables:
+            continue
+        table = tables[table_name]
+        for key, value in table.items():
+            for element, change in page_diff['changed'].items():
+                if value == change['old']:
+                    lines.append(f"  ~ {table_name}.{key}: {value} -> {change['new']} ({element})")
+            for element, old_value in page_diff['removed'].items():
+                if value == old_value:
+                    lines.append(f"  - {table_name}.{key}: {value} no longer generated ({element})")
+        known = set(v for v in table.values() if isinstance(v, str))
+        for element, value in page_diff['added'].items():
+            if value not in known:
+                lines.append(f"  + {table_name}: {element} = {value}")
+    return lines
+
+
+def run_batch(directory, max_workers: Optional[int] = None, force: bool = False) -> Dict[str, Dict[str, str]]:
+    """
+    Optimize all HTML/JSON pairs in a directory across a process pool.
+    Pages whose content hash matches the manifest are reused without re-optimizing
+    (unless force=True). Each page's outputs and the manifest are written as soon
+    as it finishes, and the merged all_locators.json is rewritten after every page,
+    so a partial run keeps its results. Changes are written to locators_diff.json.
+    """
+    directory = Path(directory)
+    pairs = find_all_pairs(directory)
+    if not pairs:
+        print(f"No HTML/JSON pairs found in {directory}")
+        return {}
+
+    manifest = load_manifest(directory)
+    manifest_path = directory / MANIFEST_FILENAME
+    merged: Dict[str, Dict[str, str]] = {}
+    digests: Dict[Path, str] = {}
+    pending = []
+    for html_file, json_file in pairs:
+        digest = pair_digest(html_file, json_file)
+        entry = manifest.get(page_stem(html_file))
+        if not force and entry and entry.get('hash') == digest:
+            merged[page_stem(html_file)] = entry.get('locators', {})
+            continue
+        digests[html_file] = digest
+        pending.append((html_file, json_file))
+
+    out_all = directory / 'all_locators.json'
+    print(f"{len(pairs)} pages, {len(pairs) - len(pending)} unchanged, {len(pending)} to optimize")
+
+    diffs: Dict[str, Dict[str, Dict]] = {}
+    if pending:
+        max_workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(process_pair, html_file, json_file): html_file
+                       for html_file, json_file in pending}
+            for future in as_completed(futures):
+                html_file = futures[future]
+                try:
+                    _, result, report = future.result()
+                except Exception as e:
+                    print(f"  ❌ {html_file.name}: {e}")
+                    continue
+
+                out_json, _ = write_outputs(html_file, result, report)
+                locators = result.get(page_stem(html_file), {})
+                previous = manifest.get(page_stem(html_file), {}).get('locators', {})
+                page_diff = diff_locators(previous, locators)
+                if any(page_diff.values()):
+                    diffs[page_stem(html_file)] = page_diff
+
+                merged.update(result)
+                manifest[page_stem(html_file)] = {'hash': digests[html_file], 'locators': locators}
+                write_json_atomic(manifest_path, manifest)
+                write_json_atomic(out_all, dict(sorted(merged.items())))
+
+                print(f"  ✅ {html_file.name}: {len(locators)} locators → {out_json.name}")
+
+    write_json_atomic(out_all, dict(sorted(merged.items())))
+    write_json_atomic(directory / DIFF_FILENAME, diffs)
+
+    if diffs:
+        tables, snapshots = load_locator_tables()
+        print("\nLocator changes:")
+        for page_name, page_diff in sorted(diffs.items()):
+            counts = ', '.join(f"{len(v)} {k}" for k, v in page_diff.items())
+            print(f"  {page_name}: {counts}")
+            for line in diff_against_config(page_name, page_diff, tables, snapshots):
+                print(line)
+    else:
+        print("\nNo locator changes")
+
+    print(f"\n📄 Merged JSON: {out_all}")
+    return merged
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 css_locator_optimizer_playwright.py <base_file_path> [page_name]")
+        print("       python3 css_locator_optimizer_playwright.py --batch <directory> [--workers N] [--force]")
         sys.exit(1)
 
+    if sys.argv[1] == '--batch':
+        args = sys.argv[2:]
+        force = '--force' in args
+        args = [arg for arg in args if arg != '--force']
+        workers = None
+        if '--workers' in args:
+            idx = args.index('--workers')
+            workers = int(args[idx + 1])
+            del args[idx:idx + 2]
+        run_batch(args[0] if args else 'html_files', workers, force)
+        return
+
     base_path = Path(sys.argv[1])
     page_name = sys.argv[2] if len(sys.argv) > 2 else None
 
@@ -469,13 +790,7 @@ def main():
     report = optimizer.generate_report()
     print(report)
 
-    out_json = base_path.parent / f"{base_path.stem}_locators.json"
-    with open(out_json, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
-
-    out_report = base_path.parent / f"{base_path.stem}_optimizer_report.txt"
-    with open(out_report, 'w', encoding='utf-8') as f:
-        f.write(report)
+    out_json, out_report = write_outputs(base_path, result, report)
 
     print(f"\n📄 JSON: {out_json}")
     print(f"📄 Report: {out_report}")
@@ -0,0 +1,150 @@
+"""
+用例级日志捕获 - 按用例（nodeid + worker）在内存中缓存日志，仅在用例失败时写入报告目录
+"""
+import re
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from utils.logger_utils import LoggerUtils
+from config.settings import LOG_CONFIG
+
+
+# 用例日志在报告目录下的子目录
+CASE_LOG_DIRNAME = 'logs'
+
+
+class CaseLogHandler(logging.Handler):
+    """挂在根日志记录器上的处理器，把记录追加到当前用例的缓冲区"""
+
+    def __init__(self, capture):
+        """
+        初始化用例日志处理器
+        :param capture: CaseLogCapture 实例
+        """
+        super().__init__()
+        self.capture = capture
+
+    def handle(self, record):
+        # 不需要处理器锁：缓冲区是 deque，append 本身线程安全
+        buffer = self.capture.buffer
+        if buffer is not None and record.levelno >= self.level:
+            buffer.append(record)
+            self.capture.record_count += 1
+        return True
+
+    def emit(self, record):
+        pass
+
+
+class CaseLogCapture:
+    """用例级日志捕获器，同一进程同一时间只有一个用例在执行"""
+
+    def __init__(self, max_records=None, level=None):
+        """
+        初始化用例日志捕获器
+        :param max_records: 每个用例最多保留的记录数，超出时丢弃最早的记录
+        :param level: 捕获的最低日志级别
+        """
+        self.max_records = max_records or LOG_CONFIG.get('case_capture_max_records', 2000)
+        self.formatter = logging.Formatter(LOG_CONFIG.get(
+            'format', '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+        ))
+        self.handler = CaseLogHandler(self)
+        self.handler.setLevel(logging.getLevelName(level or LOG_CONFIG.get('case_capture_level', 'INFO')))
+
+        self.nodeid = None
+        self.worker_id = None
+        self.buffer = None
+        self.record_count = 0
+        self._installed = False
+        self._lock = threading.Lock()
+
+    def install(self):
+        """把处理器挂到根日志记录器（只挂一次）"""
+        with self._lock:
+            if not self._installed:
+                logging.getLogger().addHandler(self.handler)
+                self._installed = True
+
+    def start(self, nodeid, worker_id='master'):
+        """
+        开始捕获一个用例的日志
+        :param nodeid: 用例 nodeid
+        :param worker_id: xdist worker ID
+        """
+        self.install()
+        self.nodeid = nodeid
+        self.worker_id = worker_id
+        self.record_count = 0
+        self.buffer = deque(maxlen=self.max_records)
+
+    def finish(self):
+        """结束捕获并丢弃缓冲区"""
+        self.buffer = None
+        self.nodeid = None
+
+    @staticmethod
+    def log_filename(nodeid, worker_id):
+        """
+        根据 nodeid 和 worker 生成日志文件名
+        :param nodeid: 用例 nodeid
+        :param worker_id: xdist worker ID
+        :return: 文件名
+        """
+        safe_nodeid = re.sub(r'[^\w.-]+', '_', nodeid).strip('_')
+        return f"{safe_nodeid}__{worker_id}.log"
+
+    def _format(self, record):
+        """
+        格式化单条记录，参数对象在用例结束后无法转换为文本时退化为原始消息
+        :param record: 日志记录
+        :return: 文本
+        """
+        try:
+            return self.formatter.format(record)
+        except Exception:
+            return f"{record.levelname} - {record.name} - {record.msg}"
+
+    def dump(self, report_dir):
+        """
+        把当前用例的日志写入报告目录
+        :param report_dir: 报告目录
+        :return: 相对报告目录的日志文件路径，没有正在捕获的用例或写入失败时返回 None
+        """
+        buffer = self.buffer
+        if buffer is None or self.nodeid is None:
+            return None
+
+        records = list(buffer)
+        dropped = self.record_count - len(records)
+        relative_path = Path(CASE_LOG_DIRNAME) / self.log_filename(self.nodeid, self.worker_id)
+
+        try:
+            log_path = Path(report_dir) / relative_path
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, 'w', encoding='utf-8') as f:
+                f.write(f"# 用例: {self.nodeid}\n# Worker: {self.worker_id}\n")
+                if dropped > 0:
+                    f.write(f"# 超出缓存上限，已丢弃最早的 {dropped} 条记录\n")
+                for record in records:
+                    f.write(self._format(record) + '\n')
+            return relative_path.as_posix()
+        except Exception as e:
+            LoggerUtils.get_default_logger(__name__).error("写入用例日志失败: %s", e)
+            return None
+
+
+# 全局用例日志捕获器实例
+_case_log_capture = None
+
+
+def get_case_log_capture():
+    """
+    获取用例日志捕获器实例
+    :return: CaseLogCapture 实例
+    """
+    global _case_log_capture
+    if _case_log_capture is None:
+        _case_log_capture = CaseLogCapture()
+    return _case_log_capture
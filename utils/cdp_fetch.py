@@ -0,0 +1,201 @@
+"""
+CDP Fetch 拦截 - 在浏览器标签页上暂停请求，交给注册的处理器决定：
+请求阶段可以直接用本地数据响应（回放、缓存），响应阶段可以读取响应体（录制、写缓存）
+同一个标签页只启用一个拦截器，多个功能以处理器的形式共享
+"""
+import base64
+import threading
+import weakref
+from utils.logger_utils import LoggerUtils
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 处理器返回该值表示让请求失败（如离线回放时未录制的请求）
+FAIL_REQUEST = object()
+
+
+class FetchHandler:
+    """拦截处理器基类，子类按需覆盖"""
+
+    # 是否需要在响应阶段暂停（读取响应体）
+    needs_response = False
+
+    # 响应阶段只暂停这些资源类型（如 {'Script', 'Image'}），None 表示所有类型
+    response_resource_types = None
+
+    def wants_response(self, request, resource_type):
+        """
+        响应阶段读取响应体之前的过滤，返回 False 时不读取响应体、不回调 on_response
+        :param request: CDP Network.Request 字典
+        :param resource_type: 资源类型
+        :return: 是否需要该响应的响应体
+        """
+        return True
+
+    def on_request(self, request, resource_type):
+        """
+        请求阶段回调
+        :param request: CDP Network.Request 字典（url、method、headers 等）
+        :param resource_type: 资源类型，如 Document、Script、Image
+        :return: 响应字典 {status, headers, body(bytes)} 直接响应；FAIL_REQUEST 让请求失败；None 交给下一个处理器
+        """
+        return None
+
+    def on_response(self, request, resource_type, status, headers, body):
+        """
+        响应阶段回调
+        :param request: CDP Network.Request 字典
+        :param resource_type: 资源类型
+        :param status: 响应状态码
+        :param headers: 响应头列表 [{name, value}]
+        :param body: 响应体（bytes），读取失败时为 None
+        """
+
+
+class FetchInterceptor:
+    """标签页上的 Fetch 拦截器"""
+
+    def __init__(self, page):
+        """
+        初始化拦截器
+        :param page: ChromiumPage / ChromiumTab 对象
+        """
+        self.page = page
+        self.handlers = []
+        self._lock = threading.Lock()
+        self._enabled_patterns = None
+
+    def add_handler(self, handler):
+        """
+        注册处理器（按注册顺序调用）并刷新拦截配置
+        :param handler: FetchHandler 实例
+        """
+        with self._lock:
+            if handler not in self.handlers:
+                self.handlers.append(handler)
+        self._refresh()
+
+    def remove_handler(self, handler):
+        """
+        移除处理器，没有处理器时关闭拦截
+        :param handler: FetchHandler 实例
+        """
+        with self._lock:
+            if handler in self.handlers:
+                self.handlers.remove(handler)
+        self._refresh()
+
+    @staticmethod
+    def _build_patterns(handlers):
+        """
+        按处理器构建 Fetch.enable 的拦截模式：请求阶段拦截所有请求，
+        响应阶段只拦截处理器声明的资源类型，视频分片、接口等其他响应不暂停、不读取响应体
+        :param handlers: 处理器列表
+        :return: 拦截模式列表，没有处理器时返回 None
+        """
+        if not handlers:
+            return None
+        patterns = [{'urlPattern': '*', 'requestStage': 'Request'}]
+        listeners = [handler for handler in handlers if handler.needs_response]
+        if any(handler.response_resource_types is None for handler in listeners):
+            patterns.append({'urlPattern': '*', 'requestStage': 'Response'})
+        elif listeners:
+            resource_types = set().union(*(handler.response_resource_types for handler in listeners))
+            patterns.extend({'urlPattern': '*', 'resourceType': resource_type, 'requestStage': 'Response'}
+                            for resource_type in sorted(resource_types))
+        return patterns
+
+    def _refresh(self):
+        """按当前处理器启用或关闭 Fetch 拦截"""
+        with self._lock:
+            handlers = list(self.handlers)
+        patterns = self._build_patterns(handlers)
+        if patterns == self._enabled_patterns:
+            return
+
+        try:
+            if patterns is None:
+                self.page.run_cdp('Fetch.disable')
+                self.page.driver.set_callback('Fetch.requestPaused', None)
+            else:
+                self.page.driver.set_callback('Fetch.requestPaused', self._on_paused)
+                self.page.run_cdp('Fetch.enable', patterns=patterns)
+            self._enabled_patterns = patterns
+        except Exception as e:
+            logger.warning("设置 Fetch 拦截失败: %s", e)
+
+    def _on_paused(self, **kwargs):
+        """Fetch.requestPaused 事件处理：响应阶段带有 responseStatusCode"""
+        request_id = kwargs.get('requestId')
+        request = kwargs.get('request', {})
+        resource_type = kwargs.get('resourceType', 'Other')
+        with self._lock:
+            handlers = list(self.handlers)
+
+        try:
+            if 'responseStatusCode' in kwargs or 'responseErrorReason' in kwargs:
+                self._handle_response(request_id, request, resource_type, kwargs, handlers)
+            else:
+                self._handle_request(request_id, request, resource_type, handlers)
+        except Exception as e:
+            logger.debug("处理拦截请求 %s 失败: %s", request.get('url'), e)
+            try:
+                self.page.run_cdp('Fetch.continueRequest', requestId=request_id)
+            except Exception:
+                pass
+
+    def _handle_request(self, request_id, request, resource_type, handlers):
+        for handler in handlers:
+            response = handler.on_request(request, resource_type)
+            if response is None:
+                continue
+            if response is FAIL_REQUEST:
+                self.page.run_cdp('Fetch.failRequest', requestId=request_id, errorReason='InternetDisconnected')
+                return
+            self.page.run_cdp(
+                'Fetch.fulfillRequest',
+                requestId=request_id,
+                responseCode=response['status'],
+                responseHeaders=response.get('headers', []),
+                body=base64.b64encode(response.get('body', b'')).decode('ascii')
+            )
+            return
+        self.page.run_cdp('Fetch.continueRequest', requestId=request_id)
+
+    def _handle_response(self, request_id, request, resource_type, event, handlers):
+        status = event.get('responseStatusCode')
+        headers = event.get('responseHeaders', [])
+        listeners = [handler for handler in handlers
+                     if handler.needs_response and handler.wants_response(request, resource_type)]
+        # 重定向和失败的响应没有响应体
+        if listeners and status and not 300 <= status < 400:
+            body = None
+            try:
+                result = self.page.run_cdp('Fetch.getResponseBody', requestId=request_id)
+                body = result.get('body', '')
+                body = base64.b64decode(body) if result.get('base64Encoded') else body.encode('utf-8')
+            except Exception as e:
+                logger.debug("读取响应体失败 %s: %s", request.get('url'), e)
+            for handler in listeners:
+                handler.on_response(request, resource_type, status, headers, body)
+        self.page.run_cdp('Fetch.continueRequest', requestId=request_id)
+
+
+# 每个标签页一个拦截器，标签页对象释放后自动移除
+_interceptors = weakref.WeakKeyDictionary()
+_interceptors_lock = threading.Lock()
+
+
+def get_fetch_interceptor(page):
+    """
+    获取标签页的 Fetch 拦截器
+    :param page: ChromiumPage / ChromiumTab 对象
+    :return: FetchInterceptor 实例
+    """
+    with _interceptors_lock:
+        interceptor = _interceptors.get(page)
+        if interceptor is None:
+            interceptor = FetchInterceptor(page)
+            _interceptors[page] = interceptor
+        return interceptor
@@ -7,7 +7,7 @@ import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.logger_utils import LoggerUtils
 from utils.email_notifier import EmailNotifier
-from config.settings import REPORT_CONFIG
+from utils.report_engine import read_results
 
 
 class ConcurrentTestRunner:
@@ -24,10 +24,12 @@ class ConcurrentTestRunner:
         self.test_results = []
         self.lock = threading.Lock()
 
-    def run_concurrent_tests(self, test_functions):
+    def run_concurrent_tests(self, test_functions, results_path=None):
         """
         并发执行测试
         :param test_functions: 测试函数列表
+        :param results_path: pytest 写出的 results.json 路径（可选），用于在邮件中附带 HTML 报告；
+                             测试函数在进程内执行、不产生结果文件，不传时邮件不附带报告
         :return: 测试结果
         """
         try:
@@ -63,11 +65,8 @@ class ConcurrentTestRunner:
             duration = time.time() - start_time
             self.logger.info(f"并发测试完成，总耗时: {duration:.2f}秒")
 
-            # 报告已由ChineseHTMLReportPlugin自动生成，无需手动生成
-            # 发送邮件通知时会自动查找最新的报告文件
-            
             # 发送邮件通知
-            self._send_email_notification(None, duration)
+            self._send_email_notification(results_path, duration)
 
             return self.test_results
 
@@ -110,25 +109,22 @@ class ConcurrentTestRunner:
                 'error': str(e)
             }
 
-    def _send_email_notification(self, report_path, duration):
+    def _send_email_notification(self, results_path, duration):
         """
         发送邮件通知
-        :param report_path: 报告路径
+        :param results_path: results.json 路径，为 None 时不附带报告
         :param duration: 总耗时
         """
         try:
             from datetime import datetime
-            from pathlib import Path
-            
-            # 查找最新的报告文件
-            report_dir = Path(REPORT_CONFIG['base_dir'])
-            report_files = list(report_dir.glob('report_*.html'))
-            if report_files:
-                # 按修改时间排序，获取最新的报告
-                latest_report = max(report_files, key=lambda f: f.stat().st_mtime)
-                report_path = str(latest_report)
-                self.logger.info(f"使用最新报告: {report_path}")
-            
+
+            # 报告路径从调用方传入的结果文件中读取
+            report_path = None
+            results = read_results(results_path) if results_path else None
+            if results:
+                report_path = results.get('artifacts', {}).get('html_report')
+                self.logger.info(f"使用报告: {report_path}")
+
             total_cases = len(self.test_results)
             passed = sum(1 for r in self.test_results if r['status'] == 'passed')
             failed = sum(1 for r in self.test_results if r['status'] == 'failed')
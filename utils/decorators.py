@@ -1,7 +1,11 @@
 # utils/decorators.py
+import logging
 from functools import wraps
 from utils.logger_utils import LoggerUtils
 
+# 模块级日志记录器，被装饰对象没有 logger 属性时使用
+_default_logger = LoggerUtils.get_default_logger(__name__)
+
 def element_wait_decorator(
     wait_type: str = "clickable",  # 等待类型：clickable/exists（你的版本支持的核心类型）
     timeout: int = 8,              # 超时时间
@@ -15,7 +19,7 @@ def element_wait_decorator(
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             # 获取日志记录器
-            logger = getattr(self, 'logger', LoggerUtils.get_default_logger())
+            logger = getattr(self, 'logger', None) or _default_logger
 
             try:
                 # 1. 特殊处理 click_element、get_element_text 和 wait_for_element 方法
@@ -39,7 +43,7 @@ def element_wait_decorator(
                             if element:
                                 element.wait.clickable(timeout=timeout)
                         except Exception as e:
-                            logger.error(f"等待元素可点击失败: {e}")
+                            logger.error("等待元素可点击失败: %s", e)
                             return None
                     
                     # 执行原始方法，传入已找到的元素
@@ -64,7 +68,7 @@ def element_wait_decorator(
                             # 等待元素出现
                             element = self.page.ele(locator, timeout=timeout)
                         except Exception as e:
-                            logger.error(f"等待元素存在失败: {e}")
+                            logger.error("等待元素存在失败: %s", e)
                             return None
                     
                     # 执行原始方法，传入已找到的元素
@@ -82,16 +86,16 @@ def element_wait_decorator(
 
                     # 使用 DrissionPage 的等待机制，等待元素出现
                     try:
-                        logger.debug(f"开始等待元素出现：{locator}，超时：{timeout}秒")
+                        logger.debug("开始等待元素出现：%s，超时：%s秒", locator, timeout)
                         element = self.page.ele(locator, timeout=timeout)
                         if element:
-                            logger.debug(f"元素等待成功：{locator}")
+                            logger.debug("元素等待成功：%s", locator)
                             return element
                         else:
-                            logger.warning(f"元素等待超时：{locator}")
+                            logger.warning("元素等待超时：%s", locator)
                             return None
                     except Exception as e:
-                        logger.error(f"等待元素出现失败: {e}")
+                        logger.error("等待元素出现失败: %s", e)
                         return None
 
                 # 对于其他方法，执行原方法并获取返回值
@@ -105,27 +109,26 @@ def element_wait_decorator(
                     
                 # 2.5 检查元素是否为布尔值或其他非元素对象
                 if isinstance(element, bool):
-                    logger.debug(f"返回的是布尔值而不是元素对象: {element}")
+                    logger.debug("返回的是布尔值而不是元素对象: %s", element)
                     return element  # 直接返回布尔值
                     
                 # 确保元素对象有 wait 属性
                 if not hasattr(element, 'wait'):
-                    logger.debug(f"元素对象没有 wait 属性: {type(element)}")
+                    logger.debug("元素对象没有 wait 属性: %s", type(element))
                     return element  # 直接返回元素对象
 
-                # 3. 提取元素信息（用于日志）
-                try:
-                    if hasattr(element, 'locator'):
-                        locator = element.locator
-                    elif hasattr(element, 'tag'):
-                        locator = f"元素对象（标签：{element.tag}）"
-                    else:
-                        locator = "未知元素"
-                except Exception as e:
-                    # 记录调试信息
-                    logger.debug(f"获取元素信息失败: {e}")
-                    locator = "未知元素"
-                logger.debug(f"开始等待元素（{wait_type}）：{locator}，超时：{timeout}秒")
+                # 3. 提取元素信息（仅用于调试日志，未开启 DEBUG 时跳过）
+                locator = "未知元素"
+                if logger.isEnabledFor(logging.DEBUG):
+                    try:
+                        if hasattr(element, 'locator'):
+                            locator = element.locator
+                        elif hasattr(element, 'tag'):
+                            locator = f"元素对象（标签：{element.tag}）"
+                    except Exception as e:
+                        # 记录调试信息
+                        logger.debug("获取元素信息失败: %s", e)
+                    logger.debug("开始等待元素（%s）：%s，超时：%s秒", wait_type, locator, timeout)
 
                 # 4. 核心：用你的原生链式等待写法（和你手动写的完全一致）
                 try:
@@ -136,16 +139,15 @@ def element_wait_decorator(
                         # 对于 exists 类型，等待元素显示
                         element.wait.displayed(timeout=timeout)
                 except Exception as wait_error:
-                    logger.error(f"元素等待异常: {wait_error}")
+                    logger.error("元素等待异常: %s", wait_error)
                     return None
 
                 # 5. 等待成功，返回元素对象
-                logger.debug(f"元素等待成功：{locator}")
+                logger.debug("元素等待成功：%s", locator)
                 return element
 
             except Exception as e:
-                err_msg = f"元素等待失败：{str(e)}"
-                logger.error(err_msg)
+                logger.error("元素等待失败：%s", e)
                 if raise_err:
                     raise  # 要求报错时抛出异常
                 return None
@@ -0,0 +1,210 @@
+"""
+页面快照采集 - 用已有的浏览器实例在多个标签页中并行打开主要页面，序列化 DOM（附带可见性和位置信息），
+压缩写入 html_files/ 并记录内容哈希，供离线定位器校验和定位器优化脚本使用
+"""
+import gzip
+import json
+import os
+import time
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import config.locators as locators_module
+from config.settings import SNAPSHOT_CAPTURE_CONFIG
+from utils.logger_utils import LoggerUtils
+from utils.locator_compiler import compile_locator
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 快照清单文件名
+MANIFEST_FILENAME = 'snapshots_manifest.json'
+
+# 采集时附加到元素上的属性前缀（离线工具生成定位器时需忽略）
+SNAPSHOT_ATTR_PREFIX = 'data-snap-'
+
+# 在克隆的文档上标注每个元素的可见性和位置，不修改页面本身的 DOM
+SERIALIZE_JS = """
+const live = document.querySelectorAll('*');
+const clone = document.documentElement.cloneNode(true);
+const copies = clone.querySelectorAll('*');
+const offset = live.length - copies.length;
+for (let i = 0; i < copies.length; i++) {
+    const el = live[i + offset];
+    const rect = el.getBoundingClientRect();
+    const style = getComputedStyle(el);
+    const visible = rect.width > 0 && rect.height > 0
+        && style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity) > 0;
+    copies[i].setAttribute('data-snap-visible', visible ? '1' : '0');
+    copies[i].setAttribute('data-snap-rect',
+        [rect.x, rect.y, rect.width, rect.height].map(v => Math.round(v)).join(','));
+}
+return {html: '<!DOCTYPE html>' + clone.outerHTML, elements: copies.length, url: location.href};
+"""
+
+
+def resolve_snapshot_path(snapshot_dir, filename):
+    """
+    解析快照文件路径，同名的压缩快照（.gz）优先
+    :param snapshot_dir: 快照目录
+    :param filename: 快照文件名，如 home.html
+    :return: 文件路径，都不存在时返回 None
+    """
+    snapshot_dir = Path(snapshot_dir)
+    for candidate in (snapshot_dir / f"{filename}.gz", snapshot_dir / filename):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def read_snapshot_text(path):
+    """
+    读取快照内容，支持 .gz 压缩快照
+    :param path: 快照文件路径
+    :return: HTML 文本
+    """
+    path = Path(path)
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    return path.read_text(encoding='utf-8')
+
+
+class SnapshotCapturer:
+    """页面快照采集器"""
+
+    def __init__(self, browser, output_dir=None, pages=None):
+        """
+        初始化快照采集器
+        :param browser: ChromiumPage 对象（使用其浏览器打开新标签页）
+        :param output_dir: 输出目录（可选），默认取 SNAPSHOT_CAPTURE_CONFIG['output_dir']
+        :param pages: 页面名 -> {url, click, wait}（可选），默认取 SNAPSHOT_CAPTURE_CONFIG['pages']
+        """
+        self.browser = browser
+        self.output_dir = Path(output_dir or PROJECT_ROOT / SNAPSHOT_CAPTURE_CONFIG.get('output_dir', 'html_files'))
+        self.pages = pages or SNAPSHOT_CAPTURE_CONFIG.get('pages', {})
+        self.max_tabs = SNAPSHOT_CAPTURE_CONFIG.get('max_tabs', 4)
+        self.wait_seconds = SNAPSHOT_CAPTURE_CONFIG.get('wait_seconds', 3)
+
+    @staticmethod
+    def _resolve_locator(key):
+        """
+        把 "表名.键" 解析为 DrissionPage 定位字符串
+        :param key: 定位器键，如 "DRAMA_HOME_PAGE.watch_button"
+        :return: 定位字符串，找不到时返回 None
+        """
+        table_name, _, name = key.partition('.')
+        table = getattr(locators_module, table_name, None)
+        locator = table.get(name) if isinstance(table, dict) else None
+        return compile_locator(locator, 'css').drission if locator else None
+
+    def _capture_page(self, name, spec):
+        """
+        在新标签页中打开页面并序列化 DOM
+        :param name: 页面名
+        :param spec: 页面配置 {url, click, wait}
+        :return: 采集结果字典，失败时返回 None
+        """
+        tab = None
+        try:
+            tab = self.browser.new_tab()
+            tab.get(spec['url'])
+            tab.wait(spec.get('wait', self.wait_seconds))
+
+            click_key = spec.get('click')
+            if click_key:
+                locator = self._resolve_locator(click_key)
+                element = tab.ele(locator, timeout=10) if locator else None
+                if not element:
+                    logger.error("采集 %s 时未找到需要点击的元素: %s", name, click_key)
+                    return None
+                element.click()
+                tab.wait(spec.get('wait', self.wait_seconds))
+
+            data = tab.run_js(SERIALIZE_JS)
+            return {'name': name, **data}
+        except Exception as e:
+            logger.error("采集页面快照 %s 失败: %s", name, e)
+            return None
+        finally:
+            if tab is not None:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+
+    def _load_manifest(self):
+        """
+        读取快照清单
+        :return: 页面名 -> 快照信息
+        """
+        try:
+            with open(self.output_dir / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_snapshot(self, result, manifest):
+        """
+        压缩写入快照并更新清单，内容哈希未变化时不重写文件
+        :param result: 采集结果
+        :param manifest: 快照清单
+        :return: 快照是否有变化
+        """
+        html = result['html'].encode('utf-8')
+        digest = hashlib.sha256(html).hexdigest()
+        filename = f"{result['name']}.html.gz"
+        entry = manifest.get(result['name'], {})
+        if entry.get('sha256') == digest and (self.output_dir / filename).exists():
+            return False
+
+        path = self.output_dir / filename
+        tmp_path = path.with_name(f"{filename}.{os.getpid()}.tmp")
+        # mtime=0 使相同内容的压缩文件字节一致
+        with open(tmp_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
+        manifest[result['name']] = {
+            'file': filename,
+            'url': result.get('url'),
+            'sha256': digest,
+            'elements': result.get('elements'),
+            'bytes': len(html),
+            'captured_at': datetime.now().isoformat(timespec='seconds')
+        }
+        return True
+
+    def capture(self, names=None):
+        """
+        并行采集页面快照
+        :param names: 需要采集的页面名列表（可选），默认采集全部配置的页面
+        :return: 页面名 -> 'changed' / 'unchanged' / 'failed'
+        """
+        specs = {name: spec for name, spec in self.pages.items() if names is None or name in names}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+
+        start_time = time.time()
+        status = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_tabs, len(specs)))) as executor:
+            futures = {name: executor.submit(self._capture_page, name, spec) for name, spec in specs.items()}
+            for name, future in futures.items():
+                result = future.result()
+                if result is None:
+                    status[name] = 'failed'
+                    continue
+                status[name] = 'changed' if self._write_snapshot(result, manifest) else 'unchanged'
+                logger.info("页面快照 %s: %s（%s 个元素）", name, status[name], result.get('elements'))
+
+        tmp_manifest = self.output_dir / f"{MANIFEST_FILENAME}.tmp"
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_manifest, self.output_dir / MANIFEST_FILENAME)
+
+        logger.info("页面快照采集完成，耗时 %.2f秒: %s", time.time() - start_time, status)
+        return status
@@ -0,0 +1,241 @@
+"""
+HTTP 响应缓存 - 所有 worker 的浏览器共享的磁盘缓存，通过 CDP Fetch 拦截在请求阶段直接应答已缓存的资源
+缓存键为 方法 + URL，并校验响应 Vary 头指定的请求头；超过容量上限时按最近访问时间（LRU）淘汰
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from config.settings import HTTP_CACHE_CONFIG
+from utils.cdp_fetch import FetchHandler
+from utils.logger_utils import LoggerUtils
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 不写入缓存元数据的响应头（响应体已解码，长度由浏览器重新计算）
+_DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+def _header(headers, name):
+    """
+    按名称（不区分大小写）获取请求头或响应头
+    :param headers: 字典或 [{name, value}] 列表
+    :param name: 头名称
+    :return: 头的值，不存在时返回空字符串
+    """
+    name = name.lower()
+    items = headers.items() if isinstance(headers, dict) else ((h.get('name', ''), h.get('value', '')) for h in headers)
+    return next((value for key, value in items if key.lower() == name), '')
+
+
+class HttpDiskCache:
+    """磁盘缓存，多个进程可以同时读写（写入使用原子替换）"""
+
+    def __init__(self, cache_dir=None, max_bytes=None, max_age_seconds=None):
+        """
+        初始化磁盘缓存
+        :param cache_dir: 缓存目录（可选），默认取 HTTP_CACHE_CONFIG['cache_dir']
+        :param max_bytes: 容量上限（可选），默认取 HTTP_CACHE_CONFIG['max_bytes']
+        :param max_age_seconds: 缓存有效期（可选），默认取 HTTP_CACHE_CONFIG['max_age_seconds']
+        """
+        self.cache_dir = Path(cache_dir or PROJECT_ROOT / HTTP_CACHE_CONFIG.get('cache_dir', '.cache/http'))
+        self.max_bytes = max_bytes or HTTP_CACHE_CONFIG.get('max_bytes', 500 * 1024 * 1024)
+        self.max_age_seconds = max_age_seconds or HTTP_CACHE_CONFIG.get('max_age_seconds', 86400)
+        self._lock = threading.Lock()
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    @staticmethod
+    def _key(method, url):
+        return hashlib.sha256(f"{method} {url}".encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        """
+        获取缓存条目的元数据和响应体路径
+        :param key: 缓存键
+        :return: (元数据路径, 响应体路径)
+        """
+        base = self.cache_dir / key[:2] / key
+        return base.with_suffix('.json'), base.with_suffix('.body')
+
+    def get(self, method, url, request_headers):
+        """
+        查找缓存的响应，命中时刷新访问时间
+        :param method: 请求方法
+        :param url: 请求 URL
+        :param request_headers: 请求头字典
+        :return: 响应字典 {status, headers, body}，未命中时返回 None
+        """
+        meta_path, body_path = self._paths(self._key(method, url))
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if time.time() - meta['stored_at'] > self.max_age_seconds:
+                raise LookupError('expired')
+            # Vary 头指定的请求头必须与缓存时一致
+            for name, value in meta.get('vary', {}).items():
+                if _header(request_headers, name) != value:
+                    raise LookupError('vary mismatch')
+            body = body_path.read_bytes()
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError, LookupError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_served += len(body)
+        return {'status': meta['status'], 'headers': meta['headers'], 'body': body}
+
+    def put(self, method, url, request_headers, status, headers, body):
+        """
+        写入缓存，超过容量上限时淘汰最久未访问的条目
+        :param method: 请求方法
+        :param url: 请求 URL
+        :param request_headers: 请求头字典
+        :param status: 状态码
+        :param headers: 响应头列表 [{name, value}]
+        :param body: 响应体（bytes）
+        """
+        vary_names = [name.strip() for name in _header(headers, 'vary').split(',') if name.strip()]
+        if '*' in vary_names:
+            return
+        meta = {
+            'url': url,
+            'status': status,
+            'headers': [h for h in headers if h.get('name', '').lower() not in _DROP_HEADERS],
+            'vary': {name: _header(request_headers, name) for name in vary_names},
+            'size': len(body),
+            'stored_at': time.time()
+        }
+
+        meta_path, body_path = self._paths(self._key(method, url))
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写响应体再写元数据，读到元数据时响应体一定完整
+            tmp_body = body_path.with_name(body_path.name + suffix)
+            tmp_body.write_bytes(body)
+            os.replace(tmp_body, body_path)
+            tmp_meta = meta_path.with_name(meta_path.name + suffix)
+            with open(tmp_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_meta, meta_path)
+        except OSError as e:
+            logger.debug("写入 HTTP 缓存失败 %s: %s", url, e)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            self._size += len(body)
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _scan_size(self):
+        """
+        统计缓存目录中响应体的总大小
+        :return: 字节数
+        """
+        return sum(path.stat().st_size for path in self.cache_dir.glob('*/*.body') if path.exists())
+
+    def evict(self):
+        """按元数据的访问时间淘汰最久未使用的条目，直到总大小降到上限的 90%"""
+        entries = []
+        for meta_path in self.cache_dir.glob('*/*.json'):
+            body_path = meta_path.with_suffix('.body')
+            try:
+                entries.append((meta_path.stat().st_mtime, meta_path, body_path, body_path.stat().st_size))
+            except OSError:
+                continue
+
+        total = sum(entry[3] for entry in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, meta_path, body_path, size in sorted(entries, key=lambda entry: entry[0]):
+            if total <= target:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._size = total
+        if removed:
+            logger.info("HTTP 缓存淘汰 %s 个条目，当前 %.1f MB", removed, total / 1024 / 1024)
+
+    def stats(self):
+        """
+        获取本进程的缓存命中统计
+        :return: 统计字典
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'bytes_served': self.bytes_served}
+
+
+class HttpCacheHandler(FetchHandler):
+    """缓存处理器：请求阶段应答已缓存的资源，响应阶段写入可缓存的响应"""
+
+    needs_response = True
+
+    def __init__(self, cache=None):
+        """
+        初始化缓存处理器
+        :param cache: HttpDiskCache 实例（可选），默认使用全局缓存
+        """
+        self.cache = cache or get_http_cache()
+        self.resource_types = set(HTTP_CACHE_CONFIG.get('resource_types', []))
+        # 响应阶段只暂停可缓存的资源类型，视频分片、文档和接口响应不经过 CDP 读取响应体
+        self.response_resource_types = self.resource_types
+        self.max_body_bytes = HTTP_CACHE_CONFIG.get('max_body_bytes', 10 * 1024 * 1024)
+
+    def _cacheable_request(self, request, resource_type):
+        return (request.get('method', 'GET') == 'GET' and resource_type in self.resource_types
+                and request.get('url', '').startswith('http'))
+
+    def wants_response(self, request, resource_type):
+        return self._cacheable_request(request, resource_type)
+
+    def on_request(self, request, resource_type):
+        if not self._cacheable_request(request, resource_type):
+            return None
+        return self.cache.get('GET', request['url'], request.get('headers', {}))
+
+    def on_response(self, request, resource_type, status, headers, body):
+        if status != 200 or body is None or len(body) > self.max_body_bytes:
+            return
+        if not self._cacheable_request(request, resource_type):
+            return
+        cache_control = _header(headers, 'cache-control').lower()
+        if 'no-store' in cache_control or 'private' in cache_control:
+            return
+        self.cache.put('GET', request['url'], request.get('headers', {}), status, headers, body)
+
+
+# 全局缓存实例
+_http_cache = None
+
+
+def get_http_cache():
+    """
+    获取 HTTP 缓存实例
+    :return: HttpDiskCache 实例
+    """
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HttpDiskCache()
+    return _http_cache
@@ -0,0 +1,253 @@
+"""
+HTTP 录制与回放 - record 模式把每个页面流程（测试类）的响应录制为 HAR 格式的归档，
+replay 模式通过 CDP Fetch 拦截直接用归档中的响应应答，不访问远程站点
+"""
+import os
+import json
+import base64
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
+from config.settings import HTTP_REPLAY_CONFIG
+from utils.cdp_fetch import FetchHandler, FAIL_REQUEST, get_fetch_interceptor
+from utils.logger_utils import LoggerUtils
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 回放时不再适用的响应头（响应体已解码、长度由浏览器重新计算）
+_DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+def normalize_url(url):
+    """
+    规范化请求 URL 作为匹配键：去掉 fragment 和配置中忽略的查询参数（时间戳、随机数等），其余参数排序
+    :param url: 请求 URL
+    :return: 规范化后的 URL
+    """
+    ignore = set(HTTP_REPLAY_CONFIG.get('ignore_params', []))
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in ignore)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+class HttpArchive:
+    """单个页面流程的 HAR 归档"""
+
+    def __init__(self, path):
+        """
+        初始化归档
+        :param path: 归档文件路径
+        """
+        self.path = Path(path)
+        self.entries = []
+        self._index = {}
+        self._served = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        读取归档文件
+        :return: 是否读取成功
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("读取 HTTP 归档失败 %s: %s", self.path, e)
+            return False
+        for entry in data.get('log', {}).get('entries', []):
+            self._add(entry)
+        return True
+
+    def _add(self, entry):
+        key = (entry['request']['method'], normalize_url(entry['request']['url']))
+        self.entries.append(entry)
+        self._index.setdefault(key, []).append(entry)
+
+    def add(self, method, url, status, headers, mime_type, body):
+        """
+        录制一个响应
+        :param method: 请求方法
+        :param url: 请求 URL
+        :param status: 状态码
+        :param headers: 响应头列表 [{name, value}]
+        :param mime_type: MIME 类型
+        :param body: 响应体（bytes）
+        """
+        entry = {
+            'startedDateTime': datetime.now().isoformat(timespec='milliseconds'),
+            'request': {'method': method, 'url': url},
+            'response': {
+                'status': status,
+                'headers': [h for h in headers if h.get('name', '').lower() not in _DROP_HEADERS],
+                'content': {
+                    'size': len(body),
+                    'mimeType': mime_type,
+                    'text': base64.b64encode(body).decode('ascii'),
+                    'encoding': 'base64'
+                }
+            }
+        }
+        with self._lock:
+            self._add(entry)
+
+    def match(self, method, url):
+        """
+        查找录制的响应；同一请求录制了多次时按录制顺序依次返回，用完后重复最后一个
+        :param method: 请求方法
+        :param url: 请求 URL
+        :return: 响应字典 {status, headers, body}，未录制时返回 None
+        """
+        key = (method, normalize_url(url))
+        with self._lock:
+            candidates = self._index.get(key)
+            if not candidates:
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            entry = candidates[min(served, len(candidates) - 1)]
+
+        response = entry['response']
+        content = response.get('content', {})
+        text = content.get('text', '')
+        body = base64.b64decode(text) if content.get('encoding') == 'base64' else text.encode('utf-8')
+        return {'status': response['status'], 'headers': response.get('headers', []), 'body': body}
+
+    def save(self):
+        """原子写入归档文件"""
+        data = {
+            'log': {
+                'version': '1.2',
+                'creator': {'name': 'reelswave_ui_test', 'version': '1.0'},
+                'entries': self.entries
+            }
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error("保存 HTTP 归档失败 %s: %s", self.path, e)
+
+
+class RecordHandler(FetchHandler):
+    """录制处理器：在响应阶段把响应写入归档"""
+
+    needs_response = True
+
+    def __init__(self, archive):
+        """
+        初始化录制处理器
+        :param archive: HttpArchive 实例
+        """
+        self.archive = archive
+        self.max_body_bytes = HTTP_REPLAY_CONFIG.get('max_body_bytes', 5 * 1024 * 1024)
+        self.recorded = 0
+
+    def on_response(self, request, resource_type, status, headers, body):
+        if body is None or len(body) > self.max_body_bytes:
+            return
+        mime_type = next((h.get('value', '') for h in headers if h.get('name', '').lower() == 'content-type'), '')
+        self.archive.add(request.get('method', 'GET'), request.get('url', ''), status, headers, mime_type, body)
+        self.recorded += 1
+
+
+class ReplayHandler(FetchHandler):
+    """回放处理器：在请求阶段用归档中的响应应答"""
+
+    def __init__(self, archive, passthrough=None):
+        """
+        初始化回放处理器
+        :param archive: HttpArchive 实例
+        :param passthrough: 未录制的请求是否访问网络（可选），默认取 HTTP_REPLAY_CONFIG['passthrough']
+        """
+        self.archive = archive
+        self.passthrough = HTTP_REPLAY_CONFIG.get('passthrough', False) if passthrough is None else passthrough
+        self.hits = 0
+        self.misses = 0
+
+    def on_request(self, request, resource_type):
+        url = request.get('url', '')
+        if url.startswith('data:'):
+            return None
+        response = self.archive.match(request.get('method', 'GET'), url)
+        if response is not None:
+            self.hits += 1
+            return response
+        self.misses += 1
+        logger.debug("回放未命中: %s %s", request.get('method'), url)
+        return None if self.passthrough else FAIL_REQUEST
+
+
+# 进程内的归档 (mode, flow) -> HttpArchive，同一流程的多个用例共享
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def archive_path(flow):
+    """
+    获取页面流程的归档文件路径
+    :param flow: 流程名，如 profile_test.TestProfile
+    :return: 归档文件路径
+    """
+    return PROJECT_ROOT / HTTP_REPLAY_CONFIG.get('archive_dir', 'http_archives') / f"{flow}.har.json"
+
+
+class HttpReplaySession:
+    """单个用例的录制/回放会话"""
+
+    def __init__(self, page, flow, mode):
+        """
+        初始化会话
+        :param page: ChromiumPage / ChromiumTab 对象
+        :param flow: 流程名，归档按流程保存
+        :param mode: record / replay
+        """
+        self.page = page
+        self.flow = flow
+        self.mode = mode
+        self.handler = None
+        self.archive = None
+
+    def start(self):
+        """
+        注册录制或回放处理器
+        :return: 是否启动成功（回放时归档不存在返回 False）
+        """
+        if self.mode not in ('record', 'replay'):
+            return False
+
+        path = archive_path(self.flow)
+        with _archives_lock:
+            self.archive = _archives.get((self.mode, self.flow))
+            if self.archive is None:
+                # 录制时每次运行重新生成归档，同一流程的后续用例追加到同一个归档
+                self.archive = HttpArchive(path)
+                if self.mode == 'replay' and (not path.exists() or not self.archive.load()):
+                    logger.error("回放归档不存在: %s，请先使用 --http-mode=record 录制", path)
+                    return False
+                _archives[(self.mode, self.flow)] = self.archive
+
+        self.handler = RecordHandler(self.archive) if self.mode == 'record' else ReplayHandler(self.archive)
+
+        get_fetch_interceptor(self.page).add_handler(self.handler)
+        return True
+
+    def stop(self):
+        """移除处理器；录制模式下保存归档"""
+        if self.handler is None:
+            return
+        get_fetch_interceptor(self.page).remove_handler(self.handler)
+        if self.mode == 'record':
+            self.archive.save()
+            logger.info("HTTP 录制 %s: 新增 %s 个响应，共 %s 个", self.flow, self.handler.recorded, len(self.archive.entries))
+        else:
+            logger.info("HTTP 回放 %s: 命中 %s，未命中 %s", self.flow, self.handler.hits, self.handler.misses)
+        self.handler = None
@@ -0,0 +1,158 @@
+"""
+定位器编译器 - 把 config/locators.py 中的字符串定位器编译为带类型的定位器对象并缓存
+编译结果包含定位类型、选择器、DrissionPage 定位字符串和等价的 JS 查询表达式，CSS 语法在编译时校验
+"""
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+import config.locators as locators_module
+
+try:
+    import soupsieve
+except ImportError:  # soupsieve 随 beautifulsoup4 安装，缺失时跳过 CSS 语法校验
+    soupsieve = None
+
+
+# 定位字符串前缀 -> 定位类型（与 DrissionPage 的前缀写法一致）
+_PREFIXES = (
+    ('css:', 'css'), ('css=', 'css'), ('c:', 'css'), ('c=', 'css'),
+    ('xpath:', 'xpath'), ('xpath=', 'xpath'), ('x:', 'xpath'), ('x=', 'xpath'),
+    ('tag:', 'tag'), ('tag=', 'tag'),
+    ('text=', 'text_exact'), ('text:', 'text'),
+)
+
+# selector_type 参数 -> 定位类型
+_SELECTOR_TYPES = {'css': 'css', 'xpath': 'xpath', 'tag': 'tag'}
+
+
+class LocatorError(ValueError):
+    """定位器语法错误"""
+
+
+@dataclass(frozen=True)
+class CompiledLocator:
+    """编译后的定位器"""
+
+    kind: str          # 定位类型：css / xpath / tag / text / text_exact / raw
+    selector: str      # 去掉前缀后的选择器
+    raw: str           # 原始定位字符串
+    drission: str      # 传给 DrissionPage 的定位字符串
+    js_query: str      # 返回第一个匹配元素的 JS 表达式，raw 类型为 None
+
+    def __str__(self):
+        return self.drission
+
+
+def _xpath_literal(text):
+    """
+    把文本转换为 XPath 字符串字面量
+    :param text: 文本
+    :return: XPath 字面量
+    """
+    if '"' not in text:
+        return f'"{text}"'
+    if "'" not in text:
+        return f"'{text}'"
+    parts = text.split('"')
+    return 'concat(' + ', \'"\', '.join(f'"{part}"' for part in parts) + ')'
+
+
+def _xpath_js(xpath):
+    """构建按 XPath 查询第一个元素的 JS 表达式"""
+    return f"document.evaluate({json.dumps(xpath)}, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue"
+
+
+def _split_prefix(locator):
+    """
+    拆分定位字符串的前缀
+    :param locator: 定位字符串
+    :return: (定位类型, 选择器)，没有已知前缀时返回 (None, 原字符串)
+    """
+    for prefix, kind in _PREFIXES:
+        if locator.startswith(prefix):
+            return kind, locator[len(prefix):]
+    return None, locator
+
+
+def validate_css(selector):
+    """
+    校验 CSS 选择器语法
+    :param selector: CSS 选择器
+    :raises LocatorError: 语法错误时抛出
+    """
+    if soupsieve is None:
+        return
+    try:
+        soupsieve.compile(selector)
+    except Exception as e:
+        raise LocatorError(f"CSS 选择器语法错误: {selector!r}: {e}") from e
+
+
+@lru_cache(maxsize=2048)
+def compile_locator(locator, selector_type=None):
+    """
+    编译定位器（结果缓存，所有组件共享）
+    显式前缀优先；没有前缀时按 selector_type 处理；两者都没有时原样交给 DrissionPage
+    :param locator: 定位字符串
+    :param selector_type: 选择器类型，如 "css", "xpath", "tag"
+    :return: CompiledLocator
+    :raises LocatorError: CSS 语法错误时抛出
+    """
+    kind, selector = _split_prefix(locator)
+    if kind is None and selector_type:
+        kind = _SELECTOR_TYPES.get(selector_type.lower())
+
+    if kind == 'css':
+        validate_css(selector)
+        return CompiledLocator(kind, selector, locator, f"css:{selector}",
+                               f"document.querySelector({json.dumps(selector)})")
+    if kind == 'xpath':
+        return CompiledLocator(kind, selector, locator, f"xpath:{selector}", _xpath_js(selector))
+    if kind == 'tag':
+        return CompiledLocator(kind, selector, locator, f"tag:{selector}",
+                               f"document.querySelector({json.dumps(selector)})")
+    if kind == 'text_exact':
+        return CompiledLocator(kind, selector, locator, f"text={selector}",
+                               _xpath_js(f"//*[text()={_xpath_literal(selector)}]"))
+    if kind == 'text':
+        return CompiledLocator(kind, selector, locator, f"text:{selector}",
+                               _xpath_js(f"//*[contains(text(), {_xpath_literal(selector)})]"))
+    return CompiledLocator('raw', locator, locator, locator, None)
+
+
+def iter_locator_tables():
+    """
+    遍历 config/locators.py 中的所有定位器表（大写命名的字典）
+    :return: (表名, 定位器字典) 生成器
+    """
+    for name, value in vars(locators_module).items():
+        if name.isupper() and isinstance(value, dict):
+            yield name, value
+
+
+def compile_locator_tables():
+    """
+    编译所有定位器表，组件使用的定位器默认按 CSS 处理（带 text=/tag: 等前缀的除外）
+    :return: (编译结果字典 "表名.键" -> CompiledLocator, 错误列表)
+    """
+    compiled = {}
+    errors = []
+    for table_name, table in iter_locator_tables():
+        for key, value in table.items():
+            # 候选策略表（LOCATOR_FALLBACKS）的值是定位器列表
+            if isinstance(value, str):
+                entries = [(f"{table_name}.{key}", value)]
+            elif isinstance(value, (list, tuple)):
+                entries = [(f"{table_name}.{key}[{idx}]", locator) for idx, locator in enumerate(value)]
+            else:
+                continue
+            for name, locator in entries:
+                try:
+                    compiled[name] = compile_locator(locator, 'css')
+                except LocatorError as e:
+                    errors.append(f"{name}: {e}")
+    return compiled, errors
+
+
+# 导入时预编译所有定位器表，运行期间 PageActions 直接命中缓存
+COMPILED_LOCATORS, LOCATOR_ERRORS = compile_locator_tables()
@@ -0,0 +1,200 @@
+"""
+自愈定位引擎 - 每个定位器键维护多个候选策略，一次批量 JS 探测找出命中的候选并提升排名
+排名持久化到 .cache/locator_ranking.json，下次运行优先尝试上次命中的策略
+"""
+import os
+import json
+import time
+import threading
+from pathlib import Path
+import config.locators as locators_module
+from config.locators import LOCATOR_FALLBACKS
+from utils.logger_utils import LoggerUtils
+from utils.locator_compiler import compile_locator, LocatorError
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 排名缓存文件
+RANKING_CACHE_PATH = Path(__file__).parent.parent / '.cache' / 'locator_ranking.json'
+
+
+class LocatorRanking:
+    """候选策略排名，进程内共享并持久化到缓存文件"""
+
+    def __init__(self, cache_path=RANKING_CACHE_PATH):
+        """
+        初始化排名
+        :param cache_path: 缓存文件路径
+        """
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self._ranking = self._load()
+
+    def _load(self):
+        """
+        读取缓存文件
+        :return: 定位器键 -> 排好序的候选列表
+        """
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """原子写入缓存文件"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._ranking, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("保存定位器排名失败: %s", e)
+
+    def order(self, key, candidates):
+        """
+        按历史排名排序候选，已不在配置中的候选被忽略，新候选保持配置顺序排在后面
+        :param key: 定位器键
+        :param candidates: 配置中的候选列表
+        :return: 排序后的候选列表
+        """
+        ranked = [candidate for candidate in self._ranking.get(key, []) if candidate in candidates]
+        return ranked + [candidate for candidate in candidates if candidate not in ranked]
+
+    def promote(self, key, winner, candidates):
+        """
+        把命中的候选提升到第一位并持久化
+        :param key: 定位器键
+        :param winner: 命中的候选
+        :param candidates: 当前排序后的候选列表
+        """
+        with self._lock:
+            if candidates and candidates[0] == winner:
+                return
+            self._ranking[key] = [winner] + [candidate for candidate in candidates if candidate != winner]
+            self._save()
+
+
+class LocatorHealer:
+    """自愈定位引擎"""
+
+    def __init__(self, page, ranking=None):
+        """
+        初始化自愈定位引擎
+        :param page: ChromiumPage 对象
+        :param ranking: LocatorRanking 实例（可选），默认使用全局排名
+        """
+        self.page = page
+        self.ranking = ranking or get_locator_ranking()
+
+    @staticmethod
+    def split_candidates(key):
+        """
+        获取定位器键的候选，分为语义候选和位置候选
+        站点调整栏目顺序后，位置定位器（如 div:nth-of-type(9) span）仍能命中其他栏目的元素，
+        因此按文本、埋点属性定位的 LOCATOR_FALLBACKS 候选优先，配置表中的原始定位器只作为兜底
+        :param key: 定位器键，如 "HOME_PAGE.best_first_drama"
+        :return: (语义候选列表, 位置候选列表)
+        """
+        table_name, _, name = key.partition('.')
+        table = getattr(locators_module, table_name, None)
+        primary = table.get(name) if isinstance(table, dict) else None
+
+        semantic = [candidate for candidate in LOCATOR_FALLBACKS.get(key, []) if candidate != primary]
+        structural = [primary] if primary else []
+        return semantic, structural
+
+    @classmethod
+    def candidates(cls, key):
+        """
+        获取定位器键的候选列表：LOCATOR_FALLBACKS 中的语义候选在前，配置表中的原始定位器在后
+        :param key: 定位器键
+        :return: 候选定位字符串列表
+        """
+        semantic, structural = cls.split_candidates(key)
+        return semantic + structural
+
+    @staticmethod
+    def _build_probe(compiled_candidates):
+        """
+        构建批量探测脚本，一次调用返回每个候选是否命中
+        :param compiled_candidates: CompiledLocator 列表
+        :return: JS 脚本
+        """
+        checks = []
+        for compiled in compiled_candidates:
+            if compiled.js_query is None:
+                checks.append('false')
+            else:
+                checks.append(f"(() => {{ try {{ return !!({compiled.js_query}); }} catch (e) {{ return false; }} }})()")
+        return f"return [{', '.join(checks)}];"
+
+    def resolve(self, key, timeout=5, interval=0.3):
+        """
+        定位元素：批量探测所有候选，优先使用语义候选；有语义候选时，
+        位置候选只在超时前最后一次探测仍没有语义候选命中时才使用
+        :param key: 定位器键
+        :param timeout: 超时时间（秒），所有候选共享，不再按候选逐个等待
+        :param interval: 探测间隔（秒）
+        :return: (元素对象, 命中的候选)，未命中时返回 (None, None)
+        """
+        semantic, structural = self.split_candidates(key)
+        # 排名只在语义候选之间调整，位置候选始终排在最后
+        semantic = self.ranking.order(key, semantic)
+        candidates = semantic + structural
+        if not candidates:
+            logger.error("定位器键没有可用的候选: %s", key)
+            return None, None
+
+        compiled_candidates = []
+        for candidate in candidates:
+            try:
+                compiled_candidates.append(compile_locator(candidate, 'css'))
+            except LocatorError as e:
+                logger.error("跳过无效的候选 %s: %s", candidate, e)
+        probe = self._build_probe(compiled_candidates)
+
+        deadline = time.time() + timeout
+        while True:
+            try:
+                hits = self.page.run_js(probe) or []
+            except Exception as e:
+                logger.debug("候选探测失败: %s", e)
+                hits = []
+
+            last_probe = time.time() >= deadline
+            for compiled, hit in zip(compiled_candidates, hits):
+                if not hit:
+                    continue
+                is_semantic = compiled.raw in semantic
+                if not is_semantic and semantic and not last_probe:
+                    continue
+                element = self.page.ele(compiled.drission, timeout=1)
+                if element:
+                    if is_semantic:
+                        self.ranking.promote(key, compiled.raw, semantic)
+                    elif semantic:
+                        logger.warning("定位器 %s 的语义候选均未命中，回退到位置定位器 %s", key, compiled.raw)
+                    return element, compiled.raw
+
+            if last_probe:
+                logger.error("定位器 %s 的 %s 个候选均未命中（%s秒）", key, len(compiled_candidates), timeout)
+                return None, None
+            time.sleep(interval)
+
+
+# 全局排名实例
+_locator_ranking = None
+
+
+def get_locator_ranking():
+    """
+    获取定位器排名实例
+    :return: LocatorRanking 实例
+    """
+    global _locator_ranking
+    if _locator_ranking is None:
+        _locator_ranking = LocatorRanking()
+    return _locator_ranking
@@ -1,12 +1,250 @@
+import atexit
+import copy
 import logging
 import os
+import queue
+import sys
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from config.settings import LOG_CONFIG
+
+
+# 默认日志文件标记，由写线程按记录日期解析为 logs/application_<date>.log
+DEFAULT_LOG_FILE = object()
+
+
+class DailyFileHandler(logging.Handler):
+    """按日期切换文件的日志处理器，每天写入一个日志文件"""
+
+    def __init__(self, log_dir, filename_pattern):
+        """
+        初始化按日期切换的文件处理器
+        :param log_dir: 日志目录
+        :param filename_pattern: 文件名模板，{date} 替换为日期
+        """
+        super().__init__()
+        self.log_dir = log_dir
+        self.filename_pattern = filename_pattern
+        self._date = None
+        self._stream = None
+
+    def _switch(self, date):
+        """
+        切换到指定日期的日志文件
+        :param date: 日期字符串
+        """
+        if self._stream:
+            self._stream.close()
+        os.makedirs(self.log_dir, exist_ok=True)
+        path = os.path.join(self.log_dir, self.filename_pattern.format(date=date))
+        self._stream = open(path, 'a', encoding='utf-8')
+        self._date = date
+
+    def emit(self, record):
+        try:
+            date = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d')
+            if date != self._date:
+                self._switch(date)
+            self._stream.write(self.format(record) + '\n')
+            self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        super().close()
+
+
+class _RoutingHandler(logging.Handler):
+    """写线程中的路由处理器，把记录分发到控制台和对应的日志文件"""
+
+    def __init__(self, formatter):
+        """
+        初始化路由处理器
+        :param formatter: 日志格式化器
+        """
+        super().__init__()
+        self.setFormatter(formatter)
+        self.console_handler = logging.StreamHandler() if LOG_CONFIG.get('console', True) else None
+        self.daily_handler = DailyFileHandler(_default_log_dir(), LOG_CONFIG.get('filename', 'application_{date}.log'))
+        self.file_handlers = {}
+        for handler in filter(None, (self.console_handler, self.daily_handler)):
+            handler.setFormatter(formatter)
+
+    def _file_handler(self, log_file):
+        """
+        获取日志文件对应的处理器，首次使用时创建
+        :param log_file: 日志文件路径或 DEFAULT_LOG_FILE
+        :return: 文件处理器
+        """
+        if log_file is DEFAULT_LOG_FILE:
+            return self.daily_handler
+        handler = self.file_handlers.get(log_file)
+        if handler is None:
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            handler = logging.FileHandler(log_file, encoding='utf-8')
+            handler.setFormatter(self.formatter)
+            self.file_handlers[log_file] = handler
+        return handler
+
+    def emit(self, record):
+        if self.console_handler and record.levelno >= record.handler_level:
+            self.console_handler.handle(record)
+        log_file = getattr(record, 'log_file', None)
+        if log_file is not None and record.levelno >= record.handler_level:
+            self._file_handler(log_file).handle(record)
+
+    def close(self):
+        for handler in (self.console_handler, self.daily_handler, *self.file_handlers.values()):
+            if handler:
+                handler.close()
+        super().close()
+
+
+class _TargetFilter(logging.Filter):
+    """在调用线程中给记录附加目标文件和处理器级别，供写线程路由"""
+
+    def __init__(self, log_file, level):
+        super().__init__()
+        self.log_file = log_file
+        self.level = level
+
+    def filter(self, record):
+        record.log_file = self.log_file
+        record.handler_level = self.level
+        return True
+
+
+# 可以安全地延迟到写线程格式化的参数类型（不可变，跨线程读取无副作用）
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+class StructuredMessage:
+    """结构化日志消息，事件名 + 字段，只有在记录真正输出时才拼接成文本"""
+
+    __slots__ = ('event', 'fields')
+
+    def __init__(self, event, fields):
+        """
+        初始化结构化消息
+        :param event: 事件名
+        :param fields: 字段字典
+        """
+        self.event = event
+        self.fields = fields
+
+    def is_immutable(self):
+        """
+        判断所有字段值是否为不可变类型
+        :return: 均为不可变类型返回 True
+        """
+        return all(isinstance(value, _IMMUTABLE_TYPES) for value in self.fields.values())
+
+    def __str__(self):
+        if not self.fields:
+            return str(self.event)
+        return f"{self.event} | " + ', '.join(f"{key}={value}" for key, value in self.fields.items())
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    队列处理器：消息参数均为不可变类型时不在调用线程格式化，交给写线程完成；
+    参数含可变对象或带异常信息时按标准方式在调用线程格式化，保证输出内容与调用时一致
+    """
+
+    def prepare(self, record):
+        if record.exc_info or record.stack_info:
+            return super().prepare(record)
+
+        msg = record.msg
+        if isinstance(msg, StructuredMessage):
+            deferrable = msg.is_immutable() and not record.args
+        else:
+            args = record.args or ()
+            deferrable = (isinstance(msg, str) and isinstance(args, tuple)
+                          and all(isinstance(arg, _IMMUTABLE_TYPES) for arg in args))
+
+        if not deferrable:
+            return super().prepare(record)
+        return copy.copy(record)
+
+
+def _caller_module_name():
+    """
+    获取调用 LoggerUtils 的模块名（跳过 logger_utils 自身的栈帧）
+    :return: 模块名，无法获取时返回 'default'
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module_name = frame.f_globals.get('__name__', '')
+        if module_name and module_name != __name__:
+            return module_name
+        frame = frame.f_back
+    return 'default'
+
+
+def log_event(logger, event, level=logging.INFO, **fields):
+    """
+    记录结构化日志，级别未启用时不构造消息
+    示例：log_event(logger, '查找元素', logging.DEBUG, locator=locator, elapsed_ms=12)
+    :param logger: 日志记录器
+    :param event: 事件名
+    :param level: 日志级别
+    :param fields: 事件字段
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, StructuredMessage(event, fields), stacklevel=2)
+
+
+def _default_log_dir():
+    """
+    获取默认日志目录
+    :return: 日志目录路径
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, LOG_CONFIG.get('log_dir', 'logs'))
+
 
 class LoggerUtils:
     """日志工具类，提供统一的日志记录方法"""
 
     _loggers = {}
 
+    # 异步日志管道：调用线程只把记录放入队列，由单个写线程格式化并写入控制台和文件
+    _queue = None
+    _listener = None
+    _pipeline_lock = threading.Lock()
+
+    @classmethod
+    def _ensure_pipeline(cls):
+        """启动日志写线程（只启动一次），进程退出时停止并写完队列中的记录"""
+        if cls._listener is not None:
+            return
+        with cls._pipeline_lock:
+            if cls._listener is not None:
+                return
+            formatter = logging.Formatter(LOG_CONFIG.get(
+                'format', '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+            ))
+            cls._queue = queue.SimpleQueue()
+            cls._listener = QueueListener(cls._queue, _RoutingHandler(formatter))
+            cls._listener.start()
+            atexit.register(cls.shutdown)
+
+    @classmethod
+    def shutdown(cls):
+        """停止日志写线程，写完队列中剩余的记录"""
+        with cls._pipeline_lock:
+            if cls._listener is None:
+                return
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+            cls._listener = None
+
     @classmethod
     def get_logger(cls, name=None, log_file=None, level=logging.INFO):
         """
@@ -17,25 +255,15 @@ class LoggerUtils:
         :return: 日志记录器实例
         """
         if name is None:
-            # 获取调用者的模块名
-            import inspect
-            # 遍历调用栈，找到第一个不是 logger_utils 的模块
-            frame = inspect.currentframe()
-            while frame:
-                frame = frame.f_back
-                if frame is None:
-                    break
-                module_name = frame.f_globals.get('__name__', '')
-                # 跳过 logger_utils 模块本身
-                if module_name and not module_name.startswith('utils.logger_utils'):
-                    name = module_name
-                    break
-            if name is None:
-                name = 'default'
+            # 未指定名称时按调用者模块名解析；推荐在模块级传入 __name__，只在导入时解析一次
+            name = _caller_module_name()
 
         # 如果已存在相同名称的日志记录器，直接返回
-        if name in cls._loggers:
-            return cls._loggers[name]
+        logger = cls._loggers.get(name)
+        if logger is not None:
+            return logger
+
+        cls._ensure_pipeline()
 
         # 创建新的日志记录器
         logger = logging.getLogger(name)
@@ -43,25 +271,10 @@ class LoggerUtils:
 
         # 避免重复添加处理器
         if not logger.handlers:
-            # 创建格式化器
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
-
-            # 添加控制台处理器
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(level)
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
-
-            # 如果指定了日志文件，添加文件处理器
-            if log_file:
-                # 确保日志目录存在
-                os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-                # 文件处理器，每天一个日志文件
-                file_handler = logging.FileHandler(log_file, encoding='utf-8')
-                file_handler.setLevel(level)
-                file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+            # 记录只进入队列，格式化和 I/O 都在写线程中完成
+            queue_handler = _DeferredQueueHandler(cls._queue)
+            queue_handler.addFilter(_TargetFilter(log_file, level))
+            logger.addHandler(queue_handler)
 
         # 缓存日志记录器
         cls._loggers[name] = logger
@@ -70,17 +283,9 @@ class LoggerUtils:
     @classmethod
     def get_default_logger(cls, name=None):
         """
-        获取默认日志记录器，使用默认日志文件
+        获取默认日志记录器，写入按日期切换的默认日志文件 logs/application_<date>.log
         :param name: 日志记录器名称
         :return: 日志记录器实例
         """
-        # 创建默认日志文件路径
-        log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-
-        # 使用当前日期作为日志文件名
-        today = datetime.now().strftime('%Y-%m-%d')
-        log_file = os.path.join(log_dir, f'application_{today}.log')
-
-        return cls.get_logger(name, log_file)
+        level = logging.getLevelName(LOG_CONFIG.get('level', 'INFO'))
+        return cls.get_logger(name, DEFAULT_LOG_FILE, level)
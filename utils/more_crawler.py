@@ -0,0 +1,134 @@
+"""
+首页 MORE 栏目并行巡检 - 每个栏目在同一浏览器的独立标签页中打开首页、点击 MORE 入口，
+用一次 JS 调用批量校验栏目页中的剧集条目（数量、标题、封面图是否加载失败），最后合并所有栏目的结果
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from components.HomeComponent import HomeComponent
+from config.locators import HOME_PAGE, HOME_MORE_PAGE
+from config.settings import BASE_URL, MORE_CRAWL_CONFIG
+from utils.locator_compiler import compile_locator
+from utils.logger_utils import LoggerUtils
+from utils.page_actions import PageActions
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 批量校验 MORE 页面中的剧集条目，等待封面图加载结束（成功或失败）或超时，arguments[0] 为超时毫秒
+_VALIDATE_ITEMS_JS = """
+const timeout = arguments[0];
+const items = Array.from(document.querySelectorAll(%s));
+const images = items.map(item => item.querySelector('img'));
+const settle = img => (!img || img.complete) ? Promise.resolve()
+    : new Promise(resolve => { img.addEventListener('load', resolve, {once: true});
+                              img.addEventListener('error', resolve, {once: true}); });
+return Promise.race([
+    Promise.all(images.map(settle)),
+    new Promise(resolve => setTimeout(resolve, timeout))
+]).then(() => ({
+    url: location.href,
+    items: items.map((item, i) => {
+        const img = images[i];
+        const src = img ? (img.currentSrc || img.src || img.getAttribute('data-src') || '') : '';
+        return {
+            index: i,
+            title: (item.innerText || '').trim().split('\\n')[0] || null,
+            image: src || null,
+            image_state: !img ? 'none' : !img.complete ? 'pending' : img.naturalWidth > 0 ? 'loaded' : 'broken'
+        };
+    })
+}));
+""" % json.dumps(compile_locator(HOME_MORE_PAGE['drama_item'], 'css').selector)
+
+
+def more_sections():
+    """
+    获取首页配置的所有 MORE 栏目
+    :return: 栏目名 -> 定位器键，如 {'eastern_legends': 'HOME_PAGE.eastern_legends_more'}
+    """
+    return {name[:-len('_more')]: f"HOME_PAGE.{name}" for name in HOME_PAGE if name.endswith('_more')}
+
+
+class MoreSectionCrawler:
+    """MORE 栏目并行巡检"""
+
+    def __init__(self, browser, sections=None):
+        """
+        初始化巡检器
+        :param browser: ChromiumPage 对象（使用其浏览器打开新标签页）
+        :param sections: 栏目名 -> 定位器键（可选），默认取 HOME_PAGE 中所有以 _more 结尾的入口
+        """
+        self.browser = browser
+        self.sections = sections or more_sections()
+        self.max_tabs = MORE_CRAWL_CONFIG.get('max_tabs', 4)
+        self.item_timeout = MORE_CRAWL_CONFIG.get('item_timeout', 15)
+        self.image_timeout = MORE_CRAWL_CONFIG.get('image_timeout', 10)
+
+    def _crawl_section(self, section, key):
+        """
+        在新标签页中打开一个栏目并校验剧集条目
+        :param section: 栏目名
+        :param key: MORE 入口的定位器键
+        :return: 栏目结果字典 {section, ok, url, items, broken_images, error, duration}
+        """
+        start_time = time.time()
+        result = {'section': section, 'ok': False, 'url': None, 'items': [], 'broken_images': [], 'error': None}
+        tab = None
+        try:
+            tab = self.browser.new_tab()
+            tab.get(BASE_URL)
+            HomeComponent(tab).wait_for_slide_to_load()
+
+            if not PageActions(tab).click_element_by_key(key):
+                result['error'] = f"点击 MORE 入口失败: {key}"
+                return result
+
+            drama_item = compile_locator(HOME_MORE_PAGE['drama_item'], 'css').drission
+            if not tab.wait.eles_loaded(drama_item, timeout=self.item_timeout):
+                result['error'] = "MORE 页面未加载出剧集条目"
+                result['url'] = tab.url
+                return result
+
+            data = tab.run_js(_VALIDATE_ITEMS_JS, int(self.image_timeout * 1000), timeout=self.image_timeout + 5)
+            result['url'] = data['url']
+            result['items'] = data['items']
+            result['broken_images'] = [item for item in data['items'] if item['image_state'] == 'broken']
+            result['ok'] = bool(data['items']) and not result['broken_images']
+            if not data['items']:
+                result['error'] = "MORE 页面没有剧集条目"
+            elif result['broken_images']:
+                result['error'] = f"{len(result['broken_images'])} 个封面图加载失败"
+            return result
+        except Exception as e:
+            logger.error("巡检 MORE 栏目 %s 失败: %s", section, e)
+            result['error'] = str(e)
+            return result
+        finally:
+            result['duration'] = round(time.time() - start_time, 2)
+            if tab is not None:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+
+    def crawl(self, names=None):
+        """
+        并行巡检 MORE 栏目
+        :param names: 需要巡检的栏目名列表（可选），默认巡检全部栏目
+        :return: 栏目名 -> 栏目结果，按配置顺序排列
+        """
+        sections = {name: key for name, key in self.sections.items() if names is None or name in names}
+        if not sections:
+            return {}
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_tabs, len(sections)))) as executor:
+            futures = {name: executor.submit(self._crawl_section, name, key) for name, key in sections.items()}
+            results = {name: future.result() for name, future in futures.items()}
+
+        for name, result in results.items():
+            logger.info("MORE 栏目 %s: %s，%s 个条目，耗时 %.2f秒%s", name, '通过' if result['ok'] else '失败',
+                        len(result['items']), result['duration'], f"（{result['error']}）" if result['error'] else '')
+        logger.info("MORE 栏目巡检完成，%s 个栏目，总耗时 %.2f秒", len(results), time.time() - start_time)
+        return results
@@ -0,0 +1,245 @@
+"""
+网络策略 - 按用例/标记通过 CDP Network.setBlockedURLs 屏蔽图片、字体、视频分片和第三方统计等请求，
+并统计每次运行实际加载的字节数和屏蔽请求估算节省的字节数
+"""
+import os
+import json
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+from config.settings import NETWORK_POLICY_CONFIG
+from utils.logger_utils import LoggerUtils
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 资源大小缓存：未屏蔽时记录每个资源的传输字节数，用于估算屏蔽后节省的字节数
+SIZE_CACHE_PATH = Path(__file__).parent.parent / '.cache' / 'network_sizes.json'
+
+# 各 worker 的统计写入报告目录下的子目录，由主进程汇总
+NETWORK_STATS_DIRNAME = 'network'
+
+
+def _size_key(url):
+    """
+    资源大小缓存的键：去掉查询参数的 URL（同一资源不同裁剪参数大小相近）
+    :param url: 请求 URL
+    :return: 缓存键
+    """
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+class NetworkAccounting:
+    """进程内的网络统计，所有用例共享"""
+
+    def __init__(self, cache_path=SIZE_CACHE_PATH):
+        """
+        初始化网络统计
+        :param cache_path: 资源大小缓存文件路径
+        """
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self.sizes = self._load_sizes()
+        self.type_sizes = {}
+        self.requests = 0
+        self.bytes_loaded = 0
+        self.blocked = {}
+        self.bytes_saved = 0
+
+    def _load_sizes(self):
+        """
+        读取资源大小缓存
+        :return: 缓存键 -> 字节数
+        """
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record_loaded(self, url, resource_type, size):
+        """
+        记录一个加载完成的请求
+        :param url: 请求 URL
+        :param resource_type: CDP 资源类型，如 Image、Font、Media
+        :param size: 传输字节数
+        """
+        with self._lock:
+            self.requests += 1
+            self.bytes_loaded += size
+            if url:
+                self.sizes[_size_key(url)] = size
+            total, count = self.type_sizes.get(resource_type, (0, 0))
+            self.type_sizes[resource_type] = (total + size, count + 1)
+
+    def record_blocked(self, url, resource_type):
+        """
+        记录一个被屏蔽的请求，按历史大小（或同类型平均大小）估算节省的字节数
+        :param url: 请求 URL
+        :param resource_type: CDP 资源类型
+        """
+        with self._lock:
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+            size = self.sizes.get(_size_key(url)) if url else None
+            if size is None:
+                total, count = self.type_sizes.get(resource_type, (0, 0))
+                size = total // count if count else 0
+            self.bytes_saved += size
+
+    def to_dict(self):
+        """
+        转换为统计字典
+        :return: 统计字典
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'bytes_loaded': self.bytes_loaded,
+                'blocked': dict(self.blocked),
+                'blocked_total': sum(self.blocked.values()),
+                'bytes_saved': self.bytes_saved
+            }
+
+    def save(self, report_dir, worker_id='master'):
+        """
+        保存资源大小缓存，并把本进程的统计写入报告目录
+        :param report_dir: 报告目录
+        :param worker_id: xdist worker ID
+        """
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with self._lock, open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.sizes, f)
+            os.replace(tmp_path, self.cache_path)
+
+            stats_dir = Path(report_dir) / NETWORK_STATS_DIRNAME
+            stats_dir.mkdir(parents=True, exist_ok=True)
+            with open(stats_dir / f"{worker_id}.json", 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning("保存网络统计失败: %s", e)
+
+
+def aggregate_network_stats(report_dir):
+    """
+    汇总报告目录下所有进程的网络统计
+    :param report_dir: 报告目录
+    :return: 汇总统计字典，没有统计文件时返回 None
+    """
+    totals = None
+    for stats_file in sorted((Path(report_dir) / NETWORK_STATS_DIRNAME).glob('*.json')):
+        try:
+            with open(stats_file, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if totals is None:
+            totals = {'requests': 0, 'bytes_loaded': 0, 'blocked': {}, 'blocked_total': 0, 'bytes_saved': 0}
+        for key in ('requests', 'bytes_loaded', 'blocked_total', 'bytes_saved'):
+            totals[key] += stats.get(key, 0)
+        for resource_type, count in stats.get('blocked', {}).items():
+            totals['blocked'][resource_type] = totals['blocked'].get(resource_type, 0) + count
+    return totals
+
+
+def resolve_policy(name):
+    """
+    把策略名解析为需要屏蔽的 URL 模式列表
+    :param name: 策略名，None 或 'off' 表示不屏蔽
+    :return: URL 模式列表
+    :raises ValueError: 策略名未配置时抛出
+    """
+    if not name or name == 'off':
+        return []
+    policies = NETWORK_POLICY_CONFIG.get('policies', {})
+    if name not in policies:
+        raise ValueError(f"未配置的网络策略: {name}，可用策略: {', '.join(policies)}")
+    groups = NETWORK_POLICY_CONFIG.get('block_groups', {})
+    patterns = []
+    for group in policies[name]:
+        for pattern in groups.get(group, []):
+            if pattern not in patterns:
+                patterns.append(pattern)
+    return patterns
+
+
+class NetworkPolicy:
+    """单个页面（标签页）上的网络策略"""
+
+    def __init__(self, page, accounting=None):
+        """
+        初始化网络策略
+        :param page: ChromiumPage / ChromiumTab 对象
+        :param accounting: NetworkAccounting 实例（可选），默认使用全局统计
+        """
+        self.page = page
+        self.accounting = accounting or get_network_accounting()
+        self.policy = None
+        self._requests = {}
+
+    def _on_request(self, **kwargs):
+        self._requests[kwargs.get('requestId')] = (
+            kwargs.get('request', {}).get('url'), kwargs.get('type', 'Other')
+        )
+
+    def _on_finished(self, **kwargs):
+        url, resource_type = self._requests.pop(kwargs.get('requestId'), (None, 'Other'))
+        self.accounting.record_loaded(url, resource_type, int(kwargs.get('encodedDataLength', 0)))
+
+    def _on_failed(self, **kwargs):
+        url, resource_type = self._requests.pop(kwargs.get('requestId'), (None, kwargs.get('type', 'Other')))
+        if kwargs.get('blockedReason'):
+            self.accounting.record_blocked(url, resource_type)
+
+    def apply(self, policy=None):
+        """
+        开始统计请求并应用屏蔽策略
+        :param policy: 策略名（可选），None 表示只统计不屏蔽
+        :return: 是否应用成功
+        """
+        try:
+            patterns = resolve_policy(policy)
+            driver = self.page.driver
+            driver.set_callback('Network.requestWillBeSent', self._on_request)
+            driver.set_callback('Network.loadingFinished', self._on_finished)
+            driver.set_callback('Network.loadingFailed', self._on_failed)
+            self.page.run_cdp('Network.enable')
+            self.page.run_cdp('Network.setBlockedURLs', urls=patterns)
+            self.policy = policy
+            if patterns:
+                logger.info("应用网络策略 %s：屏蔽 %s 个 URL 模式", policy, len(patterns))
+            return True
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.warning("应用网络策略 %s 失败: %s", policy, e)
+            return False
+
+    def clear(self):
+        """取消屏蔽并停止统计，后续用例按完整资源加载"""
+        try:
+            self.page.run_cdp('Network.setBlockedURLs', urls=[])
+            driver = self.page.driver
+            for event in ('Network.requestWillBeSent', 'Network.loadingFinished', 'Network.loadingFailed'):
+                driver.set_callback(event, None)
+        except Exception as e:
+            logger.debug("清除网络策略失败: %s", e)
+        self.policy = None
+        self._requests.clear()
+
+
+# 全局网络统计实例
+_network_accounting = None
+
+
+def get_network_accounting():
+    """
+    获取网络统计实例
+    :return: NetworkAccounting 实例
+    """
+    global _network_accounting
+    if _network_accounting is None:
+        _network_accounting = NetworkAccounting()
+    return _network_accounting
@@ -0,0 +1,210 @@
+"""
+离线定位器校验 - 在启动浏览器之前，用保存的页面快照（html_files/）校验 config/locators.py 中的定位器
+CSS 使用 soupsieve 编译后匹配，XPath/文本定位使用 lxml，输出每个定位器的匹配数和唯一性
+"""
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from lxml import html as lxml_html
+from bs4 import BeautifulSoup
+from config.locators import LOCATOR_FALLBACKS
+from config.settings import LOCATOR_VERIFY_CONFIG
+from utils.locator_compiler import iter_locator_tables, compile_locator, LocatorError
+from utils.dom_snapshot import resolve_snapshot_path, read_snapshot_text
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 校验结果状态
+STATUS_OK = 'ok'              # 唯一匹配
+STATUS_AMBIGUOUS = 'ambiguous'  # 匹配多个元素（DrissionPage 取第一个）
+STATUS_MISSING = 'missing'    # 快照中没有匹配
+STATUS_SKIPPED = 'skipped'    # 没有对应快照或定位类型无法离线校验
+
+
+@dataclass
+class LocatorCheck:
+    """单个定位器在单个快照上的校验结果"""
+
+    name: str        # 定位器名称，如 HOME_PAGE.best_first_drama
+    locator: str     # 原始定位字符串
+    snapshot: str    # 快照文件名
+    count: int       # 匹配数
+    status: str      # 校验状态
+    message: str = ''
+
+
+class Snapshot:
+    """页面快照，解析一次后同时提供 CSS（soupsieve）和 XPath（lxml）查询"""
+
+    def __init__(self, path):
+        """
+        加载页面快照
+        :param path: 快照文件路径（支持 .gz）
+        """
+        self.path = Path(path)
+        content = read_snapshot_text(self.path)
+        self.soup = BeautifulSoup(content, 'lxml')
+        self.tree = lxml_html.fromstring(content)
+
+    def count(self, compiled):
+        """
+        统计定位器在快照中的匹配数
+        :param compiled: CompiledLocator
+        :return: 匹配数，定位类型无法离线校验时返回 None
+        """
+        if compiled.kind in ('css', 'tag'):
+            return len(self.soup.select(compiled.selector))
+        if compiled.kind == 'xpath':
+            return len(self.tree.xpath(compiled.selector))
+        if compiled.kind in ('text', 'text_exact'):
+            # 与 compile_locator 生成的 JS 查询一致：按文本节点匹配
+            if compiled.kind == 'text_exact':
+                return len(self.tree.xpath('//*[text()=$text]', text=compiled.selector))
+            return len(self.tree.xpath('//*[contains(text(), $text)]', text=compiled.selector))
+        return None
+
+
+class OfflineLocatorVerifier:
+    """离线定位器校验器"""
+
+    def __init__(self, snapshot_dir=None, snapshots=None):
+        """
+        初始化离线校验器
+        :param snapshot_dir: 快照目录（可选），默认取 LOCATOR_VERIFY_CONFIG['snapshot_dir']
+        :param snapshots: 定位器表名 -> 快照文件名列表（可选），默认取 LOCATOR_VERIFY_CONFIG['snapshots']
+        """
+        self.snapshot_dir = Path(snapshot_dir or PROJECT_ROOT / LOCATOR_VERIFY_CONFIG.get('snapshot_dir', 'html_files'))
+        self.snapshots = snapshots or LOCATOR_VERIFY_CONFIG.get('snapshots', {})
+        self.entry_snapshots = LOCATOR_VERIFY_CONFIG.get('entry_snapshots', {})
+        self.skip_entries = set(LOCATOR_VERIFY_CONFIG.get('skip_entries', []))
+        self._loaded = {}
+
+    def _snapshot(self, filename):
+        """
+        加载快照（同一快照只解析一次），同名的压缩快照优先
+        :param filename: 快照文件名
+        :return: Snapshot 实例，文件不存在时返回 None
+        """
+        if filename not in self._loaded:
+            path = resolve_snapshot_path(self.snapshot_dir, filename)
+            self._loaded[filename] = Snapshot(path) if path else None
+        return self._loaded[filename]
+
+    def _iter_locators(self):
+        """
+        遍历需要校验的定位器（包括 LOCATOR_FALLBACKS 中的候选）
+        :return: (定位器名称, 表名, 定位字符串) 生成器
+        """
+        for table_name, table in iter_locator_tables():
+            if table is LOCATOR_FALLBACKS:
+                continue
+            for key, locator in table.items():
+                if isinstance(locator, str):
+                    yield f"{table_name}.{key}", table_name, locator
+        for key, candidates in LOCATOR_FALLBACKS.items():
+            table_name = key.partition('.')[0]
+            for idx, locator in enumerate(candidates):
+                yield f"{key}[{idx}]", table_name, locator
+
+    def verify(self):
+        """
+        校验所有定位器
+        :return: LocatorCheck 列表
+        """
+        results = []
+        for name, table_name, locator in self._iter_locators():
+            entry = name.partition('[')[0]
+            if entry in self.skip_entries:
+                results.append(LocatorCheck(name, locator, '', 0, STATUS_SKIPPED, '配置为跳过'))
+                continue
+
+            snapshot_files = self.entry_snapshots.get(entry) or self.snapshots.get(table_name, [])
+            if not snapshot_files:
+                results.append(LocatorCheck(name, locator, '', 0, STATUS_SKIPPED, '没有对应的页面快照'))
+                continue
+
+            try:
+                compiled = compile_locator(locator, 'css')
+            except LocatorError as e:
+                results.append(LocatorCheck(name, locator, '', 0, STATUS_MISSING, str(e)))
+                continue
+
+            for filename in snapshot_files:
+                snapshot = self._snapshot(filename)
+                if snapshot is None:
+                    results.append(LocatorCheck(name, locator, filename, 0, STATUS_SKIPPED, '快照文件不存在'))
+                    continue
+                try:
+                    count = snapshot.count(compiled)
+                except Exception as e:
+                    results.append(LocatorCheck(name, locator, filename, 0, STATUS_MISSING, f"查询失败: {e}"))
+                    continue
+
+                if count is None:
+                    status = STATUS_SKIPPED
+                elif count == 0:
+                    status = STATUS_MISSING
+                elif count == 1:
+                    status = STATUS_OK
+                else:
+                    status = STATUS_AMBIGUOUS
+                results.append(LocatorCheck(name, locator, filename, count or 0, status))
+        return results
+
+
+def format_summary(results, elapsed):
+    """
+    格式化校验结果摘要
+    :param results: LocatorCheck 列表
+    :param elapsed: 耗时（秒）
+    :return: 摘要文本
+    """
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+
+    lines = [
+        f"离线定位器校验: 唯一 {counts.get(STATUS_OK, 0)}, 多个匹配 {counts.get(STATUS_AMBIGUOUS, 0)}, "
+        f"未匹配 {counts.get(STATUS_MISSING, 0)}, 跳过 {counts.get(STATUS_SKIPPED, 0)}，耗时 {elapsed:.3f}秒"
+    ]
+    for result in results:
+        if result.status == STATUS_MISSING:
+            lines.append(f"  [未匹配] {result.name} @ {result.snapshot or '-'}: {result.locator} {result.message}".rstrip())
+    return '\n'.join(lines)
+
+
+def run_offline_verification(mode=None):
+    """
+    执行离线校验并按模式处理结果
+    :param mode: 校验模式 off / warn / strict，默认取 LOCATOR_VERIFY_CONFIG['mode']
+    :return: (是否通过, 摘要文本)；off 模式返回 (True, '')
+    """
+    mode = mode or LOCATOR_VERIFY_CONFIG.get('mode', 'warn')
+    if mode == 'off':
+        return True, ''
+
+    start_time = time.time()
+    results = OfflineLocatorVerifier().verify()
+    summary = format_summary(results, time.time() - start_time)
+
+    passed = mode != 'strict' or not any(result.status == STATUS_MISSING for result in results)
+    return passed, summary
+
+
+def main():
+    """命令行入口：python -m utils.offline_locator_verifier [--verbose]"""
+    start_time = time.time()
+    results = OfflineLocatorVerifier().verify()
+    elapsed = time.time() - start_time
+
+    if '--verbose' in sys.argv:
+        for result in results:
+            print(f"{result.status:<10} {result.count:>4}  {result.name} @ {result.snapshot or '-'}")
+    print(format_summary(results, elapsed))
+    sys.exit(1 if any(result.status == STATUS_MISSING for result in results) else 0)
+
+
+if __name__ == '__main__':
+    main()
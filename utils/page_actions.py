@@ -1,6 +1,12 @@
 from DrissionPage import ChromiumPage
 from utils.decorators import element_wait_decorator
 from utils.logger_utils import LoggerUtils
+from utils.locator_compiler import compile_locator, LocatorError
+from utils.locator_healer import LocatorHealer
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
 
 class PageActions:
     """页面基础操作类，封装常用的元素操作方法"""
@@ -13,25 +19,23 @@ class PageActions:
         """
         # 初始化页面操作对象，传入ChromiumPage实例
         self.page = page
-        # 获取当前模块的日志记录器
-        self.logger = LoggerUtils.get_default_logger()
+        # 使用模块级日志记录器，避免每次实例化时解析调用者
+        self.logger = logger
+        # 自愈定位引擎，按定位器键批量探测候选策略
+        self.healer = LocatorHealer(page)
     
     def _format_locator(self, locator, selector_type=None):
         """
-        根据选择器类型格式化定位器
+        根据选择器类型格式化定位器（使用编译缓存，同一定位器只解析一次）
         :param locator: 定位器
         :param selector_type: 选择器类型，如 "css", "xpath", "tag" 等，默认为 None
         :return: 格式化后的定位器
         """
-        if selector_type:
-            # 根据选择器类型拼接定位器
-            if selector_type.lower() == "css" and not locator.startswith("css:"):
-                return f"css:{locator}"
-            elif selector_type.lower() == "xpath" and not locator.startswith("xpath:"):
-                return f"xpath:{locator}"
-            elif selector_type.lower() == "tag" and not locator.startswith("tag:"):
-                return f"tag:{locator}"
-        return locator
+        try:
+            return compile_locator(locator, selector_type).drission
+        except LocatorError as e:
+            self.logger.error("定位器编译失败: %s", e)
+            return locator
 
     @element_wait_decorator(wait_type="exists", timeout=20, raise_err=False)
     def find_element(self, locator, selector_type=None):
@@ -55,7 +59,7 @@ class PageActions:
                 return self._get_element(locator, selector_type)
         except Exception as e:
             # 记录错误日志
-            self.logger.error(f"查找元素失败: {e}")
+            self.logger.error("查找元素失败: %s", e)
             return None
     
     def _get_element(self, locator, selector_type=None):
@@ -72,9 +76,37 @@ class PageActions:
             element = self.page.ele(locator, timeout=0.1)  # 使用极短超时，由装饰器控制等待
             return element if element else None
         except Exception as e:
-            self.logger.debug(f"元素查找失败: {e}")
+            self.logger.debug("元素查找失败: %s", e)
             return None
 
+    def find_element_by_key(self, key, timeout=5):
+        """
+        按定位器键查找元素（自愈定位）：一次探测所有候选策略，命中的候选会被提升排名
+        :param key: 定位器键，如 "HOME_PAGE.best_first_drama"
+        :param timeout: 超时时间（秒），所有候选共享
+        :return: 元素对象或None
+        """
+        element, _ = self.healer.resolve(key, timeout=timeout)
+        return element
+
+    def click_element_by_key(self, key, timeout=5):
+        """
+        按定位器键点击元素（自愈定位）
+        :param key: 定位器键，如 "HOME_PAGE.eastern_legends_more"
+        :param timeout: 超时时间（秒），所有候选共享
+        :return: 是否成功点击
+        """
+        element, locator = self.healer.resolve(key, timeout=timeout)
+        if not element:
+            return False
+        try:
+            element.click()
+            self.logger.info("成功点击元素: %s（%s）", key, locator)
+            return True
+        except Exception as e:
+            self.logger.error("点击元素失败: %s, %s", key, e)
+            return False
+
     @element_wait_decorator(wait_type="exists", timeout=20, raise_err=False)
     def find_elements(self, locator, selector_type=None):
         """
@@ -91,7 +123,7 @@ class PageActions:
             return self.page.eles(locator, timeout=0.1)  # 使用极短超时，由装饰器控制等待
         except Exception as e:
             # 记录错误日志
-            self.logger.error(f"查找元素列表失败: {e}")
+            self.logger.error("查找元素列表失败: %s", e)
             return []
 
     @element_wait_decorator(wait_type="clickable", timeout=20, raise_err=False)
@@ -109,11 +141,11 @@ class PageActions:
             # 点击元素（装饰器已确保元素可点击）
             element.click()
             # 记录成功日志
-            self.logger.info(f"成功点击元素: {locator}")
+            self.logger.info("成功点击元素: %s", locator)
             return True
         except Exception as e:
             # 记录错误日志
-            self.logger.error(f"点击元素失败: {e}")
+            self.logger.error("点击元素失败: %s", e)
             return False
 
     @element_wait_decorator(wait_type="exists", timeout=20, raise_err=False)
@@ -131,11 +163,11 @@ class PageActions:
             # 获取元素文本（装饰器已确保元素存在）
             text = element.text
             # 记录成功日志
-            self.logger.info(f"获取元素文本: {text}")
+            self.logger.info("获取元素文本: %s", text)
             return text
         except Exception as e:
             # 记录错误日志
-            self.logger.error(f"获取元素文本失败: {e}")
+            self.logger.error("获取元素文本失败: %s", e)
             return None
 
     def is_element_exists(self, locator, selector_type=None, timeout=3):
@@ -152,7 +184,7 @@ class PageActions:
             return element is not None
         except Exception as e:
             # 记录错误日志
-            self.logger.error(f"检查元素是否存在失败: {e}")
+            self.logger.error("检查元素是否存在失败: %s", e)
             return False
 
     @element_wait_decorator(wait_type="exists", timeout=20, raise_err=False)
@@ -170,15 +202,15 @@ class PageActions:
             # 检查元素是否存在（装饰器已确保元素存在）
             if element:
                 # 如果元素存在，记录成功日志
-                self.logger.info(f"成功等待元素出现: {locator}")
+                self.logger.info("成功等待元素出现: %s", locator)
                 return True
             else:
                 # 如果元素不存在，记录错误日志
-                self.logger.error(f"等待元素超时: {locator}")
+                self.logger.error("等待元素超时: %s", locator)
                 return False
         except Exception as e:
             # 记录错误日志
-            self.logger.error(f"等待元素失败: {e}")
+            self.logger.error("等待元素失败: %s", e)
             return False
 
     def click_at_position(self, x, y):
@@ -191,11 +223,11 @@ class PageActions:
         try:
             # 使用 JavaScript 在指定坐标执行点击
             self.page.run_js(f"document.elementFromPoint({x}, {y}).click();")
-            self.logger.info(f"成功点击坐标({x}, {y})")
+            self.logger.info("成功点击坐标(%s, %s)", x, y)
             return True
         except Exception as e:
             # 记录错误日志
-            self.logger.error(f"点击坐标({x}, {y})失败: {e}")
+            self.logger.error("点击坐标(%s, %s)失败: %s", x, y, e)
             return False
 
     def close_float_layer(self, element, offset_y=40, fallback=True):
@@ -222,10 +254,10 @@ class PageActions:
 
             # 点击计算出的位置
             self.click_at_position(click_x, click_y)
-            self.logger.info(f"点击浮层顶部向上{offset_y}像素位置({click_x}, {click_y})关闭浮层")
+            self.logger.info("点击浮层顶部向上%s像素位置(%s, %s)关闭浮层", offset_y, click_x, click_y)
             return True
         except Exception as e:
-            self.logger.error(f"点击浮层顶部位置失败: {str(e)}")
+            self.logger.error("点击浮层顶部位置失败: %s", e)
             if fallback:
                 try:
                     # 使用默认点击方式作为备用方案
@@ -233,6 +265,6 @@ class PageActions:
                     self.logger.info("使用默认点击方式关闭浮层成功")
                     return True
                 except Exception as inner_e:
-                    self.logger.error(f"备用方案也失败: {str(inner_e)}")
+                    self.logger.error("备用方案也失败: %s", inner_e)
                     return False
             return False
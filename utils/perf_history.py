@@ -0,0 +1,155 @@
+"""
+性能历史记录 - 以 JSON Lines 格式追加保存每次基准运行的分位数结果，用于对比不同时间的播放启动性能
+"""
+import os
+import json
+import math
+import threading
+from datetime import datetime
+from pathlib import Path
+from config.settings import BENCHMARK_CONFIG
+from utils.logger_utils import LoggerUtils
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def percentile(values, p):
+    """
+    计算分位数（线性插值）
+    :param values: 数值列表
+    :param p: 百分位，0-100
+    :return: 分位数，列表为空时返回 None
+    """
+    data = sorted(values)
+    if not data:
+        return None
+    rank = (len(data) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return data[low] + (data[high] - data[low]) * (rank - low)
+
+
+def summarize(values, digits=1):
+    """
+    汇总一组测量值
+    :param values: 数值列表（None 会被忽略）
+    :param digits: 保留的小数位数
+    :return: {count, min, p50, p90, p95, max, mean}，没有有效值时只有 count
+    """
+    data = [value for value in values if value is not None]
+    if not data:
+        return {'count': 0}
+    return {
+        'count': len(data),
+        'min': round(min(data), digits),
+        'p50': round(percentile(data, 50), digits),
+        'p90': round(percentile(data, 90), digits),
+        'p95': round(percentile(data, 95), digits),
+        'max': round(max(data), digits),
+        'mean': round(sum(data) / len(data), digits)
+    }
+
+
+class PerfHistory:
+    """性能历史记录"""
+
+    def __init__(self, path=None, max_records=None):
+        """
+        初始化历史记录
+        :param path: 记录文件路径（可选），默认取 BENCHMARK_CONFIG['history_file']
+        :param max_records: 最多保留的记录数（可选），默认取 BENCHMARK_CONFIG['max_records']
+        """
+        self.path = Path(path or PROJECT_ROOT / BENCHMARK_CONFIG.get('history_file', 'reports/perf_history.jsonl'))
+        self.max_records = max_records or BENCHMARK_CONFIG.get('max_records', 1000)
+        self._lock = threading.Lock()
+
+    def load(self, name=None, limit=None):
+        """
+        读取历史记录
+        :param name: 基准名称（可选），只返回该基准的记录
+        :param limit: 最多返回最近的条数（可选）
+        :return: 记录列表，按时间从旧到新
+        """
+        records = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if name is None or record.get('name') == name:
+                        records.append(record)
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.warning("读取性能历史失败 %s: %s", self.path, e)
+            return []
+        return records[-limit:] if limit else records
+
+    def append(self, name, metrics, meta=None):
+        """
+        追加一条记录，超过上限时原子重写文件丢弃最旧的记录
+        :param name: 基准名称
+        :param metrics: 指标字典，如 {'click_to_first_frame_ms': summarize(...)}
+        :param meta: 附加信息（可选），如剧集列表、重复次数
+        :return: 写入的记录，失败时返回 None
+        """
+        record = {
+            'name': name,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'metrics': metrics,
+            'meta': meta or {}
+        }
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                self._trim()
+            except OSError as e:
+                logger.error("写入性能历史失败 %s: %s", self.path, e)
+                return None
+        return record
+
+    def _trim(self):
+        """记录数超过上限时只保留最近的 max_records 条"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        if len(lines) <= self.max_records:
+            return
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines[-self.max_records:])
+        os.replace(tmp_path, self.path)
+
+    def compare_with_previous(self, name, metric, stat='p50'):
+        """
+        对比最近两次记录的某个指标
+        :param name: 基准名称
+        :param metric: 指标名
+        :param stat: 统计量，如 p50、p90
+        :return: (上一次的值, 本次的值)，记录不足时对应位置为 None
+        """
+        records = self.load(name, limit=2)
+        values = [record.get('metrics', {}).get(metric, {}).get(stat) for record in records]
+        values = [None] * (2 - len(values)) + values
+        return values[0], values[1]
+
+
+# 全局历史记录实例
+_perf_history = None
+
+
+def get_perf_history():
+    """
+    获取性能历史记录实例
+    :return: PerfHistory 实例
+    """
+    global _perf_history
+    if _perf_history is None:
+        _perf_history = PerfHistory()
+    return _perf_history
@@ -1,22 +1,71 @@
 
 """
 报告目录管理器 - 统一管理测试报告的目录结构
+每次运行使用唯一的运行 ID 作为目录名，运行期间持有锁文件，并原子更新 latest 链接指向最近一次运行
 """
+import os
+import secrets
+import psutil
 from datetime import datetime
 from pathlib import Path
 from utils.logger_utils import LoggerUtils
 from config.settings import REPORT_CONFIG
 
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 运行目录锁文件名，存在且进程存活表示该运行仍在进行
+LOCK_FILENAME = '.lock'
+
+# 指向最近一次运行目录的链接名
+LATEST_LINK_NAME = 'latest'
+
+
+def generate_run_id():
+    """
+    生成唯一的运行 ID：时间戳 + 进程号 + 随机后缀
+    :return: 运行 ID，如 20240101_120000_12345_a1b2c3
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{secrets.token_hex(3)}"
+
+
+def is_pid_alive(pid):
+    """
+    判断进程是否存活
+    :param pid: 进程号
+    :return: 存活返回 True
+    """
+    # 不使用 os.kill(pid, 0)：Windows 上该调用会直接结束目标进程
+    return psutil.pid_exists(pid)
+
+
+def is_run_locked(run_dir, lock_filename=LOCK_FILENAME):
+    """
+    判断运行目录是否被正在进行的运行锁定（锁文件存在且持有进程存活）
+    :param run_dir: 运行目录
+    :param lock_filename: 锁文件名
+    :return: 锁定返回 True
+    """
+    try:
+        pid = int((Path(run_dir) / lock_filename).read_text(encoding='utf-8').strip())
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        # 锁文件正在写入或内容异常，按锁定处理，避免误删
+        return True
+    return is_pid_alive(pid)
+
 
 class ReportDirManager:
     """报告目录管理器"""
 
-    def __init__(self, report_dir=None):
+    def __init__(self, report_dir=None, run_id=None):
         """
         初始化报告目录管理器
         :param report_dir: 报告基础目录（可选）
+        :param run_id: 运行 ID（可选）；指定时加入已有的运行目录（如 xdist worker），不指定时创建新的运行
         """
-        self.logger = LoggerUtils.get_default_logger()
+        self.logger = logger
 
         # 如果提供了report_dir，使用它作为基础目录
         if report_dir:
@@ -26,17 +75,71 @@ class ReportDirManager:
             project_root = Path(__file__).parent.parent
             self.report_base_dir = project_root / REPORT_CONFIG.get('base_dir', 'reports')
 
-        # 使用时间戳创建报告目录
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-        self.report_dir = self.report_base_dir / timestamp
-        self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.report_base_dir.mkdir(parents=True, exist_ok=True)
+        self.owns_run = run_id is None
+
+        if self.owns_run:
+            # 创建新的运行目录，目录已存在时重新生成运行 ID，保证不会与其他运行共用目录
+            while True:
+                self.run_id = generate_run_id()
+                self.report_dir = self.report_base_dir / self.run_id
+                try:
+                    self.report_dir.mkdir()
+                    break
+                except FileExistsError:
+                    continue
+            self._acquire_lock()
+            self._update_latest_link()
+        else:
+            self.run_id = run_id
+            self.report_dir = self.report_base_dir / run_id
+            self.report_dir.mkdir(parents=True, exist_ok=True)
 
         # 创建截图目录
         self.screenshot_dir = self.report_dir / 'screenshots'
         self.screenshot_dir.mkdir(parents=True, exist_ok=True)
 
-        self.logger.info(f"报告目录: {self.report_dir}")
-        self.logger.info(f"截图目录: {self.screenshot_dir}")
+        self.logger.info("报告目录: %s", self.report_dir)
+        self.logger.info("截图目录: %s", self.screenshot_dir)
+
+    def _acquire_lock(self):
+        """写入锁文件，标记运行正在进行"""
+        lock_path = self.report_dir / LOCK_FILENAME
+        with open(lock_path, 'w', encoding='utf-8') as f:
+            f.write(str(os.getpid()))
+
+    def release_lock(self):
+        """删除锁文件，标记运行已结束（仅创建运行的进程执行）"""
+        if not self.owns_run:
+            return
+        try:
+            (self.report_dir / LOCK_FILENAME).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.error("删除运行锁文件失败: %s", e)
+
+    def _update_latest_link(self):
+        """原子更新 latest 链接，指向本次运行目录"""
+        latest_path = self.report_base_dir / LATEST_LINK_NAME
+        tmp_path = self.report_base_dir / f".{LATEST_LINK_NAME}.{self.run_id}.tmp"
+        try:
+            os.symlink(self.run_id, tmp_path, target_is_directory=True)
+            os.replace(tmp_path, latest_path)
+        except OSError as e:
+            # 部分平台（如未开启开发者模式的 Windows）不支持创建符号链接
+            self.logger.warning("更新 latest 链接失败: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def get_run_id(self):
+        """
+        获取运行 ID
+        :return: 运行 ID
+        """
+        return self.run_id
 
     def get_report_dir(self):
         """
@@ -73,13 +176,14 @@ class ReportDirManager:
 _report_dir_manager = None
 
 
-def get_report_dir_manager(report_dir=None):
+def get_report_dir_manager(report_dir=None, run_id=None):
     """
     获取报告目录管理器实例
     :param report_dir: 报告基础目录（可选）
+    :param run_id: 运行 ID（可选），用于加入已有的运行目录
     :return: ReportDirManager 实例
     """
     global _report_dir_manager
     if _report_dir_manager is None:
-        _report_dir_manager = ReportDirManager(report_dir)
+        _report_dir_manager = ReportDirManager(report_dir, run_id)
     return _report_dir_manager
@@ -0,0 +1,1018 @@
+"""
+统一的报告渲染引擎
+一次遍历测试结果构建结果模型，再由注册的渲染器（中文 HTML、简单 HTML、JSON、JUnit XML）输出，
+所有模板在首次使用时编译并缓存
+"""
+import os
+import json
+import base64
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from xml.sax.saxutils import escape, quoteattr
+from utils.web_vitals import VITAL_METRICS, aggregate_web_vitals, over_budget
+
+
+# 各种状态写法统一映射为英文状态键
+STATUS_ALIASES = {
+    'passed': 'passed',
+    '通过': 'passed',
+    'failed': 'failed',
+    '失败': 'failed',
+    'skipped': 'skipped',
+    '跳过': 'skipped',
+}
+
+# 状态键对应的中文文案
+STATUS_TEXT = {
+    'passed': '通过',
+    'failed': '失败',
+    'skipped': '跳过',
+    'unknown': '未知',
+}
+
+# 状态键对应的 CSS 类名
+STATUS_CLASS = {
+    'passed': 'pass',
+    'failed': 'fail',
+    'skipped': 'skip',
+    'unknown': 'skip',
+}
+
+
+def escape_html(text):
+    """转义 HTML 特殊字符"""
+    return (str(text)
+            .replace('&', '&amp;')
+            .replace('<', '&lt;')
+            .replace('>', '&gt;')
+            .replace('"', '&quot;'))
+
+
+class ReportModel:
+    """测试结果模型，一次遍历完成状态归一化、统计、按测试文件分组和页面加载性能汇总"""
+
+    def __init__(self, results, total_duration=None, generated_at=None):
+        """
+        初始化结果模型
+        :param results: 测试结果字典列表（name/status/duration/screenshots/error 等字段）
+        :param total_duration: 会话总耗时（秒），为空时使用各用例耗时之和
+        :param generated_at: 报告生成时间，默认当前时间
+        """
+        self.generated_at = generated_at or datetime.now()
+        self.cases = []
+        self.groups = {}
+        self.counts = {'passed': 0, 'failed': 0, 'skipped': 0, 'unknown': 0}
+        cases_duration = 0.0
+        web_vitals = []
+
+        for result in results:
+            case = self._normalize(result)
+            self.cases.append(case)
+            self.groups.setdefault(case['class_file'], []).append(case)
+            self.counts[case['status']] += 1
+            cases_duration += case['duration']
+            web_vitals.extend(case['web_vitals'])
+
+        self.total = len(self.cases)
+        self.passed = self.counts['passed']
+        self.failed = self.counts['failed']
+        self.skipped = self.counts['skipped']
+        # 初始化/清理阶段失败的用例（fixture、浏览器异常），统计在失败数中，JUnit 中输出为 error
+        self.errors = sum(1 for case in self.cases if case['status'] == 'failed' and case['phase'] != 'call')
+        self.total_duration = cases_duration if total_duration is None else total_duration
+        # 所有用例的页面加载性能按 URL 汇总
+        self.web_vitals_by_url = aggregate_web_vitals(web_vitals)
+
+        # 通过率按实际执行（通过 + 失败）的用例计算
+        executed = self.passed + self.failed
+        self.pass_rate = (self.passed / executed * 100) if executed > 0 else 0
+
+    @staticmethod
+    def _normalize(result):
+        """
+        将单条测试结果归一化为统一结构
+        :param result: 原始测试结果字典
+        :return: 归一化后的用例字典
+        """
+        status = STATUS_ALIASES.get(result.get('status'), 'unknown')
+        name = result.get('name', '')
+        return {
+            'name': name,
+            'nodeid': result.get('nodeid', name),
+            'description': result.get('description') or name.replace('_', ' '),
+            'status': status,
+            'status_text': STATUS_TEXT[status],
+            'duration': float(result.get('duration') or 0),
+            'screenshots': list(result.get('screenshots') or []),
+            'error': result.get('error') or '',
+            'log_file': result.get('log_file'),
+            'phase': result.get('phase') or 'call',
+            'class_file': result.get('class_file') or '未分类',
+            'web_vitals': list(result.get('web_vitals') or []),
+        }
+
+    def to_dict(self):
+        """
+        转换为可序列化的字典
+        :return: 报告数据字典
+        """
+        return {
+            'test_date': self.generated_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_cases': self.total,
+            'passed': self.passed,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'errors': self.errors,
+            'pass_rate': round(self.pass_rate, 1),
+            'total_duration': round(self.total_duration, 3),
+            'test_cases': self.cases,
+            'web_vitals_by_url': self.web_vitals_by_url,
+        }
+
+
+# 模板源码，首次使用时由 _template 编译并缓存
+_TEMPLATE_SOURCES = {
+    'chinese_page': '''<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>自动化测试报告</title>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "Microsoft YaHei", Arial, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+            padding: 20px;
+        }
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+        }
+        .header {
+            background: rgba(255, 255, 255, 0.95);
+            padding: 30px;
+            border-radius: 15px;
+            margin-bottom: 20px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+        }
+        .header h1 {
+            font-size: 32px;
+            color: #333;
+            margin-bottom: 10px;
+        }
+        .header .subtitle {
+            color: #666;
+            font-size: 14px;
+        }
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+            gap: 15px;
+            margin-bottom: 20px;
+        }
+        .stat-card {
+            background: rgba(255, 255, 255, 0.95);
+            padding: 25px;
+            border-radius: 15px;
+            text-align: center;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+            transition: transform 0.3s;
+        }
+        .stat-card:hover {
+            transform: translateY(-5px);
+        }
+        .stat-label {
+            color: #666;
+            font-size: 14px;
+            margin-bottom: 10px;
+        }
+        .stat-value {
+            font-size: 36px;
+            font-weight: bold;
+        }
+        .stat-value.pass { color: #4CAF50; }
+        .stat-value.fail { color: #f44336; }
+        .stat-value.skip { color: #ff9800; }
+        .stat-value.total { color: #667eea; }
+        .filter-bar {
+            background: rgba(255, 255, 255, 0.95);
+            padding: 20px;
+            border-radius: 15px;
+            margin-bottom: 20px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+        }
+        .vitals-section {
+            background: rgba(255, 255, 255, 0.95);
+            padding: 20px;
+            border-radius: 15px;
+            margin-bottom: 20px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+            overflow-x: auto;
+        }
+        .vitals-table {
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 13px;
+        }
+        .vitals-table th, .vitals-table td {
+            padding: 8px 10px;
+            border-bottom: 1px solid #eee;
+            text-align: right;
+            white-space: nowrap;
+        }
+        .vitals-table th:first-child, .vitals-table td:first-child {
+            text-align: left;
+            white-space: normal;
+            word-break: break-all;
+        }
+        .vitals-table td.over-budget {
+            color: #f44336;
+            font-weight: bold;
+        }
+        .filter-btn {
+            padding: 10px 25px;
+            margin-right: 10px;
+            border: none;
+            border-radius: 8px;
+            cursor: pointer;
+            font-size: 14px;
+            font-weight: bold;
+            transition: all 0.3s;
+            color: white;
+        }
+        .filter-btn:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+        }
+        .filter-btn.all { background: #667eea; }
+        .filter-btn.pass { background: #4CAF50; }
+        .filter-btn.fail { background: #f44336; }
+        .filter-btn.skip { background: #ff9800; }
+        .filter-btn.active {
+            box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.5);
+        }
+        .test-cases {
+            background: rgba(255, 255, 255, 0.95);
+            border-radius: 15px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+            overflow: hidden;
+        }
+        .test-case {
+            border-bottom: 1px solid #eee;
+            transition: all 0.3s;
+        }
+        .test-case:hover {
+            background: #f8f9fa;
+        }
+        .test-case:last-child {
+            border-bottom: none;
+        }
+        .case-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 20px;
+            cursor: pointer;
+        }
+        .case-info {
+            flex: 1;
+        }
+        .case-name {
+            font-size: 16px;
+            font-weight: bold;
+            color: #333;
+            margin-bottom: 5px;
+        }
+        .case-description {
+            color: #666;
+            font-size: 13px;
+        }
+        .case-meta {
+            display: flex;
+            align-items: center;
+            gap: 15px;
+        }
+        .case-status {
+            padding: 8px 20px;
+            border-radius: 20px;
+            font-size: 12px;
+            font-weight: bold;
+        }
+        .case-status.pass {
+            background: #e8f5e9;
+            color: #4CAF50;
+        }
+        .case-status.fail {
+            background: #ffebee;
+            color: #f44336;
+        }
+        .case-status.skip {
+            background: #fff3e0;
+            color: #ff9800;
+        }
+        .case-duration {
+            color: #999;
+            font-size: 13px;
+        }
+        .expand-icon {
+            font-size: 20px;
+            color: #999;
+            transition: transform 0.3s;
+        }
+        .test-case.expanded .expand-icon {
+            transform: rotate(180deg);
+        }
+        .case-details {
+            display: none;
+            padding: 0 20px 20px;
+            background: #fafafa;
+            border-top: 1px solid #eee;
+        }
+        .test-case.expanded .case-details {
+            display: block;
+        }
+        .screenshots-section {
+            margin-top: 15px;
+        }
+        .section-title {
+            font-size: 14px;
+            font-weight: bold;
+            color: #333;
+            margin-bottom: 10px;
+        }
+        .screenshots-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(200px, 1fr));
+            gap: 15px;
+        }
+        .screenshot-item {
+            position: relative;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            transition: transform 0.3s;
+            cursor: pointer;
+        }
+        .screenshot-item:hover {
+            transform: scale(1.02);
+            box-shadow: 0 4px 16px rgba(0,0,0,0.2);
+        }
+        .screenshot-item img {
+            width: 100%;
+            height: auto;
+            display: block;
+        }
+        .screenshot-label {
+            position: absolute;
+            bottom: 0;
+            left: 0;
+            right: 0;
+            background: rgba(0,0,0,0.7);
+            color: white;
+            padding: 5px 10px;
+            font-size: 12px;
+        }
+        .error-section {
+            margin-top: 15px;
+            background: #ffebee;
+            border-radius: 8px;
+            padding: 15px;
+            border-left: 4px solid #f44336;
+        }
+        .error-title {
+            font-weight: bold;
+            color: #f44336;
+            margin-bottom: 10px;
+        }
+        .error-content {
+            color: #c62828;
+            font-family: monospace;
+            font-size: 12px;
+            white-space: pre-wrap;
+            word-break: break-word;
+            max-height: 300px;
+            overflow-y: auto;
+        }
+        .log-section {
+            margin-top: 15px;
+            font-size: 13px;
+        }
+        .log-section a {
+            color: #667eea;
+            word-break: break-all;
+        }
+        .no-screenshots {
+            color: #999;
+            font-style: italic;
+            padding: 20px;
+            text-align: center;
+        }
+        .test-class-section {
+            margin-bottom: 30px;
+            border-radius: 15px;
+            overflow: hidden;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+        }
+        .class-header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        }
+        .class-header h2 {
+            margin: 0;
+            font-size: 20px;
+        }
+        .class-stats {
+            display: flex;
+            gap: 15px;
+        }
+        .class-stat {
+            padding: 5px 15px;
+            border-radius: 20px;
+            font-size: 14px;
+            font-weight: bold;
+        }
+        .class-stat.pass {
+            background: rgba(76, 175, 80, 0.2);
+            color: #4CAF50;
+        }
+        .class-stat.fail {
+            background: rgba(244, 67, 54, 0.2);
+            color: #f44336;
+        }
+        .class-stat.total {
+            background: rgba(255, 255, 255, 0.2);
+            color: white;
+        }
+        .class-cases {
+            background: rgba(255, 255, 255, 0.95);
+        }
+        .progress-bar {
+            width: 100%;
+            height: 8px;
+            background: #e0e0e0;
+            border-radius: 4px;
+            margin-top: 10px;
+            overflow: hidden;
+        }
+        .progress-fill {
+            height: 100%;
+            background: linear-gradient(90deg, #4CAF50, #8BC34A);
+            border-radius: 4px;
+            transition: width 0.5s ease;
+        }
+        .modal {
+            display: none;
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(0,0,0,0.9);
+            z-index: 1000;
+            justify-content: center;
+            align-items: center;
+        }
+        .modal.active {
+            display: flex;
+        }
+        .modal img {
+            max-width: 90%;
+            max-height: 90%;
+            border-radius: 8px;
+        }
+        .modal-close {
+            position: absolute;
+            top: 20px;
+            right: 40px;
+            color: white;
+            font-size: 40px;
+            cursor: pointer;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🧪 自动化测试报告</h1>
+            <div class="subtitle">生成时间：$date_str</div>
+        </div>
+
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-label">总用例数</div>
+                <div class="stat-value total">$total</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">通过</div>
+                <div class="stat-value pass">$passed</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">失败</div>
+                <div class="stat-value fail">$failed</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">跳过</div>
+                <div class="stat-value skip">$skipped</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">通过率</div>
+                <div class="stat-value pass">$pass_rate%</div>
+                <div class="progress-bar">
+                    <div class="progress-fill" style="width: $pass_rate%"></div>
+                </div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">总耗时</div>
+                <div class="stat-value total">${total_duration}s</div>
+            </div>
+        </div>
+
+        <div class="filter-bar">
+            <button class="filter-btn all active" onclick="filterCases('all')">全部 ($total)</button>
+            <button class="filter-btn pass" onclick="filterCases('pass')">通过 ($passed)</button>
+            <button class="filter-btn fail" onclick="filterCases('fail')">失败 ($failed)</button>
+            <button class="filter-btn skip" onclick="filterCases('skip')">跳过 ($skipped)</button>
+        </div>
+
+$vitals
+        <div class="test-cases">
+$sections
+        </div>
+    </div>
+
+    <div class="modal" id="imageModal" onclick="closeModal()">
+        <span class="modal-close">&times;</span>
+        <img id="modalImage" src="" alt="截图">
+    </div>
+
+    <script>
+        function filterCases(status) {
+            // 获取点击事件
+            const event = window.event;
+            // 移除所有按钮的active类
+            document.querySelectorAll('.filter-btn').forEach(btn => btn.classList.remove('active'));
+            // 为当前点击的按钮添加active类
+            if (event && event.target) {
+                event.target.classList.add('active');
+            }
+            
+            // 将英文状态转换为中文状态
+            const statusMap = {
+                'pass': '通过',
+                'fail': '失败',
+                'skip': '跳过'
+            };
+            const chineseStatus = statusMap[status] || status;
+            
+            // 筛选测试用例，但保留模块显示
+            document.querySelectorAll('.test-case').forEach(caseEl => {
+                if (status === 'all' || caseEl.dataset.status === chineseStatus) {
+                    caseEl.style.display = 'block';
+                } else {
+                    caseEl.style.display = 'none';
+                }
+            });
+            
+            // 始终显示所有模块，不隐藏模块区块
+            document.querySelectorAll('.test-class-section').forEach(classSection => {
+                classSection.style.display = 'block';
+            });
+        }
+
+        function toggleCase(element) {
+            element.classList.toggle('expanded');
+        }
+
+        function openModal(src) {
+            document.getElementById('modalImage').src = src;
+            document.getElementById('imageModal').classList.add('active');
+        }
+
+        function closeModal() {
+            document.getElementById('imageModal').classList.remove('active');
+        }
+
+        // 点击图片放大
+        document.querySelectorAll('.screenshot-item img').forEach(img => {
+            img.addEventListener('click', function(e) {
+                e.stopPropagation();
+                openModal(this.src);
+            });
+        });
+    </script>
+</body>
+</html>
+''',
+    'chinese_vitals': '''
+        <div class="vitals-section">
+            <div class="section-title">⏱️ 页面加载性能（p50 / p90，时间单位毫秒）</div>
+            <table class="vitals-table">
+                <tr><th>页面</th><th>次数</th>$headers</tr>
+$rows
+            </table>
+        </div>
+''',
+    'chinese_section': '''
+            <div class="test-class-section">
+                <div class="class-header">
+                    <h2>📁 $class_file</h2>
+                    <div class="class-stats">
+                        <span class="class-stat pass">通过: $passed</span>
+                        <span class="class-stat fail">失败: $failed</span>
+                        <span class="class-stat total">总计: $total</span>
+                    </div>
+                </div>
+                <div class="class-cases">
+$cases
+                </div>
+            </div>
+''',
+    'chinese_case': '''
+                <div class="test-case" data-status="$status_text" onclick="toggleCase(this)">
+                    <div class="case-header">
+                        <div class="case-info">
+                            <div class="case-name">$idx. $name</div>
+                            <div class="case-description">$description</div>
+                        </div>
+                        <div class="case-meta">
+                            <span class="case-status $status_class">$status_text</span>
+                            <span class="case-duration">${duration}s</span>
+                            <span class="expand-icon">▼</span>
+                        </div>
+                    </div>
+                    <div class="case-details">
+                        $screenshots
+                        $error
+                        $log
+                    </div>
+                </div>
+''',
+    'chinese_screenshot': '''
+                <div class="screenshot-item">
+                    <img src="$src" alt="截图 $idx" onclick="openModal('$src')">
+                    <div class="screenshot-label">截图 $idx</div>
+                </div>
+''',
+    'chinese_error': '''
+        <div class="error-section">
+            <div class="error-title">❌ 错误信息</div>
+            <div class="error-content">$error</div>
+        </div>
+''',
+    'chinese_log': '''
+        <div class="log-section">
+            <span class="section-title">📄 用例日志</span>
+            <a href="$href" target="_blank" onclick="event.stopPropagation()">$href</a>
+        </div>
+''',
+    'simple_page': '''<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>自动化测试报告</title>
+    <style>
+        body { font-family: Arial, sans-serif; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px; margin-bottom: 20px; }
+        .stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }
+        .stat-card { background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .stat-value { font-size: 32px; font-weight: bold; }
+        .stat-value.pass { color: #4CAF50; }
+        .stat-value.fail { color: #f44336; }
+        .test-cases { background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .test-case { padding: 20px; border-bottom: 1px solid #eee; }
+        .case-status { padding: 5px 15px; border-radius: 20px; font-size: 12px; font-weight: bold; }
+        .case-status.pass { background: #e8f5e9; color: #4CAF50; }
+        .case-status.fail { background: #ffebee; color: #f44336; }
+        .case-status.skip { background: #fff3e0; color: #ff9800; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>自动化测试报告</h1>
+            <p>测试日期: $date_str</p>
+        </div>
+        <div class="stats">
+            <div class="stat-card">
+                <div>总用例数</div>
+                <div class="stat-value">$total</div>
+            </div>
+            <div class="stat-card">
+                <div>通过</div>
+                <div class="stat-value pass">$passed</div>
+            </div>
+            <div class="stat-card">
+                <div>失败</div>
+                <div class="stat-value fail">$failed</div>
+            </div>
+            <div class="stat-card">
+                <div>通过率</div>
+                <div class="stat-value">$pass_rate%</div>
+            </div>
+            <div class="stat-card">
+                <div>总耗时</div>
+                <div class="stat-value">${total_duration}秒</div>
+            </div>
+        </div>
+        <div class="test-cases">
+$cases
+        </div>
+    </div>
+</body>
+</html>
+''',
+    'simple_case': '''            <div class="test-case">
+                <div class="case-status $status_class">$status_text</div>
+                <div>$idx. $name</div>
+                <div>执行耗时：${duration}秒</div>
+            </div>
+''',
+}
+
+
+@lru_cache(maxsize=None)
+def _template(name):
+    """
+    获取编译后的模板（每个模板只编译一次）
+    :param name: 模板名称
+    :return: string.Template 实例
+    """
+    return Template(_TEMPLATE_SOURCES[name])
+
+
+# 渲染器注册表：格式名称 -> (渲染函数, 默认文件名)
+_RENDERERS = {}
+
+
+def register_renderer(name, filename):
+    """
+    注册报告渲染器的装饰器
+    :param name: 输出格式名称，如 "chinese_html"、"json"
+    :param filename: 默认输出文件名
+    :return: 装饰器
+    """
+    def decorator(func):
+        _RENDERERS[name] = (func, filename)
+        return func
+    return decorator
+
+
+def get_renderer(name):
+    """
+    获取已注册的渲染器
+    :param name: 输出格式名称
+    :return: (渲染函数, 默认文件名)
+    """
+    if name not in _RENDERERS:
+        raise ValueError(f"未注册的报告格式: {name}，可用格式: {', '.join(sorted(_RENDERERS))}")
+    return _RENDERERS[name]
+
+
+def available_formats():
+    """
+    获取所有已注册的输出格式
+    :return: 格式名称列表
+    """
+    return sorted(_RENDERERS)
+
+
+def _screenshot_src(screenshot_path, embed):
+    """
+    获取截图的图片地址
+    :param screenshot_path: 截图文件路径
+    :param embed: 是否内嵌为 base64
+    :return: 图片地址，文件不存在时返回 None
+    """
+    if not os.path.exists(screenshot_path):
+        return None
+    if not embed:
+        return screenshot_path
+    try:
+        with open(screenshot_path, 'rb') as f:
+            img_data = base64.b64encode(f.read()).decode('utf-8')
+        return f'data:image/png;base64,{img_data}'
+    except Exception:
+        return screenshot_path
+
+
+def _render_chinese_screenshots(screenshots, embed):
+    """构建中文报告的截图区域"""
+    if not screenshots:
+        return '<div class="screenshots-section"><div class="section-title">📸 测试截图</div><div class="no-screenshots">暂无截图</div></div>'
+
+    item_template = _template('chinese_screenshot')
+    items = []
+    for idx, screenshot_path in enumerate(screenshots, 1):
+        src = _screenshot_src(screenshot_path, embed)
+        if src:
+            items.append(item_template.substitute(src=src, idx=idx))
+    return ('<div class="screenshots-section"><div class="section-title">📸 测试截图</div><div class="screenshots-grid">'
+            + ''.join(items) + '</div></div>')
+
+
+def _render_chinese_vitals(web_vitals_by_url):
+    """构建中文报告的页面加载性能区域，超出预算的 p90 标红；没有数据时返回空字符串"""
+    if not web_vitals_by_url:
+        return ''
+
+    rows = []
+    for url, metrics in web_vitals_by_url.items():
+        count = max(stats['count'] for stats in metrics.values())
+        cells = []
+        for metric in VITAL_METRICS:
+            stats = metrics[metric]
+            if not stats['count']:
+                cells.append('<td>-</td>')
+                continue
+            css = ' class="over-budget"' if over_budget(metric, stats['p90']) else ''
+            cells.append(f"<td{css}>{stats['p50']} / {stats['p90']}</td>")
+        rows.append(f"                <tr><td>{escape_html(url)}</td><td>{count}</td>{''.join(cells)}</tr>")
+
+    return _template('chinese_vitals').substitute(
+        headers=''.join(f'<th>{metric}</th>' for metric in VITAL_METRICS),
+        rows='\n'.join(rows),
+    )
+
+
+@register_renderer('chinese_html', 'test_report.html')
+def render_chinese_html(model, embed_screenshots=True, **options):
+    """
+    渲染中文 HTML 报告（按测试文件分组，支持筛选和截图放大）
+    :param model: ReportModel 实例
+    :param embed_screenshots: 是否将截图内嵌为 base64
+    :return: HTML 字符串
+    """
+    section_template = _template('chinese_section')
+    case_template = _template('chinese_case')
+    error_template = _template('chinese_error')
+    log_template = _template('chinese_log')
+
+    sections = []
+    for class_file, cases in model.groups.items():
+        rendered_cases = []
+        passed = failed = 0
+        for idx, case in enumerate(cases, 1):
+            passed += case['status'] == 'passed'
+            failed += case['status'] == 'failed'
+            error_html = error_template.substitute(error=escape_html(case['error'])) if case['error'] else ''
+            rendered_cases.append(case_template.substitute(
+                idx=idx,
+                name=escape_html(case['name']),
+                description=escape_html(case['description']),
+                status_text=case['status_text'],
+                status_class=STATUS_CLASS[case['status']],
+                duration=f"{case['duration']:.3f}",
+                screenshots=_render_chinese_screenshots(case['screenshots'], embed_screenshots),
+                error=error_html,
+                log=log_template.substitute(href=escape_html(case['log_file'])) if case['log_file'] else '',
+            ))
+        sections.append(section_template.substitute(
+            class_file=escape_html(class_file),
+            passed=passed,
+            failed=failed,
+            total=len(cases),
+            cases=''.join(rendered_cases),
+        ))
+
+    return _template('chinese_page').substitute(
+        date_str=model.generated_at.strftime('%Y年%m月%d日 %H:%M:%S'),
+        total=model.total,
+        passed=model.passed,
+        failed=model.failed,
+        skipped=model.skipped,
+        pass_rate=f"{model.pass_rate:.1f}",
+        total_duration=f"{model.total_duration:.2f}",
+        vitals=_render_chinese_vitals(model.web_vitals_by_url),
+        sections=''.join(sections),
+    )
+
+
+@register_renderer('simple_html', 'test_report_simple.html')
+def render_simple_html(model, **options):
+    """
+    渲染简单 HTML 报告
+    :param model: ReportModel 实例
+    :return: HTML 字符串
+    """
+    case_template = _template('simple_case')
+    cases = ''.join(
+        case_template.substitute(
+            idx=idx,
+            name=escape_html(case['name']),
+            status_text=case['status_text'],
+            status_class=STATUS_CLASS[case['status']],
+            duration=round(case['duration'], 3),
+        )
+        for idx, case in enumerate(model.cases, 1)
+    )
+    return _template('simple_page').substitute(
+        date_str=model.generated_at.strftime('%Y-%m-%d %H:%M:%S'),
+        total=model.total,
+        passed=model.passed,
+        failed=model.failed,
+        pass_rate=round(model.pass_rate, 1),
+        total_duration=round(model.total_duration, 2),
+        cases=cases,
+    )
+
+
+@register_renderer('json', 'test_report.json')
+def render_json(model, artifacts=None, **options):
+    """
+    渲染 JSON 报告
+    :param model: ReportModel 实例
+    :param artifacts: 产物路径字典（HTML 报告、JUnit XML、截图目录等），为空时不输出
+    :return: JSON 字符串
+    """
+    data = model.to_dict()
+    if artifacts:
+        data['artifacts'] = artifacts
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+@register_renderer('junit', 'junit.xml')
+def render_junit(model, **options):
+    """
+    渲染 JUnit XML 报告（供 CI 系统解析）
+    :param model: ReportModel 实例
+    :return: XML 字符串
+    """
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<testsuites>',
+        (f'  <testsuite name="reelswave" tests="{model.total}" failures="{model.failed - model.errors}" '
+         f'skipped="{model.skipped}" errors="{model.errors}" time="{model.total_duration:.3f}" '
+         f'timestamp="{model.generated_at.isoformat(timespec="seconds")}">'),
+    ]
+    for case in model.cases:
+        lines.append(f'    <testcase classname={quoteattr(case["class_file"])} '
+                     f'name={quoteattr(case["name"])} time="{case["duration"]:.3f}">')
+        if case['status'] == 'failed':
+            message = case['error'].strip().splitlines()[-1] if case['error'].strip() else '测试失败'
+            tag = 'failure' if case['phase'] == 'call' else 'error'
+            lines.append(f'      <{tag} message={quoteattr(message)}>{escape(case["error"])}</{tag}>')
+        elif case['status'] == 'skipped':
+            lines.append('      <skipped/>')
+        lines.append('    </testcase>')
+    lines.append('  </testsuite>')
+    lines.append('</testsuites>')
+    return '\n'.join(lines) + '\n'
+
+
+class ReportEngine:
+    """报告渲染引擎，基于同一个结果模型输出多种格式的报告"""
+
+    def __init__(self, output_dir):
+        """
+        初始化报告渲染引擎
+        :param output_dir: 报告输出目录
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def render(self, results, formats=('chinese_html',), filenames=None, total_duration=None, **options):
+        """
+        渲染并写出报告
+        :param results: 测试结果字典列表
+        :param formats: 输出格式列表
+        :param filenames: 自定义文件名，格式名称 -> 文件名
+        :param total_duration: 会话总耗时（秒）
+        :param options: 透传给渲染器的选项，如 embed_screenshots
+        :return: 格式名称 -> 报告文件路径
+        """
+        model = results if isinstance(results, ReportModel) else ReportModel(results, total_duration)
+        filenames = filenames or {}
+        paths = {}
+
+        for fmt in formats:
+            renderer, default_filename = get_renderer(fmt)
+            report_path = self.output_dir / filenames.get(fmt, default_filename)
+            content = renderer(model, **options)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            paths[fmt] = str(report_path)
+
+        return paths
+
+
+def read_results(results_path):
+    """
+    读取结构化结果文件（results.json）
+    :param results_path: 结果文件路径
+    :return: 结果字典，文件不存在或解析失败时返回 None
+    """
+    try:
+        with open(results_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
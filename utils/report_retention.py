@@ -0,0 +1,326 @@
+"""
+报告目录保留管理器 - 维护报告运行索引并按保留策略清理旧报告
+索引文件 reports/index.json 记录每次运行的目录、大小和结果，清理时只读取索引，不扫描报告目录
+"""
+import os
+import re
+import json
+import shutil
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from utils.logger_utils import LoggerUtils
+from utils.report_dir_manager import is_run_locked
+from config.settings import REPORT_CONFIG
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 索引文件名，位于报告基础目录下
+INDEX_FILENAME = 'index.json'
+
+# 索引锁文件名，跨进程串行化索引读写
+INDEX_LOCK_FILENAME = 'index.json.lock'
+
+# 运行目录名称格式（ReportDirManager 以时间戳开头的运行 ID 命名），其他目录如 screenshots、latest 不参与索引和清理
+RUN_DIR_PATTERN = re.compile(r'^\d{8}_\d{4}')
+
+# 默认保留策略：最近 N 次 + 所有失败的运行 + 最近 N 天
+DEFAULT_RETENTION = {
+    'enabled': True,
+    'keep_last': 20,
+    'keep_failed': True,
+    'max_age_days': 30,
+}
+
+
+def get_dir_size(path):
+    """
+    计算目录占用的字节数
+    :param path: 目录路径
+    :return: 字节数
+    """
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+class ReportRetentionManager:
+    """报告目录保留管理器"""
+
+    def __init__(self, report_base_dir=None, policy=None):
+        """
+        初始化报告保留管理器
+        :param report_base_dir: 报告基础目录（可选）
+        :param policy: 保留策略字典（可选），缺省项取 REPORT_CONFIG['retention'] 和默认值
+        """
+        self.logger = logger
+        self.report_base_dir = Path(report_base_dir or REPORT_CONFIG.get('base_dir', 'reports'))
+        self.index_path = self.report_base_dir / INDEX_FILENAME
+
+        self.policy = dict(DEFAULT_RETENTION)
+        self.policy.update(REPORT_CONFIG.get('retention', {}))
+        self.policy.update(policy or {})
+
+        # 同一进程内索引读写串行化，跨进程由索引锁文件串行化
+        self._lock = threading.Lock()
+        self.index_lock_path = self.report_base_dir / INDEX_LOCK_FILENAME
+
+    @contextmanager
+    def _index_lock(self, timeout=10):
+        """
+        获取索引读写锁（进程内线程锁 + 跨进程锁文件），多个套件并发运行时避免索引互相覆盖
+        持有进程已退出的锁文件视为失效并删除；持有进程仍存活时等待到超时为止，不会强行删除
+        :param timeout: 等待锁文件的超时时间（秒）
+        :return: 上下文中得到是否获取到锁，未获取到时调用方不得读写索引
+        """
+        with self._lock:
+            self.report_base_dir.mkdir(parents=True, exist_ok=True)
+            deadline = time.time() + timeout
+            acquired = False
+            while not acquired:
+                try:
+                    fd = os.open(self.index_lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                    os.write(fd, str(os.getpid()).encode())
+                    os.close(fd)
+                    acquired = True
+                except FileExistsError:
+                    if not is_run_locked(self.report_base_dir, INDEX_LOCK_FILENAME):
+                        try:
+                            os.remove(self.index_lock_path)
+                        except OSError:
+                            pass
+                        continue
+                    if time.time() >= deadline:
+                        self.logger.warning("等待报告索引锁超时，跳过本次索引更新: %s", self.index_lock_path)
+                        break
+                    time.sleep(0.1)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    try:
+                        os.remove(self.index_lock_path)
+                    except OSError:
+                        pass
+
+    def load_index(self):
+        """
+        读取运行索引，索引不存在时根据已有报告目录重建一次
+        :return: 运行记录列表（按创建时间升序）
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('runs', [])
+        except FileNotFoundError:
+            return self._rebuild_index()
+        except (OSError, ValueError) as e:
+            self.logger.error("读取报告索引失败，重建索引: %s", e)
+            return self._rebuild_index()
+
+    def _save_index(self, runs):
+        """
+        原子写入运行索引
+        :param runs: 运行记录列表
+        """
+        self.report_base_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"{INDEX_FILENAME}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'runs': runs}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _rebuild_index(self):
+        """
+        扫描报告基础目录重建索引（仅在索引缺失或损坏时执行）
+        :return: 运行记录列表
+        """
+        runs = []
+        if not self.report_base_dir.exists():
+            return runs
+
+        for entry in os.scandir(self.report_base_dir):
+            if not entry.is_dir(follow_symlinks=False) or not RUN_DIR_PATTERN.match(entry.name):
+                continue
+            run_dir = Path(entry.path)
+            results = self._read_run_results(run_dir)
+            runs.append(self._build_entry(run_dir, results))
+
+        runs.sort(key=lambda run: run['created_at'])
+        self._save_index(runs)
+        self.logger.info("已重建报告索引，共 %s 次运行", len(runs))
+        return runs
+
+    @staticmethod
+    def _read_run_results(run_dir):
+        """
+        读取运行目录下的结果文件
+        :param run_dir: 运行目录
+        :return: 结果字典，不存在时返回 None
+        """
+        try:
+            with open(run_dir / 'results.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _run_created_at(run_dir):
+        """
+        获取运行的创建时间，优先从目录名的时间戳解析，解析失败时使用目录修改时间
+        :param run_dir: 运行目录
+        :return: datetime
+        """
+        for fmt, length in (('%Y%m%d_%H%M%S', 15), ('%Y%m%d_%H%M', 13)):
+            try:
+                return datetime.strptime(run_dir.name[:length], fmt)
+            except ValueError:
+                continue
+        return datetime.fromtimestamp(run_dir.stat().st_mtime)
+
+    @classmethod
+    def _build_entry(cls, run_dir, results=None):
+        """
+        构建单次运行的索引记录
+        :param run_dir: 运行目录
+        :param results: 结果字典（total_cases/passed/failed/skipped）
+        :return: 索引记录字典
+        """
+        results = results or {}
+        failed = results.get('failed')
+        if failed is None:
+            outcome = 'unknown'
+        else:
+            outcome = 'failed' if failed > 0 else 'passed'
+
+        return {
+            'run_id': run_dir.name,
+            'created_at': cls._run_created_at(run_dir).isoformat(timespec='seconds'),
+            'size_bytes': get_dir_size(run_dir),
+            'total_cases': results.get('total_cases'),
+            'passed': results.get('passed'),
+            'failed': failed,
+            'skipped': results.get('skipped'),
+            'outcome': outcome,
+        }
+
+    def record_run(self, run_dir, results=None):
+        """
+        将一次运行写入索引（同一运行目录重复记录时覆盖）
+        :param run_dir: 运行目录
+        :param results: 结果字典（total_cases/passed/failed/skipped）
+        :return: 索引记录字典，失败或未获取到索引锁时返回 None
+        """
+        try:
+            run_dir = Path(run_dir)
+            with self._index_lock() as locked:
+                if not locked:
+                    return None
+                runs = [run for run in self.load_index() if run['run_id'] != run_dir.name]
+                entry = self._build_entry(run_dir, results)
+                runs.append(entry)
+                self._save_index(runs)
+            self.logger.info("报告索引已更新: %s, 结果: %s, 大小: %s 字节",
+                             entry['run_id'], entry['outcome'], entry['size_bytes'])
+            return entry
+        except Exception as e:
+            self.logger.error("更新报告索引失败: %s", e)
+            return None
+
+    def select_expired(self, runs, now=None, exclude=None):
+        """
+        按保留策略挑选需要清理的运行
+        满足任一条件即保留：最近 keep_last 次、失败的运行（keep_failed）、未超过 max_age_days 天
+        :param runs: 运行记录列表（按创建时间升序）
+        :param now: 当前时间（可选）
+        :param exclude: 不参与清理的运行 ID 集合（如正在进行的运行）
+        :return: 需要清理的运行记录列表
+        """
+        now = now or datetime.now()
+        exclude = set(exclude or ())
+        keep_last = self.policy.get('keep_last') or 0
+        max_age_days = self.policy.get('max_age_days')
+        cutoff = now - timedelta(days=max_age_days) if max_age_days is not None else None
+
+        recent = {run['run_id'] for run in runs[-keep_last:]} if keep_last > 0 else set()
+        expired = []
+        for run in runs:
+            if run['run_id'] in exclude or run['run_id'] in recent:
+                continue
+            if self.policy.get('keep_failed') and run.get('outcome') == 'failed':
+                continue
+            if cutoff is None or datetime.fromisoformat(run['created_at']) >= cutoff:
+                continue
+            expired.append(run)
+        return expired
+
+    def prune(self, exclude=None):
+        """
+        按保留策略清理过期的报告目录并更新索引
+        :param exclude: 不参与清理的运行 ID 集合（持有锁文件的运行始终跳过）
+        :return: 已清理的运行 ID 列表，失败或未获取到索引锁时返回 None
+        """
+        if not self.policy.get('enabled', True):
+            return []
+
+        try:
+            with self._index_lock() as locked:
+                if not locked:
+                    return None
+                runs = self.load_index()
+                expired = self.select_expired(runs, exclude=exclude)
+                removed = set()
+                freed = 0
+                for run in expired:
+                    run_dir = self.report_base_dir / run['run_id']
+                    # 其他进程仍在写入的运行不清理
+                    if is_run_locked(run_dir):
+                        continue
+                    shutil.rmtree(run_dir, ignore_errors=True)
+                    removed.add(run['run_id'])
+                    freed += run.get('size_bytes') or 0
+
+                if removed:
+                    self._save_index([run for run in runs if run['run_id'] not in removed])
+                    self.logger.info("已清理 %s 个过期报告目录，释放 %s 字节", len(removed), freed)
+                return sorted(removed)
+        except Exception as e:
+            self.logger.error("清理报告目录失败: %s", e)
+            return None
+
+    def prune_async(self, exclude=None):
+        """
+        在后台线程中清理过期报告，不阻塞报告生成
+        :param exclude: 不参与清理的运行 ID 集合
+        :return: 清理线程
+        """
+        thread = threading.Thread(target=self.prune, kwargs={'exclude': exclude}, name='report-retention')
+        thread.start()
+        return thread
+
+
+# 全局报告保留管理器实例
+_report_retention_manager = None
+
+
+def get_report_retention_manager(report_base_dir=None):
+    """
+    获取报告保留管理器实例
+    :param report_base_dir: 报告基础目录（可选）
+    :return: ReportRetentionManager 实例
+    """
+    global _report_retention_manager
+    if _report_retention_manager is None:
+        _report_retention_manager = ReportRetentionManager(report_base_dir)
+    return _report_retention_manager
@@ -2,13 +2,14 @@
 """
 测试执行器
 """
+import os
 import time
+import tempfile
 import subprocess
 from datetime import datetime
-from pathlib import Path
 from utils.logger_utils import LoggerUtils
 from utils.email_notifier import EmailNotifier
-from config.settings import REPORT_CONFIG, EMAIL_CONFIG
+from utils.report_engine import read_results
 
 
 class TestRunner:
@@ -49,20 +50,30 @@ class TestRunner:
                 '--tb=short'  # 简短的错误信息
             ])
 
+            # 由报告插件把 results.json 额外写到临时路径，不再解析控制台输出
+            fd, results_path = tempfile.mkstemp(prefix='results_', suffix='.json')
+            os.close(fd)
+            cmd.extend(['--results-json', results_path])
+
             self.logger.info("执行命令: " + ' '.join(cmd))
 
             # 执行测试
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            try:
+                subprocess.run(cmd)
+                results = read_results(results_path)
+            finally:
+                os.remove(results_path)
 
-            # 解析测试结果
             duration = time.time() - start_time
-            self._parse_test_results(result.stdout, result.stderr, duration)
+            if results is None:
+                self.logger.error("未找到测试结果文件: " + results_path)
+                return None
+
+            self.test_results = results['test_cases']
+            report_path = results.get('artifacts', {}).get('html_report')
 
-            # 报告已由ChineseHTMLReportPlugin自动生成，无需手动生成
-            # 发送邮件通知时会自动查找最新的报告文件
-            
             # 发送邮件通知
-            self._send_email_notification(None, duration)
+            self._send_email_notification(report_path, duration)
 
             return self.test_results
 
@@ -70,35 +81,6 @@ class TestRunner:
             self.logger.error("执行测试失败: " + str(e))
             return None
 
-    def _parse_test_results(self, stdout, stderr, duration):
-        """
-        解析测试结果
-        :param stdout: 标准输出
-        :param stderr: 标准错误
-        :param duration: 执行耗时
-        """
-        # 简单解析 pytest 输出
-        lines = stdout.split('\n')
-        for line in lines:
-            if '::test_' in line and 'PASSED' in line:
-                test_name = line.split('::')[-1].split()[0]
-                self.test_results.append({
-                    'name': test_name,
-                    'status': 'passed',
-                    'duration': duration / len(self.test_results) if self.test_results else duration,
-                    'screenshots': [],
-                    'error': None
-                })
-            elif '::test_' in line and 'FAILED' in line:
-                test_name = line.split('::')[-1].split()[0]
-                self.test_results.append({
-                    'name': test_name,
-                    'status': 'failed',
-                    'duration': duration / len(self.test_results) if self.test_results else duration,
-                    'screenshots': [],
-                    'error': stderr
-                })
-
     def _send_email_notification(self, report_path, duration):
         """
         发送邮件通知
@@ -106,15 +88,6 @@ class TestRunner:
         :param duration: 总耗时
         """
         try:
-            # 查找最新的报告文件
-            report_dir = Path(REPORT_CONFIG['base_dir'])
-            report_files = list(report_dir.glob('report_*.html'))
-            if report_files:
-                # 按修改时间排序，获取最新的报告
-                latest_report = max(report_files, key=lambda f: f.stat().st_mtime)
-                report_path = str(latest_report)
-                self.logger.info(f"使用最新报告: {report_path}")
-            
             total_cases = len(self.test_results)
             passed = sum(1 for r in self.test_results if r['status'] == 'passed')
             failed = sum(1 for r in self.test_results if r['status'] == 'failed')
@@ -0,0 +1,232 @@
+"""
+视频播放指标采集 - 通过 JS 采样 <video> 元素的播放状态（currentTime、buffered、readyState、丢帧），
+并在文档上以捕获阶段监听媒体事件，统计首帧时间、首次 timeupdate 和卡顿，输出结构化的时间线
+"""
+import json
+import time
+from config.locators import VIDEO_PLAYER_PAGE
+from utils.locator_compiler import compile_locator
+from utils.logger_utils import LoggerUtils
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 页面中当前播放的视频：优先当前激活 slide 中的播放器（与 IconComponent.play_pause 的查找顺序一致）
+_VIDEO_QUERY = (
+    "(document.querySelector({active} + ' ' + {container} + ' ' + {video})"
+    " || document.querySelector({container} + ' ' + {video})"
+    " || document.querySelector({video}))"
+).format(
+    active=json.dumps(compile_locator(VIDEO_PLAYER_PAGE['active_slide'], 'css').selector),
+    container=json.dumps(compile_locator(VIDEO_PLAYER_PAGE['player_container'], 'css').selector),
+    video=json.dumps(compile_locator(VIDEO_PLAYER_PAGE['video_element'], 'css').selector),
+)
+
+# 媒体事件不冒泡，在 document 上用捕获阶段监听，视频元素在安装后才创建也能收到事件
+INSTALL_JS = """
+const m = window.__videoMetrics = {t0: performance.now(), events: [], firstFrame: null,
+    firstTimeupdate: null, firstPlaying: null, stalls: 0, waitingSince: null, waitingMs: 0};
+const now = () => Math.round(performance.now() - m.t0);
+const onEvent = (e) => {
+    if (!(e.target instanceof HTMLVideoElement)) return;
+    const t = now();
+    if (e.type === 'timeupdate') {
+        if (m.firstTimeupdate === null && e.target.currentTime > 0) m.firstTimeupdate = t;
+        return;
+    }
+    m.events.push({type: e.type, t: t, currentTime: e.target.currentTime});
+    if (m.events.length > 500) m.events.shift();
+    if (e.type === 'playing') {
+        if (m.firstPlaying === null) m.firstPlaying = t;
+        if (m.waitingSince !== null) { m.waitingMs += t - m.waitingSince; m.waitingSince = null; }
+    }
+    if ((e.type === 'waiting' || e.type === 'stalled') && m.firstPlaying !== null) {
+        m.stalls += 1;
+        if (m.waitingSince === null) m.waitingSince = t;
+    }
+    if (m.firstFrame === null && (e.type === 'loadeddata' || e.type === 'playing')) {
+        const video = e.target;
+        if (video.requestVideoFrameCallback) {
+            video.requestVideoFrameCallback(() => { if (m.firstFrame === null) m.firstFrame = now(); });
+        } else if (video.readyState >= 2) {
+            m.firstFrame = t;
+        }
+    }
+};
+['loadstart', 'loadeddata', 'canplay', 'playing', 'waiting', 'stalled', 'pause', 'seeking',
+ 'seeked', 'ended', 'error', 'ratechange', 'timeupdate'].forEach(type =>
+    document.addEventListener(type, onEvent, true));
+return true;
+"""
+
+# 采样脚本：{video} 替换为获取视频元素的表达式
+SAMPLE_JS = """
+const v = {video};
+if (!v) return null;
+const buffered = [];
+for (let i = 0; i < v.buffered.length; i++) buffered.push([v.buffered.start(i), v.buffered.end(i)]);
+const q = v.getVideoPlaybackQuality ? v.getVideoPlaybackQuality() : null;
+const m = window.__videoMetrics || null;
+return {
+    t: m ? Math.round(performance.now() - m.t0) : null,
+    currentTime: v.currentTime, duration: v.duration, paused: v.paused, ended: v.ended,
+    readyState: v.readyState, networkState: v.networkState, playbackRate: v.playbackRate,
+    buffered: buffered,
+    droppedFrames: q ? q.droppedVideoFrames : null, totalFrames: q ? q.totalVideoFrames : null
+};
+"""
+
+# 读取事件统计
+EVENTS_JS = "return window.__videoMetrics ? JSON.parse(JSON.stringify(window.__videoMetrics)) : null;"
+
+
+class VideoMetricsCollector:
+    """视频播放指标采集器"""
+
+    def __init__(self, page):
+        """
+        初始化采集器
+        :param page: ChromiumPage / ChromiumTab 对象
+        """
+        self.page = page
+        self.samples = []
+
+    def install(self):
+        """
+        在页面中安装媒体事件监听，并以当前时间作为计时起点
+        应在触发播放的操作（如点击"去看剧"）之前调用；页面整体跳转后需要重新安装
+        :return: 是否安装成功
+        """
+        self.samples = []
+        try:
+            return bool(self.page.run_js(INSTALL_JS))
+        except Exception as e:
+            logger.warning("安装视频指标监听失败: %s", e)
+            return False
+
+    def sample(self, video_element=None):
+        """
+        采样一次视频状态
+        :param video_element: 视频元素（可选，如 IconComponent.play_pause() 的返回值），默认按定位器在页面中查找
+        :return: 采样字典，未找到视频时返回 None
+        """
+        try:
+            if video_element is not None:
+                data = video_element.run_js(SAMPLE_JS.replace('{video}', 'this'))
+            else:
+                data = self.page.run_js(SAMPLE_JS.replace('{video}', _VIDEO_QUERY))
+        except Exception as e:
+            logger.debug("采样视频状态失败: %s", e)
+            data = None
+        if data:
+            self.samples.append(data)
+        return data
+
+    def events(self):
+        """
+        读取媒体事件统计
+        :return: 事件统计字典，未安装时返回 None
+        """
+        try:
+            return self.page.run_js(EVENTS_JS)
+        except Exception as e:
+            logger.debug("读取视频事件失败: %s", e)
+            return None
+
+    def timeline(self, duration, interval=0.5, video_element=None):
+        """
+        按固定间隔持续采样
+        :param duration: 采样时长（秒）
+        :param interval: 采样间隔（秒）
+        :param video_element: 视频元素（可选）
+        :return: 本次采样的列表
+        """
+        samples = []
+        end_time = time.time() + duration
+        while time.time() < end_time:
+            data = self.sample(video_element)
+            if data:
+                samples.append(data)
+            time.sleep(interval)
+        return samples
+
+    def wait_until_playing(self, timeout=10, min_advance=0.2, interval=0.2, video_element=None):
+        """
+        等待视频真正播放：currentTime 相对第一次采样前进至少 min_advance 秒且未暂停
+        :param timeout: 超时时间（秒）
+        :param min_advance: currentTime 最少前进的秒数
+        :param interval: 采样间隔（秒）
+        :param video_element: 视频元素（可选）
+        :return: 是否在超时前开始播放
+        """
+        start_time = time.time()
+        baseline = None
+        while time.time() - start_time < timeout:
+            data = self.sample(video_element)
+            if data:
+                if baseline is None or data['currentTime'] < baseline:
+                    # 切换清晰度或剧集时 currentTime 可能回退，重新取基准
+                    baseline = data['currentTime']
+                elif not data['paused'] and data['currentTime'] - baseline >= min_advance:
+                    logger.info("视频正在播放: currentTime=%.2f，等待 %.2f秒", data['currentTime'], time.time() - start_time)
+                    return True
+            time.sleep(interval)
+        logger.error("等待视频播放超时（%s秒）", timeout)
+        return False
+
+    def wait_until_paused(self, timeout=5, interval=0.2, video_element=None):
+        """
+        等待视频暂停：paused 为 true 且连续两次采样 currentTime 不变
+        :param timeout: 超时时间（秒）
+        :param interval: 采样间隔（秒）
+        :param video_element: 视频元素（可选）
+        :return: 是否在超时前暂停
+        """
+        start_time = time.time()
+        previous = None
+        while time.time() - start_time < timeout:
+            data = self.sample(video_element)
+            if data and data['paused']:
+                if previous is not None and data['currentTime'] == previous:
+                    return True
+                previous = data['currentTime']
+            else:
+                previous = None
+            time.sleep(interval)
+        logger.warning("等待视频暂停超时（%s秒）", timeout)
+        return False
+
+    def wait_for_first_frame(self, timeout=15, interval=0.2):
+        """
+        等待首帧渲染（需先调用 install）
+        :param timeout: 超时时间（秒）
+        :param interval: 轮询间隔（秒）
+        :return: 首帧时间（毫秒，相对 install），超时返回 None
+        """
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            events = self.events()
+            if events and events.get('firstFrame') is not None:
+                return events['firstFrame']
+            time.sleep(interval)
+        logger.warning("等待视频首帧超时（%s秒）", timeout)
+        return None
+
+    def report(self):
+        """
+        汇总播放指标
+        :return: 指标字典（时间均为相对 install 的毫秒数）
+        """
+        events = self.events() or {}
+        last = self.samples[-1] if self.samples else {}
+        return {
+            'time_to_first_frame_ms': events.get('firstFrame'),
+            'first_playing_ms': events.get('firstPlaying'),
+            'first_timeupdate_ms': events.get('firstTimeupdate'),
+            'stalls': events.get('stalls', 0),
+            'stall_ms': events.get('waitingMs', 0),
+            'dropped_frames': last.get('droppedFrames'),
+            'total_frames': last.get('totalFrames'),
+            'events': events.get('events', []),
+            'samples': list(self.samples)
+        }
@@ -0,0 +1,245 @@
+"""
+页面加载性能采集 - 每次导航后采集 PerformanceNavigationTiming、FCP、LCP、CLS、长任务和 JS 堆大小
+观察脚本通过 Page.addScriptToEvaluateOnNewDocument 在每个新文档创建时注入（长任务不支持 buffered，必须提前观察），
+页面离开（pagehide）时通过 CDP 绑定主动上报，导航方法和用例结束时也会读取当前文档的数据
+"""
+import json
+import threading
+import weakref
+from urllib.parse import urlsplit, urlunsplit
+from config.settings import WEB_VITALS_CONFIG
+from utils.logger_utils import LoggerUtils
+from utils.perf_history import summarize
+
+# 模块级日志记录器，导入时解析一次
+logger = LoggerUtils.get_default_logger(__name__)
+
+# 页面离开时上报数据的 CDP 绑定名
+BINDING_NAME = '__webVitalsReport'
+
+# 报告中展示的指标（时间为相对导航开始的毫秒数）
+VITAL_METRICS = ('ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'fcp_ms', 'lcp_ms', 'cls',
+                 'long_tasks', 'blocking_ms', 'js_heap_mb')
+
+# 在每个文档中注入的观察脚本，重复注入时直接返回
+INIT_JS = """
+(() => {
+    if (window.__webVitals) return;
+    // 单页应用的路由切换不产生新文档，数据归属于文档的落地 URL
+    const v = window.__webVitals = {url: location.href, lcp: null, cls: 0, longTasks: 0, blocking: 0};
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({type: type, buffered: true});
+        } catch (e) {}
+    };
+    observe('largest-contentful-paint', e => { v.lcp = e.renderTime || e.loadTime || e.startTime; });
+    // CLS 取最大的会话窗口（间隔小于 1 秒、总长不超过 5 秒的连续偏移）
+    let windowValue = 0, windowStart = 0, windowLast = 0;
+    observe('layout-shift', e => {
+        if (e.hadRecentInput) return;
+        if (windowValue && e.startTime - windowLast < 1000 && e.startTime - windowStart < 5000) {
+            windowValue += e.value;
+        } else {
+            windowValue = e.value;
+            windowStart = e.startTime;
+        }
+        windowLast = e.startTime;
+        v.cls = Math.max(v.cls, windowValue);
+    });
+    observe('longtask', e => { v.longTasks += 1; v.blocking += Math.max(0, e.duration - 50); });
+    window.__webVitalsCollect = () => {
+        const n = performance.getEntriesByType('navigation')[0];
+        const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+        const memory = performance.memory;
+        const since = (t) => (n && t > 0 ? Math.round(t - n.startTime) : null);
+        return {
+            url: v.url,
+            time_origin: performance.timeOrigin,
+            ttfb_ms: n ? since(n.responseStart) : null,
+            dom_content_loaded_ms: n ? since(n.domContentLoadedEventEnd) : null,
+            load_ms: n ? since(n.loadEventEnd) : null,
+            fcp_ms: fcp ? Math.round(fcp.startTime) : null,
+            lcp_ms: v.lcp === null ? null : Math.round(v.lcp),
+            cls: Math.round(v.cls * 10000) / 10000,
+            long_tasks: v.longTasks,
+            blocking_ms: Math.round(v.blocking),
+            js_heap_mb: memory ? Math.round(memory.usedJSHeapSize / 1048576 * 10) / 10 : null
+        };
+    };
+    addEventListener('pagehide', () => {
+        if (typeof window.__webVitalsReport === 'function') {
+            window.__webVitalsReport(JSON.stringify(window.__webVitalsCollect()));
+        }
+    });
+})();
+"""
+
+# 读取当前文档的数据
+COLLECT_JS = "return window.__webVitalsCollect ? window.__webVitalsCollect() : null;"
+
+
+def normalize_page_url(url):
+    """
+    规范化页面 URL 作为汇总键：去掉 fragment，保留查询参数（如 chapterIndex）
+    :param url: 页面 URL
+    :return: 规范化后的 URL
+    """
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, parts.query, ''))
+
+
+class WebVitalsMonitor:
+    """标签页上的页面加载性能采集器"""
+
+    def __init__(self, page):
+        """
+        初始化采集器
+        :param page: ChromiumPage / ChromiumTab 对象
+        """
+        self.page = page
+        self.records = {}
+        self._lock = threading.Lock()
+        self._script_id = None
+
+    @property
+    def active(self):
+        """是否已启动"""
+        return self._script_id is not None
+
+    def start(self):
+        """
+        注入观察脚本并注册上报绑定；当前文档也补注入一次（LCP、CLS 可从缓冲区补齐，长任务从此刻开始统计）
+        :return: 是否启动成功
+        """
+        if self.active:
+            return True
+        try:
+            self._script_id = self.page.add_init_js(INIT_JS)
+            self.page.driver.set_callback('Runtime.bindingCalled', self._on_binding)
+            self.page.run_cdp('Runtime.enable')
+            self.page.run_cdp('Runtime.addBinding', name=BINDING_NAME)
+            self.page.run_js(INIT_JS)
+            return True
+        except Exception as e:
+            logger.warning("启动页面性能采集失败: %s", e)
+            return False
+
+    def stop(self):
+        """移除观察脚本和上报绑定"""
+        if not self.active:
+            return
+        try:
+            self.page.remove_init_js(self._script_id)
+            self.page.run_cdp('Runtime.removeBinding', name=BINDING_NAME)
+            self.page.driver.set_callback('Runtime.bindingCalled', None)
+        except Exception as e:
+            logger.debug("停止页面性能采集失败: %s", e)
+        self._script_id = None
+
+    def _on_binding(self, **kwargs):
+        """Runtime.bindingCalled 事件处理：页面离开时上报的最终数据"""
+        if kwargs.get('name') != BINDING_NAME:
+            return
+        try:
+            self._record(json.loads(kwargs.get('payload', '')))
+        except ValueError:
+            pass
+
+    def _record(self, data):
+        """
+        保存一个文档的数据，同一文档（timeOrigin 相同）后读取的数据覆盖先前的数据
+        :param data: 采集脚本返回的字典
+        """
+        if not data or not data.get('url', '').startswith('http'):
+            return
+        key = data.get('time_origin') or data['url']
+        record = {'url': normalize_page_url(data['url'])}
+        record.update({metric: data.get(metric) for metric in VITAL_METRICS})
+        with self._lock:
+            self.records[key] = record
+
+    def capture(self):
+        """
+        读取当前文档的数据
+        :return: 本次读取的记录，未启动或读取失败时返回 None
+        """
+        if not self.active:
+            return None
+        try:
+            data = self.page.run_js(COLLECT_JS)
+        except Exception as e:
+            logger.debug("读取页面性能数据失败: %s", e)
+            return None
+        self._record(data)
+        return data
+
+    def drain(self):
+        """
+        取出并清空已采集的记录
+        :return: 记录列表，按采集顺序
+        """
+        with self._lock:
+            records = list(self.records.values())
+            self.records = {}
+        return records
+
+
+# 每个标签页一个采集器，标签页对象释放后自动移除
+_monitors = weakref.WeakKeyDictionary()
+_monitors_lock = threading.Lock()
+
+
+def get_web_vitals_monitor(page):
+    """
+    获取标签页的页面加载性能采集器
+    :param page: ChromiumPage / ChromiumTab 对象
+    :return: WebVitalsMonitor 实例
+    """
+    with _monitors_lock:
+        monitor = _monitors.get(page)
+        if monitor is None:
+            monitor = WebVitalsMonitor(page)
+            _monitors[page] = monitor
+        return monitor
+
+
+def capture_web_vitals(page):
+    """
+    导航完成后读取当前页面的加载性能（标签页未启动采集时不做任何事）
+    :param page: ChromiumPage / ChromiumTab 对象
+    :return: 本次读取的数据，未启动采集时返回 None
+    """
+    if not WEB_VITALS_CONFIG.get('enabled', True):
+        return None
+    with _monitors_lock:
+        monitor = _monitors.get(page)
+    return monitor.capture() if monitor else None
+
+
+def aggregate_web_vitals(records):
+    """
+    按页面 URL 汇总所有用例的加载性能
+    :param records: 记录列表
+    :return: URL -> 指标 -> {count, min, p50, p90, p95, max, mean}
+    """
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record.get('url', ''), []).append(record)
+    return {
+        url: {
+            metric: summarize([record.get(metric) for record in items], digits=3 if metric == 'cls' else 1)
+            for metric in VITAL_METRICS
+        }
+        for url, items in sorted(grouped.items())
+    }
+
+
+def over_budget(metric, value):
+    """
+    判断指标是否超过 WEB_VITALS_CONFIG['budgets'] 中的预算
+    :param metric: 指标名
+    :param value: 指标值
+    :return: 是否超出预算（未配置预算时为 False）
+    """
+    budget = WEB_VITALS_CONFIG.get('budgets', {}).get(metric)
+    return budget is not None and value is not None and value > budget